@@ -0,0 +1,312 @@
+"""Thread-safe in-process cache of validated session plans.
+
+Services that serve the same plans repeatedly can keep the validated
+:class:`SessionPlan` instead of re-reading and re-validating JSON per
+request. :class:`PlanCache` entries are keyed by plan ``id`` and a content
+version (an ETag, revision number, or :func:`content_version` of the raw
+JSON), so a new version is a new entry and stale ones age out.
+
+- LRU eviction bounded by entry count (``maxsize``) and, optionally, by the
+  summed JSON size of the cached plans (``max_bytes``)
+- optional ``ttl`` in seconds
+- single-flight loading: concurrent misses on one key run the loader once,
+  and the other callers wait for its result
+- hit/miss/load/eviction counters via :meth:`PlanCache.stats`
+- optional on-disk tier (``directory``) of plan JSON, shared by worker
+  processes on one host and keyed by ``SCHEMA_VERSION`` as well. Entries
+  are validated again when read, so a disk hit skips the loader but not
+  validation, and a tampered file can at worst be a wrong or invalid plan
+
+Cached plans are shared, mutable :class:`SessionPlan` instances: every
+caller (and tenant) gets the same object. Pass ``copy=True`` to
+:meth:`PlanCache.get` or :meth:`PlanCache.get_or_load` before mutating one.
+
+Example::
+
+    from osti.cache import PlanCache
+
+    cache = PlanCache(maxsize=512, max_bytes=64 * 2**20, ttl=300)
+    plan = cache.get_or_load(plan_id, etag, lambda: storage.read(plan_id))
+"""
+
+import hashlib
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Union
+
+from .session_plan import SCHEMA_VERSION, SessionPlan
+
+Loaded = Union[SessionPlan, str, bytes, dict[str, Any]]
+"""What a loader may return: a plan, raw JSON, or an unvalidated dict."""
+
+
+def content_version(raw: Union[str, bytes]) -> str:
+    """Short content hash of raw plan JSON, usable as a cache version."""
+    if isinstance(raw, str):
+        raw = raw.encode()
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class CacheStats(NamedTuple):
+    """Counters and current size of a :class:`PlanCache`."""
+
+    hits: int
+    misses: int
+    loads: int
+    disk_hits: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+
+class _Entry(NamedTuple):
+    plan: SessionPlan
+    size: int
+    expires: Optional[float]
+
+
+class PlanCache:
+    """LRU cache of validated plans keyed by ``(plan_id, version)``.
+
+    Returned plans are shared with the cache and with every other caller;
+    pass ``copy=True`` to get a private deep copy.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        directory: Optional[Union[str, Path]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._items: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _key(plan_id: Any, version: Hashable) -> tuple[str, str]:
+        return str(plan_id), str(version)
+
+    # --- memory tier (callers hold self._lock) ---
+
+    def _lookup(self, key: tuple[str, str]) -> Optional[SessionPlan]:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        if entry.expires is not None and entry.expires <= self._clock():
+            self._drop(key)
+            self.expirations += 1
+            return None
+        self._items.move_to_end(key)
+        return entry.plan
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        entry = self._items.pop(key)
+        self._bytes -= entry.size
+
+    def _store(self, key: tuple[str, str], plan: SessionPlan, size: int) -> None:
+        if key in self._items:
+            self._drop(key)
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        self._items[key] = _Entry(plan, size, expires)
+        self._bytes += size
+        while self._items and (
+            len(self._items) > self.maxsize
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._items)))
+            self.evictions += 1
+
+    # --- disk tier ---
+
+    def _plan_dir(self, plan_id: str) -> Path:
+        # One directory per plan, so invalidate(plan_id) can drop every version.
+        name = hashlib.sha256(f"{SCHEMA_VERSION}\0{plan_id}".encode()).hexdigest()
+        return self.directory / name  # type: ignore[operator]
+
+    def _path(self, key: tuple[str, str]) -> Path:
+        name = hashlib.sha256(key[1].encode()).hexdigest()
+        return self._plan_dir(key[0]) / f"{name}.json"
+
+    def _read_disk(self, key: tuple[str, str]) -> Optional[tuple[SessionPlan, int]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            data = path.read_bytes()
+            return SessionPlan.model_validate_json(data), len(data)
+        except (OSError, ValueError):
+            # Missing, truncated or invalid entries are misses.
+            return None
+
+    def _write_disk(self, key: tuple[str, str], plan: SessionPlan, size: int) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(plan.model_dump_json().encode())
+        Path(tmp.name).replace(path)
+
+    # --- public API ---
+
+    def get(self, plan_id: Any, version: Hashable, *, copy: bool = False) -> Optional[SessionPlan]:
+        """Return the cached plan (memory tier only), or ``None``."""
+        key = self._key(plan_id, version)
+        with self._lock:
+            plan = self._lookup(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return plan.model_copy(deep=True) if copy else plan
+
+    def put(self, plan_id: Any, version: Hashable, plan: SessionPlan, size: Optional[int] = None) -> None:
+        """Cache ``plan``; ``size`` defaults to the length of its JSON."""
+        if size is None:
+            size = len(plan.model_dump_json())
+        key = self._key(plan_id, version)
+        with self._lock:
+            self._store(key, plan, size)
+        self._write_disk(key, plan, size)
+
+    def get_or_load(
+        self,
+        plan_id: Any,
+        version: Hashable,
+        loader: Callable[[], Loaded],
+        *,
+        copy: bool = False,
+    ) -> SessionPlan:
+        """Return the cached plan, or load, validate and cache it.
+
+        ``loader`` runs at most once per key at a time: concurrent callers
+        missing on the same key wait for the first one's result (or
+        exception). The disk tier, if any, is consulted before ``loader``.
+        """
+        plan = self._get_or_load(self._key(plan_id, version), loader)
+        return plan.model_copy(deep=True) if copy else plan
+
+    def _get_or_load(self, key: tuple[str, str], loader: Callable[[], Loaded]) -> SessionPlan:
+        with self._lock:
+            plan = self._lookup(key)
+            if plan is not None:
+                self.hits += 1
+                return plan
+            self.misses += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            cached = self._read_disk(key)
+            if cached is not None:
+                plan, size = cached
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                plan, size = self._validate(loader())
+                with self._lock:
+                    self.loads += 1
+                self._write_disk(key, plan, size)
+            with self._lock:
+                self._store(key, plan, size)
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(plan)
+        return plan
+
+    @staticmethod
+    def _validate(loaded: Loaded) -> tuple[SessionPlan, int]:
+        if isinstance(loaded, SessionPlan):
+            return loaded, len(loaded.model_dump_json())
+        if isinstance(loaded, (str, bytes)):
+            return SessionPlan.model_validate_json(loaded), len(loaded)
+        plan = SessionPlan.model_validate(loaded)
+        return plan, len(plan.model_dump_json())
+
+    def invalidate(self, plan_id: Any, version: Optional[Hashable] = None) -> int:
+        """Drop one version (or, with no ``version``, all versions) of a plan.
+
+        Returns the number of memory entries removed. The matching disk
+        entries are removed as well, so other processes stop serving them
+        (their memory tiers keep any copy they already hold).
+        """
+        plan_id = str(plan_id)
+        with self._lock:
+            if version is not None:
+                keys = [self._key(plan_id, version)]
+            else:
+                keys = [k for k in self._items if k[0] == plan_id]
+            removed = 0
+            for key in keys:
+                if key in self._items:
+                    self._drop(key)
+                    removed += 1
+        if self.directory is not None:
+            if version is not None:
+                self._path(self._key(plan_id, version)).unlink(missing_ok=True)
+            else:
+                shutil.rmtree(self._plan_dir(plan_id), ignore_errors=True)
+        return removed
+
+    def clear(self) -> None:
+        """Drop the memory tier (files on disk are kept)."""
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                loads=self.loads,
+                disk_hits=self.disk_hits,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                entries=len(self._items),
+                bytes=self._bytes,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+        with self._lock:
+            return self._key(*key) in self._items
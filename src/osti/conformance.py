@@ -0,0 +1,328 @@
+"""Conformance runner for directories of session plan JSON files.
+
+Runs the checks from ``tests/test_examples.py`` over any tree of plans:
+
+- ``validate``: the file validates as a :class:`SessionPlan` with metadata
+  and a source filename
+- ``round_trip``: dump -> reload is lossless (deep comparison of the
+  validated models), and no input field is dropped by validation (the
+  top-level ``schema_version`` stamp written by :mod:`osti.migrations` is
+  allowed)
+- ``schema``: a generated JSON Schema artifact, when given, matches the
+  schema of the installed models
+
+Files are checked in a process pool. Results are cached by file hash (and
+schema fingerprint) so unchanged files are skipped on the next run, and
+reports can be written as JSON or JUnit XML::
+
+    python -m osti.conformance partners/ --cache .conformance-cache.json --junit report.xml
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Union
+from xml.etree import ElementTree
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .migrations import VERSION_KEY
+from .session_plan import SCHEMA_VERSION, SessionPlan
+
+# Keys scripts/generate.py sets on the exported schema that Pydantic does not produce.
+_ARTIFACT_KEYS = ("$id", "title", "description")
+
+# Bump when the checks change, so cached results from older checks are discarded.
+_CHECKS_VERSION = 3
+
+
+class CheckResult(BaseModel):
+    """Outcome of one check on one file."""
+
+    name: str = Field(..., description="Check name: 'validate', 'round_trip' or 'schema'")
+    passed: bool = Field(..., description="Whether the check passed")
+    details: list[str] = Field(default_factory=list, description="Failure details")
+
+
+class FileResult(BaseModel):
+    """All check outcomes for one file."""
+
+    path: str = Field(..., description="File path relative to the run root")
+    sha256: str = Field(..., description="Hash of the file contents")
+    checks: list[CheckResult] = Field(default_factory=list)
+    cached: bool = Field(False, description="Whether the result came from the cache")
+
+    @property
+    def passed(self) -> bool:
+        return all(check.passed for check in self.checks)
+
+
+class ConformanceReport(BaseModel):
+    """Results of a conformance run."""
+
+    schema_version: str = SCHEMA_VERSION
+    files: list[FileResult] = Field(default_factory=list)
+    schema_check: Optional[CheckResult] = Field(
+        None, description="Schema-artifact agreement, when an artifact was given"
+    )
+
+    @property
+    def passed(self) -> bool:
+        return all(f.passed for f in self.files) and (
+            self.schema_check is None or self.schema_check.passed
+        )
+
+    def failures(self) -> list[FileResult]:
+        return [f for f in self.files if not f.passed]
+
+
+def deep_diff(
+    expected: Any,
+    actual: Any,
+    path: str = "",
+    *,
+    missing: str = "missing after round-trip",
+    unexpected: str = "unexpected",
+) -> list[str]:
+    """List the differences between two nested dict/list values.
+
+    ``missing`` and ``unexpected`` label keys found only in ``expected`` or
+    only in ``actual``.
+    """
+    here = path or "<root>"
+    labels = {"missing": missing, "unexpected": unexpected}
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        diffs = []
+        for key in expected.keys() | actual.keys():
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in actual:
+                diffs.append(f"{sub}: {missing}")
+            elif key not in expected:
+                diffs.append(f"{sub}: {unexpected}")
+            else:
+                diffs.extend(deep_diff(expected[key], actual[key], sub, **labels))
+        return sorted(diffs)
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{here}: length {len(expected)} != {len(actual)}"]
+        diffs = []
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            diffs.extend(deep_diff(e, a, f"{path}[{i}]", **labels))
+        return diffs
+    if expected != actual or type(expected) is bool and type(actual) is not bool:
+        return [f"{here}: {expected!r} != {actual!r}"]
+    return []
+
+
+def dropped_fields(raw: Any, dumped: Any, path: str = "") -> list[str]:
+    """Paths of input keys that validation dropped (unknown or ignored fields).
+
+    Only key presence is compared: values are normalized by their field
+    types (timestamps, UUIDs, enums) and checked by the round-trip instead.
+    """
+    if isinstance(raw, dict) and isinstance(dumped, dict):
+        dropped = []
+        for key, value in raw.items():
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in dumped:
+                dropped.append(sub)
+            else:
+                dropped.extend(dropped_fields(value, dumped[key], sub))
+        return sorted(dropped)
+    if isinstance(raw, list) and isinstance(dumped, list) and len(raw) == len(dumped):
+        return [
+            d
+            for i, (r, v) in enumerate(zip(raw, dumped))
+            for d in dropped_fields(r, v, f"{path}[{i}]")
+        ]
+    return []
+
+
+def check_document(text: Union[str, bytes]) -> list[CheckResult]:
+    """Run the ``validate`` and ``round_trip`` checks on one JSON document."""
+    try:
+        data = json.loads(text)
+        plan = SessionPlan.model_validate(data)
+    except (ValueError, ValidationError) as exc:
+        return [
+            CheckResult(name="validate", passed=False, details=[str(exc)]),
+            CheckResult(name="round_trip", passed=False, details=["not validated"]),
+        ]
+    problems = []
+    if plan.metadata is None:
+        problems.append("metadata: missing")
+    if not plan.source.filename:
+        problems.append("source.filename: empty")
+    validate = CheckResult(name="validate", passed=not problems, details=problems)
+
+    text = plan.model_dump_json()
+    reparsed = SessionPlan.model_validate_json(text)
+    # Compare validated models, so equal values in different spellings
+    # ("+00:00" vs "Z", upper- vs lowercase UUIDs) are not differences.
+    diffs = deep_diff(plan.model_dump(), reparsed.model_dump())
+    # The migration stamp is not a model field, so validation always drops it.
+    data.pop(VERSION_KEY, None)
+    diffs += [f"input {d}: dropped by validation" for d in dropped_fields(data, json.loads(text))]
+    return [validate, CheckResult(name="round_trip", passed=not diffs, details=diffs)]
+
+
+def schema_fingerprint() -> str:
+    """Hash of the current SessionPlan JSON Schema and check logic (cache invalidation key)."""
+    schema = json.dumps(SessionPlan.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(f"{_CHECKS_VERSION}:{schema}".encode()).hexdigest()
+
+
+def check_schema_artifact(path: Union[str, Path]) -> CheckResult:
+    """Compare a generated schema artifact with the installed models' schema."""
+    try:
+        artifact = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        return CheckResult(name="schema", passed=False, details=[str(exc)])
+    for key in _ARTIFACT_KEYS:
+        artifact.pop(key, None)
+    current = SessionPlan.model_json_schema()
+    for key in _ARTIFACT_KEYS:
+        current.pop(key, None)
+    diffs = deep_diff(
+        current, artifact, missing="missing from artifact", unexpected="not in installed schema"
+    )
+    return CheckResult(name="schema", passed=not diffs, details=diffs)
+
+
+def _check_file(args: tuple[str, str]) -> FileResult:
+    path, rel = args
+    data = Path(path).read_bytes()
+    return FileResult(
+        path=rel, sha256=hashlib.sha256(data).hexdigest(), checks=check_document(data)
+    )
+
+
+def _load_cache(path: Optional[Path], fingerprint: str) -> dict[str, dict]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    if cache.get("fingerprint") != fingerprint:
+        return {}
+    return cache.get("files", {})
+
+
+def run(
+    root: Union[str, Path],
+    *,
+    pattern: str = "*.json",
+    schema_artifact: Optional[Union[str, Path]] = None,
+    cache_path: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+) -> ConformanceReport:
+    """Check every file under ``root`` matching ``pattern``.
+
+    Files whose hash matches an entry in ``cache_path`` (written by an
+    earlier run against the same schema) are not re-checked. ``workers`` of
+    0 or 1 runs in-process; otherwise a process pool is used.
+    """
+    root = Path(root)
+    cache_file = Path(cache_path) if cache_path is not None else None
+    fingerprint = schema_fingerprint()
+    cache = _load_cache(cache_file, fingerprint)
+
+    results: dict[str, FileResult] = {}
+    todo: list[tuple[str, str]] = []
+    for file in sorted(root.rglob(pattern)):
+        rel = file.relative_to(root).as_posix()
+        entry = cache.get(rel)
+        if entry is not None:
+            digest = hashlib.sha256(file.read_bytes()).hexdigest()
+            if entry.get("sha256") == digest:
+                result = FileResult.model_validate(entry)
+                result.cached = True
+                results[rel] = result
+                continue
+        todo.append((str(file), rel))
+
+    if workers is not None and workers <= 1:
+        checked = [_check_file(item) for item in todo]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            checked = list(pool.map(_check_file, todo, chunksize=8))
+    for result in checked:
+        results[result.path] = result
+
+    report = ConformanceReport(files=[results[k] for k in sorted(results)])
+    if schema_artifact is not None:
+        report.schema_check = check_schema_artifact(schema_artifact)
+    if cache_file is not None:
+        payload = {
+            "fingerprint": fingerprint,
+            "files": {f.path: f.model_dump(exclude={"cached"}) for f in report.files},
+        }
+        cache_file.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    return report
+
+
+def to_junit(report: ConformanceReport) -> str:
+    """Render a report as JUnit XML (one test case per file and check)."""
+    cases = [(f.path, c) for f in report.files for c in f.checks]
+    if report.schema_check is not None:
+        cases.append(("<schema>", report.schema_check))
+    suite = ElementTree.Element(
+        "testsuite",
+        name="osti.conformance",
+        tests=str(len(cases)),
+        failures=str(sum(not c.passed for _, c in cases)),
+    )
+    for path, check in cases:
+        case = ElementTree.SubElement(suite, "testcase", classname=path, name=check.name)
+        if not check.passed:
+            failure = ElementTree.SubElement(
+                case, "failure", message=check.details[0] if check.details else check.name
+            )
+            failure.text = "\n".join(check.details)
+    return ElementTree.tostring(suite, encoding="unicode", xml_declaration=True)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m osti.conformance",
+        description="Validate and round-trip a directory of OSTI session plans.",
+    )
+    parser.add_argument("root", type=Path, help="Directory to scan")
+    parser.add_argument("--pattern", default="*.json", help="Glob for plan files (default: *.json)")
+    parser.add_argument("--schema", type=Path, default=None, help="Schema artifact to compare")
+    parser.add_argument("--cache", type=Path, default=None, help="Result cache file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--json", type=Path, default=None, help="Write a JSON report here")
+    parser.add_argument("--junit", type=Path, default=None, help="Write a JUnit XML report here")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.root,
+        pattern=args.pattern,
+        schema_artifact=args.schema,
+        cache_path=args.cache,
+        workers=args.workers,
+    )
+    if args.json is not None:
+        args.json.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    if args.junit is not None:
+        args.junit.write_text(to_junit(report), encoding="utf-8")
+
+    cached = sum(f.cached for f in report.files)
+    failed = report.failures()
+    print(f"{len(report.files)} file(s) checked ({cached} cached), {len(failed)} failing")
+    for result in failed:
+        for check in result.checks:
+            if not check.passed:
+                print(f"  FAIL {result.path} [{check.name}] {'; '.join(check.details[:3])}")
+    if report.schema_check is not None and not report.schema_check.passed:
+        print(f"  FAIL schema artifact: {'; '.join(report.schema_check.details[:3])}")
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
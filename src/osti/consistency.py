@@ -0,0 +1,201 @@
+"""Opt-in geometric consistency checks for diagrams, run in bulk.
+
+The schema deliberately leaves coordinates unconstrained (see TODO.md), so
+extractor output can contain points outside the 0-100 system, arrows whose
+``from_label`` / ``to_label`` name no player, zones with swapped corners,
+and gates with only one of ``x2`` / ``y2`` set. :func:`check_diagrams`
+finds these across a whole corpus: every diagram is flattened into
+coordinate and label columns first, and each check is a single pass over a
+column. :func:`fix_diagram` returns a repaired copy.
+
+Issue codes:
+
+- ``out_of_range``: a coordinate outside 0-100
+- ``dangling_label``: an arrow label that names no ``PlayerPosition``
+- ``inverted_zone``: a zone with ``x1 > x2`` or ``y1 > y2``
+- ``partial_gate``: equipment with exactly one of ``x2`` / ``y2`` set
+"""
+
+from collections import Counter
+from math import hypot
+from typing import Any, Iterable, Optional
+
+from pydantic import BaseModel, Field
+
+from .session_plan import DiagramInfo, DrillBlock
+
+ISSUE_CODES = ("out_of_range", "dangling_label", "inverted_zone", "partial_gate")
+
+_COORDINATES = {
+    "player_positions": ("x", "y"),
+    "balls": ("x", "y"),
+    "goals": ("x", "y"),
+    "equipment": ("x", "y", "x2", "y2"),
+    "arrows": ("start_x", "start_y", "end_x", "end_y"),
+    "zones": ("x1", "y1", "x2", "y2"),
+}
+
+
+class Issue(BaseModel):
+    """A single consistency problem."""
+
+    code: str = Field(..., description="Issue code (see ISSUE_CODES)")
+    diagram: str = Field(..., description="Key of the diagram (index, drill id, ...)")
+    path: str = Field(..., description="Location within the diagram (e.g., 'arrows[2].to_label')")
+    value: Optional[str] = Field(None, description="Offending value, as text")
+
+
+class ConsistencyReport(BaseModel):
+    """Issues found across a batch of diagrams."""
+
+    diagrams: int = Field(0, description="Number of diagrams checked")
+    issues: list[Issue] = Field(default_factory=list, description="All issues found")
+
+    def counts(self) -> dict[str, int]:
+        """Number of issues per code."""
+        return dict(Counter(issue.code for issue in self.issues))
+
+    def affected(self) -> set[str]:
+        """Keys of diagrams with at least one issue."""
+        return {issue.diagram for issue in self.issues}
+
+    def summary(self) -> str:
+        """One line per issue code, most frequent first."""
+        counts = Counter(issue.code for issue in self.issues)
+        lines = [
+            f"{self.diagrams} diagram(s) checked, {len(self.affected())} with issues"
+        ]
+        lines.extend(f"{n:>8}  {code}" for code, n in counts.most_common())
+        return "\n".join(lines)
+
+
+def check_diagrams(
+    diagrams: Iterable[DiagramInfo], keys: Optional[Iterable[str]] = None
+) -> ConsistencyReport:
+    """Check many diagrams; ``keys`` name them in the report (default: position)."""
+    diagrams = list(diagrams)
+    keys = [str(k) for k in keys] if keys is not None else [str(i) for i in range(len(diagrams))]
+
+    # Flatten into columns: (diagram, path) references plus the values to test.
+    coord_refs: list[tuple[int, str]] = []
+    coord_values: list[float] = []
+    label_refs: list[tuple[int, str]] = []
+    label_values: list[str] = []
+    player_sets: list[frozenset[str]] = []
+    zone_refs: list[tuple[int, str]] = []
+    zone_bounds: list[tuple[float, float, float, float]] = []
+    gate_refs: list[tuple[int, str]] = []
+    gate_ends: list[tuple[Optional[float], Optional[float]]] = []
+
+    for d, diagram in enumerate(diagrams):
+        player_sets.append(frozenset(p.label for p in diagram.player_positions))
+        for attr, names in _COORDINATES.items():
+            for i, item in enumerate(getattr(diagram, attr)):
+                for name in names:
+                    value = getattr(item, name)
+                    if value is not None:
+                        coord_refs.append((d, f"{attr}[{i}].{name}"))
+                        coord_values.append(value)
+        for i, arrow in enumerate(diagram.arrows):
+            for name in ("from_label", "to_label"):
+                value = getattr(arrow, name)
+                if value is not None:
+                    label_refs.append((d, f"arrows[{i}].{name}"))
+                    label_values.append(value)
+        for i, zone in enumerate(diagram.zones):
+            zone_refs.append((d, f"zones[{i}]"))
+            zone_bounds.append((zone.x1, zone.y1, zone.x2, zone.y2))
+        for i, item in enumerate(diagram.equipment):
+            gate_refs.append((d, f"equipment[{i}]"))
+            gate_ends.append((item.x2, item.y2))
+
+    issues: list[Issue] = []
+    issues.extend(
+        Issue(code="out_of_range", diagram=keys[d], path=path, value=str(v))
+        for (d, path), v in zip(coord_refs, coord_values)
+        if not 0.0 <= v <= 100.0
+    )
+    issues.extend(
+        Issue(code="dangling_label", diagram=keys[d], path=path, value=label)
+        for (d, path), label in zip(label_refs, label_values)
+        if label not in player_sets[d]
+    )
+    issues.extend(
+        Issue(code="inverted_zone", diagram=keys[d], path=path, value=f"{x1},{y1},{x2},{y2}")
+        for (d, path), (x1, y1, x2, y2) in zip(zone_refs, zone_bounds)
+        if x1 > x2 or y1 > y2
+    )
+    issues.extend(
+        Issue(code="partial_gate", diagram=keys[d], path=path, value=f"x2={x2},y2={y2}")
+        for (d, path), (x2, y2) in zip(gate_refs, gate_ends)
+        if (x2 is None) != (y2 is None)
+    )
+    return ConsistencyReport(diagrams=len(diagrams), issues=issues)
+
+
+def check_drills(drills: Iterable[DrillBlock]) -> ConsistencyReport:
+    """Check the diagrams of many drills; issues are keyed by drill id."""
+    drills = list(drills)
+    return check_diagrams((d.diagram for d in drills), keys=(str(d.id) for d in drills))
+
+
+def _clamp(value: Optional[float]) -> Optional[float]:
+    return None if value is None else min(max(value, 0.0), 100.0)
+
+
+def _nearest(players: list[tuple[str, float, float]], x: float, y: float, limit: float) -> Optional[str]:
+    best: Optional[str] = None
+    best_distance = limit
+    for label, px, py in players:
+        distance = hypot(px - x, py - y)
+        if distance <= best_distance:
+            best, best_distance = label, distance
+    return best
+
+
+def fix_diagram(
+    diagram: DiagramInfo,
+    *,
+    clamp: bool = True,
+    swap_zones: bool = True,
+    snap_labels: bool = True,
+    drop_partial_gates: bool = True,
+    snap_distance: float = 10.0,
+) -> DiagramInfo:
+    """Return a copy of ``diagram`` with consistency issues repaired.
+
+    - ``clamp``: coordinates are clamped into 0-100.
+    - ``swap_zones``: zone corners are reordered so ``x1 <= x2`` and ``y1 <= y2``.
+    - ``snap_labels``: a dangling arrow label is replaced by the label of the
+      nearest player within ``snap_distance`` of that arrow end, or cleared
+      if there is none.
+    - ``drop_partial_gates``: a lone ``x2`` or ``y2`` is cleared.
+    """
+    fixed = diagram.model_copy(deep=True)
+    if clamp:
+        for attr, names in _COORDINATES.items():
+            for item in getattr(fixed, attr):
+                for name in names:
+                    setattr(item, name, _clamp(getattr(item, name)))
+    if swap_zones:
+        for zone in fixed.zones:
+            zone.x1, zone.x2 = sorted((zone.x1, zone.x2))
+            zone.y1, zone.y2 = sorted((zone.y1, zone.y2))
+    if snap_labels:
+        players = [(p.label, p.x, p.y) for p in fixed.player_positions]
+        known = {label for label, _, _ in players}
+        for arrow in fixed.arrows:
+            if arrow.from_label is not None and arrow.from_label not in known:
+                arrow.from_label = _nearest(players, arrow.start_x, arrow.start_y, snap_distance)
+            if arrow.to_label is not None and arrow.to_label not in known:
+                arrow.to_label = _nearest(players, arrow.end_x, arrow.end_y, snap_distance)
+    if drop_partial_gates:
+        for item in fixed.equipment:
+            if (item.x2 is None) != (item.y2 is None):
+                item.x2 = item.y2 = None
+    return fixed
+
+
+def fix_drill(drill: DrillBlock, **options: Any) -> DrillBlock:
+    """Return a copy of ``drill`` whose diagram was passed through :func:`fix_diagram`."""
+    return drill.model_copy(update={"diagram": fix_diagram(drill.diagram, **options)})
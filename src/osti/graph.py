@@ -0,0 +1,250 @@
+"""Arrow sequence graphs and play-pattern analytics.
+
+A diagram's :class:`MovementArrow` objects, linked by ``from_label`` /
+``to_label`` and ordered by ``sequence_number``, form a directed graph of
+passes and runs between players. :class:`ArrowGraph` indexes that graph once
+and answers the common queries (pass chains, involvement, third-man
+combinations). :func:`drill_signature` reduces a graph to a small, storable
+:class:`DrillSignature`, and :class:`PatternIndex` mines patterns across a
+corpus from signatures alone, without walking diagrams again.
+"""
+
+from collections import Counter
+from typing import Iterable, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+
+from .session_plan import ArrowType, DiagramInfo
+
+BALL_ARROWS = frozenset({ArrowType.PASS, ArrowType.THROUGH_BALL, ArrowType.CROSS, ArrowType.SHOT})
+"""Arrow types that move the ball away from a player."""
+
+RUN_ARROWS = frozenset({ArrowType.RUN, ArrowType.MOVEMENT})
+"""Arrow types for off-the-ball movement."""
+
+
+class Edge(NamedTuple):
+    """One arrow in graph form; ``index`` is its position in ``DiagramInfo.arrows``."""
+
+    index: int
+    source: Optional[str]
+    target: Optional[str]
+    arrow_type: ArrowType
+    sequence: Optional[int]
+
+
+class ArrowGraph:
+    """Indexed adjacency structure over a diagram's arrows.
+
+    Edges are kept in sequence order: numbered arrows first (by
+    ``sequence_number``), then unnumbered arrows in their original order.
+    """
+
+    def __init__(self, diagram: DiagramInfo):
+        order = sorted(
+            range(len(diagram.arrows)),
+            key=lambda i: (
+                diagram.arrows[i].sequence_number is None,
+                diagram.arrows[i].sequence_number or 0,
+                i,
+            ),
+        )
+        self.edges: list[Edge] = [
+            Edge(
+                i,
+                diagram.arrows[i].from_label,
+                diagram.arrows[i].to_label,
+                diagram.arrows[i].arrow_type,
+                diagram.arrows[i].sequence_number,
+            )
+            for i in order
+        ]
+        self.nodes: list[str] = [p.label for p in diagram.player_positions]
+        known = set(self.nodes)
+        self.out_edges: dict[str, list[int]] = {}
+        self.in_edges: dict[str, list[int]] = {}
+        for pos, edge in enumerate(self.edges):
+            for label, index in ((edge.source, self.out_edges), (edge.target, self.in_edges)):
+                if label is None:
+                    continue
+                if label not in known:
+                    known.add(label)
+                    self.nodes.append(label)
+                index.setdefault(label, []).append(pos)
+
+    def successors(self, label: str) -> list[str]:
+        """Labels reached by arrows leaving ``label``, in sequence order."""
+        return [
+            t for t in (self.edges[i].target for i in self.out_edges.get(label, [])) if t is not None
+        ]
+
+    def predecessors(self, label: str) -> list[str]:
+        """Labels whose arrows arrive at ``label``, in sequence order."""
+        return [
+            s for s in (self.edges[i].source for i in self.in_edges.get(label, [])) if s is not None
+        ]
+
+    def involvement(self) -> Counter:
+        """Number of arrows each label starts or ends."""
+        counts: Counter = Counter()
+        for edge in self.edges:
+            if edge.source is not None:
+                counts[edge.source] += 1
+            if edge.target is not None and edge.target != edge.source:
+                counts[edge.target] += 1
+        return counts
+
+    def pass_chains(self, min_length: int = 1) -> list[list[Edge]]:
+        """Sequences of ball arrows where each receiver plays the next ball.
+
+        Each ball arrow extends the open chain whose last receiver is the
+        arrow's ``from_label``, otherwise it starts a new chain. A shot (or
+        any ball arrow without a ``to_label``) closes its chain.
+        """
+        chains: list[list[Edge]] = []
+        open_by_holder: dict[str, list[Edge]] = {}
+        for edge in self.edges:
+            if edge.arrow_type not in BALL_ARROWS:
+                continue
+            chain = open_by_holder.pop(edge.source, None) if edge.source is not None else None
+            if chain is None:
+                chain = []
+                chains.append(chain)
+            chain.append(edge)
+            if edge.target is not None and edge.arrow_type is not ArrowType.SHOT:
+                open_by_holder[edge.target] = chain
+        return [c for c in chains if len(c) >= min_length]
+
+    def third_man(self) -> list[tuple[str, str, str]]:
+        """``(A, B, C)`` combinations where A plays B, B plays C, and C made a run.
+
+        C's run must be numbered no later than B's pass to C (unnumbered runs
+        count), and A, B and C must be distinct.
+        """
+        found: list[tuple[str, str, str]] = []
+        for chain in self.pass_chains(min_length=2):
+            for first, second in zip(chain, chain[1:]):
+                a, b, c = first.source, first.target, second.target
+                if a is None or c is None or len({a, b, c}) < 3:
+                    continue
+                if any(
+                    self.edges[i].arrow_type in RUN_ARROWS
+                    and (
+                        self.edges[i].sequence is None
+                        or second.sequence is None
+                        or self.edges[i].sequence <= second.sequence
+                    )
+                    for i in self.out_edges.get(c, [])
+                ):
+                    found.append((a, b, c))
+        return found
+
+
+class DrillSignature(BaseModel):
+    """Precomputed play-pattern summary of one drill diagram."""
+
+    patterns: list[str] = Field(
+        default_factory=list,
+        description="Arrow-type n-grams along pass chains (e.g., 'pass>shot')",
+    )
+    shapes: list[str] = Field(
+        default_factory=list,
+        description="Label shapes of pass chains (e.g., 'a>b>a' for a one-two)",
+    )
+    third_man: int = Field(0, description="Number of third-man combinations")
+    ball_arrows: int = Field(0, description="Number of passes, crosses and shots")
+    runs: int = Field(0, description="Number of off-the-ball runs")
+
+
+def _shape(chain: list[Edge]) -> str:
+    names: dict[Optional[str], str] = {}
+    labels = [chain[0].source] + [e.target for e in chain]
+    return ">".join(
+        "goal" if label is None else names.setdefault(label, chr(ord("a") + len(names)))
+        for label in labels
+    )
+
+
+def drill_signature(diagram: DiagramInfo, max_n: int = 3) -> DrillSignature:
+    """Summarize ``diagram`` into a :class:`DrillSignature`.
+
+    ``patterns`` holds every arrow-type n-gram (``2 <= n <= max_n``) along
+    each pass chain; ``shapes`` holds the label shape of chains with two or
+    more arrows.
+    """
+    graph = ArrowGraph(diagram)
+    patterns: list[str] = []
+    shapes: list[str] = []
+    for chain in graph.pass_chains():
+        types = [e.arrow_type.value for e in chain]
+        for n in range(2, max_n + 1):
+            patterns.extend(">".join(types[i:i + n]) for i in range(len(types) - n + 1))
+        if len(chain) >= 2 and chain[0].source is not None:
+            shapes.append(_shape(chain))
+    return DrillSignature(
+        patterns=patterns,
+        shapes=shapes,
+        third_man=len(graph.third_man()),
+        ball_arrows=sum(e.arrow_type in BALL_ARROWS for e in graph.edges),
+        runs=sum(e.arrow_type in RUN_ARROWS for e in graph.edges),
+    )
+
+
+class PatternIndex:
+    """Corpus-wide pattern counts and an inverted index from signatures.
+
+    Example::
+
+        index = PatternIndex()
+        for drill in drills:
+            index.add(str(drill.id), drill_signature(drill.diagram))
+        index.most_common(10)
+        index.drills_with("a>b>a")
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.third_man_drills: set[str] = set()
+        self._postings: dict[str, set[str]] = {}
+        self._signatures: dict[str, DrillSignature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, drill_id: str, signature: DrillSignature) -> None:
+        """Index one drill's signature, replacing any earlier one for ``drill_id``."""
+        if drill_id in self._signatures:
+            self.remove(drill_id)
+        self._signatures[drill_id] = signature
+        tokens = signature.patterns + signature.shapes
+        self.counts.update(tokens)
+        for token in set(tokens):
+            self._postings.setdefault(token, set()).add(drill_id)
+        if signature.third_man:
+            self.third_man_drills.add(drill_id)
+
+    def remove(self, drill_id: str) -> None:
+        """Drop a drill from the index."""
+        signature = self._signatures.pop(drill_id)
+        tokens = signature.patterns + signature.shapes
+        self.counts.subtract(tokens)
+        self.counts += Counter()  # drop zero counts
+        for token in set(tokens):
+            postings = self._postings[token]
+            postings.discard(drill_id)
+            if not postings:
+                del self._postings[token]
+        self.third_man_drills.discard(drill_id)
+
+    def update(self, signatures: Iterable[tuple[str, DrillSignature]]) -> None:
+        """Index many ``(drill_id, signature)`` pairs."""
+        for drill_id, signature in signatures:
+            self.add(drill_id, signature)
+
+    def most_common(self, n: Optional[int] = None) -> list[tuple[str, int]]:
+        """Most frequent patterns and shapes across the corpus."""
+        return self.counts.most_common(n)
+
+    def drills_with(self, pattern: str) -> set[str]:
+        """Ids of drills containing ``pattern`` (an n-gram or a shape)."""
+        return set(self._postings.get(pattern, ()))
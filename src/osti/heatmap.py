@@ -0,0 +1,215 @@
+"""Occupancy heatmaps over the 0-100 pitch for corpora of diagrams.
+
+Entities from many :class:`DiagramInfo` objects are binned into regular 2D
+grids. Coordinates are first gathered into flat per-group columns and then
+binned in one pass per column, so the cost is linear in the number of
+entities. Grids with the same shape can be merged, so a corpus can be split
+across processes (or processed incrementally) and the partial results added
+together.
+
+Example::
+
+    grids = occupancy(diagrams, layer="players", group_by="role", bins=(12, 8))
+    keeper = grids["goalkeeper"].rows()
+"""
+
+from enum import Enum
+from typing import Iterable, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from .session_plan import (
+    BallPosition,
+    DiagramInfo,
+    EquipmentObject,
+    MovementArrow,
+    PlayerPosition,
+    SessionPlan,
+)
+from .tactical import GameElement
+
+LAYERS = ("players", "balls", "equipment", "arrow_starts", "arrow_ends")
+"""Entity layers that can be binned."""
+
+GROUP_BY = (None, "role", "color", "label", "arrow_type", "equipment_type")
+"""Attributes a layer can be grouped by (``None`` = one grid per layer)."""
+
+_LAYER_MODELS: dict[str, type[BaseModel]] = {
+    "players": PlayerPosition,
+    "balls": BallPosition,
+    "equipment": EquipmentObject,
+    "arrow_starts": MovementArrow,
+    "arrow_ends": MovementArrow,
+}
+
+
+class OccupancyGrid(BaseModel):
+    """Counts of entities per cell of an ``nx`` x ``ny`` grid over the pitch.
+
+    Cells are stored row-major in ``counts``: row ``iy`` covers
+    ``y`` in ``[iy * 100 / ny, (iy + 1) * 100 / ny)`` and the last row and
+    column also include the 100 edge. Points outside 0-100 are not binned
+    and are counted in ``dropped``.
+    """
+
+    nx: int = Field(10, ge=1, description="Number of columns along x")
+    ny: int = Field(10, ge=1, description="Number of rows along y")
+    counts: list[int] = Field(default_factory=list, description="Row-major cell counts")
+    dropped: int = Field(0, description="Points outside the 0-100 range")
+
+    @model_validator(mode="after")
+    def _fill_counts(self) -> "OccupancyGrid":
+        if not self.counts:
+            self.counts = [0] * (self.nx * self.ny)
+        elif len(self.counts) != self.nx * self.ny:
+            raise ValueError("counts must have nx * ny entries")
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of binned points."""
+        return sum(self.counts)
+
+    def add_points(self, xs: list[float], ys: list[float]) -> None:
+        """Bin paired coordinate columns into the grid."""
+        nx, ny = self.nx, self.ny
+        sx, sy = nx / 100.0, ny / 100.0
+        counts = self.counts
+        inside = [
+            (x, y) for x, y in zip(xs, ys) if 0.0 <= x <= 100.0 and 0.0 <= y <= 100.0
+        ]
+        self.dropped += len(xs) - len(inside)
+        for cell in [
+            min(int(y * sy), ny - 1) * nx + min(int(x * sx), nx - 1) for x, y in inside
+        ]:
+            counts[cell] += 1
+
+    def cell(self, ix: int, iy: int) -> int:
+        """Count in column ``ix``, row ``iy``."""
+        return self.counts[iy * self.nx + ix]
+
+    def rows(self) -> list[list[int]]:
+        """Counts as a list of rows, from ``y=0`` upwards."""
+        return [self.counts[i:i + self.nx] for i in range(0, len(self.counts), self.nx)]
+
+    def normalized(self) -> list[float]:
+        """Row-major cell shares that sum to 1 (all zeros for an empty grid)."""
+        total = self.total
+        if not total:
+            return [0.0] * len(self.counts)
+        return [c / total for c in self.counts]
+
+    def merge(self, other: "OccupancyGrid") -> "OccupancyGrid":
+        """Add ``other``'s counts into this grid in place and return it."""
+        if (self.nx, self.ny) != (other.nx, other.ny):
+            raise ValueError(
+                f"Cannot merge {other.nx}x{other.ny} grid into {self.nx}x{self.ny} grid"
+            )
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.dropped += other.dropped
+        return self
+
+    def __add__(self, other: "OccupancyGrid") -> "OccupancyGrid":
+        return self.model_copy(deep=True).merge(other)
+
+
+def _key(value: Optional[object]) -> Optional[str]:
+    if isinstance(value, Enum):
+        return value.value
+    return None if value is None else str(value)
+
+
+def _columns(
+    diagrams: Iterable[DiagramInfo], layer: str, group_by: Optional[str]
+) -> dict[Optional[str], tuple[list[float], list[float]]]:
+    """Gather per-group x/y columns for one layer."""
+    columns: dict[Optional[str], tuple[list[float], list[float]]] = {}
+    for diagram in diagrams:
+        if layer == "players":
+            items = diagram.player_positions
+        elif layer == "balls":
+            items = diagram.balls
+        elif layer == "equipment":
+            items = diagram.equipment
+        else:
+            items = diagram.arrows
+        for item in items:
+            key = _key(getattr(item, group_by, None)) if group_by else None
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = ([], [])
+            xs, ys = column
+            if layer == "arrow_starts":
+                xs.append(item.start_x)
+                ys.append(item.start_y)
+            elif layer == "arrow_ends":
+                xs.append(item.end_x)
+                ys.append(item.end_y)
+            else:
+                xs.append(item.x)
+                ys.append(item.y)
+    return columns
+
+
+def occupancy(
+    diagrams: Iterable[DiagramInfo],
+    layer: str = "players",
+    group_by: Optional[str] = None,
+    bins: tuple[int, int] = (10, 10),
+) -> dict[Optional[str], OccupancyGrid]:
+    """Bin one entity layer of ``diagrams`` into grids keyed by group.
+
+    ``layer`` is one of :data:`LAYERS`. With ``group_by`` (e.g. ``"role"``,
+    ``"color"``, ``"arrow_type"``) one grid is returned per distinct value,
+    with entities whose attribute is unset under ``None``; without it a
+    single grid is returned under ``None``. Raises ``ValueError`` for an
+    attribute the layer's entities do not have.
+    """
+    if layer not in LAYERS:
+        raise ValueError(f"Unknown layer {layer!r}; expected one of {LAYERS}")
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Unknown group_by {group_by!r}; expected one of {GROUP_BY}")
+    model = _LAYER_MODELS[layer]
+    if group_by is not None and group_by not in model.model_fields:
+        valid = [g for g in GROUP_BY if g is None or g in model.model_fields]
+        raise ValueError(
+            f"Layer {layer!r} cannot be grouped by {group_by!r}; expected one of {valid}"
+        )
+    nx, ny = bins
+    grids: dict[Optional[str], OccupancyGrid] = {}
+    for key, (xs, ys) in _columns(diagrams, layer, group_by).items():
+        grid = grids[key] = OccupancyGrid(nx=nx, ny=ny)
+        grid.add_points(xs, ys)
+    return grids
+
+
+def merge_occupancy(
+    *partials: dict[Optional[str], OccupancyGrid],
+) -> dict[Optional[str], OccupancyGrid]:
+    """Merge grid dicts from :func:`occupancy` (e.g. one per worker or batch)."""
+    merged: dict[Optional[str], OccupancyGrid] = {}
+    for partial in partials:
+        for key, grid in partial.items():
+            if key in merged:
+                merged[key].merge(grid)
+            else:
+                merged[key] = grid.model_copy(deep=True)
+    return merged
+
+
+def iter_diagrams(
+    plans: Iterable[SessionPlan],
+    category: Optional[str] = None,
+    game_element: Optional[GameElement] = None,
+) -> Iterable[DiagramInfo]:
+    """Yield drill diagrams, optionally filtered by session category or game element."""
+    for plan in plans:
+        if category is not None and plan.metadata.category != category:
+            continue
+        for drill in plan.drills:
+            if game_element is not None and (
+                drill.tactical_context is None
+                or drill.tactical_context.game_element != game_element
+            ):
+                continue
+            yield drill.diagram
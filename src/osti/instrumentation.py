@@ -0,0 +1,414 @@
+"""Opt-in instrumentation of OSTI validation and serialization.
+
+Instrumentation is off by default. While it is off, :func:`validate` and
+:func:`dump_json` cost one boolean check on top of the plain Pydantic call.
+When it is on (:func:`enable` or the :func:`instrumented` context manager),
+they record counts, wall time and payload sizes into a latency histogram,
+which :func:`flush` hands to pluggable sinks: a logger, a Prometheus
+text-format file, or a callback in the style of an OpenTelemetry
+instrument. These wrappers record the model they were called with
+(normally ``SessionPlan``) as one measurement; nested models are not timed
+separately.
+
+Per-model numbers come only from the offline :func:`profile`, which
+validates every model-typed subtree of a raw plan on its own, attributing
+time to ``DiagramInfo``, ``Extension``, ``Source`` and so on. Run
+``python -m osti.instrumentation <path>`` to profile a sample corpus and
+print a hot-model report.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from types import UnionType
+from typing import Any, Callable, Iterator, Optional, Protocol, Union, get_args, get_origin
+
+from pydantic import BaseModel, Field
+
+from .session_plan import SessionPlan
+
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+"""Upper bounds (seconds) of the latency histogram buckets; a final +Inf bucket is implied."""
+
+logger = logging.getLogger("osti.instrumentation")
+
+
+class ModelStats(BaseModel):
+    """Aggregated measurements for one model and operation."""
+
+    model: str = Field(..., description="Model class name (e.g., 'DiagramInfo')")
+    operation: str = Field(..., description="'validate', 'serialize' or 'profile'")
+    count: int = Field(0, description="Number of calls")
+    seconds: float = Field(0.0, description="Total wall time in seconds")
+    self_seconds: float = Field(
+        0.0, description="Wall time excluding nested models (profile only)"
+    )
+    max_seconds: float = Field(0.0, description="Slowest single call in seconds")
+    payload_bytes: int = Field(0, description="Total JSON payload size in bytes")
+    buckets: list[int] = Field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1),
+        description="Latency histogram counts per LATENCY_BUCKETS bound, then +Inf",
+    )
+
+
+class Sink(Protocol):
+    """Destination for flushed measurements.
+
+    A sink with a true ``cumulative`` attribute receives running totals since
+    the last :func:`reset` on every flush; other sinks receive the
+    measurements recorded since the previous flush.
+    """
+
+    def emit(self, stats: list[ModelStats]) -> None: ...
+
+
+class LoggingSink:
+    """Logs one line per model and operation."""
+
+    def __init__(self, log: logging.Logger = logger, level: int = logging.INFO):
+        self.log = log
+        self.level = level
+
+    def emit(self, stats: list[ModelStats]) -> None:
+        for s in stats:
+            self.log.log(
+                self.level,
+                "%s %s: count=%d total=%.6fs max=%.6fs bytes=%d",
+                s.operation, s.model, s.count, s.seconds, s.max_seconds, s.payload_bytes,
+            )
+
+
+class PrometheusTextSink:
+    """Writes the Prometheus text exposition format to a file (e.g. for node_exporter).
+
+    Prometheus counters must only grow, so this sink is ``cumulative``: each
+    flush rewrites the file with totals since the last :func:`reset`.
+    """
+
+    cumulative = True
+
+    def __init__(self, path: Union[str, Path], prefix: str = "osti"):
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def render(self, stats: list[ModelStats]) -> str:
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_calls_total counter",
+            f"# TYPE {p}_payload_bytes_total counter",
+            f"# TYPE {p}_duration_seconds histogram",
+        ]
+        for s in stats:
+            labels = f'model="{s.model}",operation="{s.operation}"'
+            lines.append(f"{p}_calls_total{{{labels}}} {s.count}")
+            lines.append(f"{p}_payload_bytes_total{{{labels}}} {s.payload_bytes}")
+            cumulative = 0
+            for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), s.buckets):
+                cumulative += n
+                lines.append(f'{p}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{p}_duration_seconds_sum{{{labels}}} {s.seconds:.9f}")
+            lines.append(f"{p}_duration_seconds_count{{{labels}}} {s.count}")
+        return "\n".join(lines) + "\n"
+
+    def emit(self, stats: list[ModelStats]) -> None:
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.path.parent, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(self.render(stats))
+        Path(tmp.name).replace(self.path)
+
+
+class CallbackSink:
+    """Calls ``callback(name, value, attributes)`` per measurement.
+
+    Mirrors the shape of OpenTelemetry counter ``add`` calls, so an adapter
+    can forward measurements without OSTI depending on the OpenTelemetry SDK.
+    Each value is a sum over the flushed window: ``osti.duration.total`` is
+    the total seconds of ``osti.calls`` calls, not one call's duration, and
+    belongs in a counter rather than a histogram.
+    """
+
+    def __init__(self, callback: Callable[[str, float, dict[str, str]], None]):
+        self.callback = callback
+
+    def emit(self, stats: list[ModelStats]) -> None:
+        for s in stats:
+            attributes = {"model": s.model, "operation": s.operation}
+            self.callback("osti.calls", s.count, attributes)
+            self.callback("osti.duration.total", s.seconds, attributes)
+            self.callback("osti.payload_bytes", s.payload_bytes, attributes)
+
+
+def _merge(into: dict[tuple[str, str], ModelStats], stats: ModelStats) -> None:
+    current = into.get((stats.model, stats.operation))
+    if current is None:
+        into[(stats.model, stats.operation)] = stats.model_copy(deep=True)
+        return
+    current.count += stats.count
+    current.seconds += stats.seconds
+    current.self_seconds += stats.self_seconds
+    current.max_seconds = max(current.max_seconds, stats.max_seconds)
+    current.payload_bytes += stats.payload_bytes
+    current.buckets = [a + b for a, b in zip(current.buckets, stats.buckets)]
+
+
+def _ordered(stats: list[ModelStats]) -> list[ModelStats]:
+    return sorted(stats, key=lambda s: (-s.self_seconds, s.model, s.operation))
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sinks: list[Sink] = []
+        self._stats: dict[tuple[str, str], ModelStats] = {}
+        # Measurements already handed out by a resetting snapshot.
+        self._flushed: dict[tuple[str, str], ModelStats] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        model: str,
+        operation: str,
+        seconds: float,
+        nbytes: int = 0,
+        self_seconds: Optional[float] = None,
+    ) -> None:
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self._lock:
+            stats = self._stats.get((model, operation))
+            if stats is None:
+                stats = self._stats[(model, operation)] = ModelStats(
+                    model=model, operation=operation
+                )
+            stats.count += 1
+            stats.seconds += seconds
+            stats.self_seconds += seconds if self_seconds is None else self_seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.payload_bytes += nbytes
+            stats.buckets[bucket] += 1
+
+    def snapshot(self, reset: bool = False) -> list[ModelStats]:
+        """Measurements since the last resetting snapshot."""
+        with self._lock:
+            stats = [s.model_copy(deep=True) for s in self._stats.values()]
+            if reset:
+                for s in self._stats.values():
+                    _merge(self._flushed, s)
+                self._stats.clear()
+        return _ordered(stats)
+
+    def totals(self) -> list[ModelStats]:
+        """Measurements since the last :meth:`clear`."""
+        with self._lock:
+            merged = {k: s.model_copy(deep=True) for k, s in self._flushed.items()}
+            for s in self._stats.values():
+                _merge(merged, s)
+        return _ordered(list(merged.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._flushed.clear()
+
+
+_recorder = _Recorder()
+
+
+def enable(*sinks: Sink) -> None:
+    """Turn instrumentation on, replacing the configured sinks with ``sinks``."""
+    _recorder.sinks = list(sinks)
+    _recorder.enabled = True
+
+
+def disable() -> None:
+    """Turn instrumentation off; recorded measurements are kept until :func:`reset`."""
+    _recorder.enabled = False
+
+
+def is_enabled() -> bool:
+    return _recorder.enabled
+
+
+@contextmanager
+def instrumented(*sinks: Sink) -> Iterator[None]:
+    """Enable instrumentation for a block, flushing to ``sinks`` on exit."""
+    previous, was_enabled = _recorder.sinks, _recorder.enabled
+    enable(*sinks)
+    try:
+        yield
+    finally:
+        flush()
+        _recorder.sinks, _recorder.enabled = previous, was_enabled
+
+
+def snapshot() -> list[ModelStats]:
+    """Current measurements, hottest (by self time) first."""
+    return _recorder.snapshot()
+
+
+def reset() -> None:
+    """Discard all recorded measurements, including cumulative totals."""
+    _recorder.clear()
+
+
+def flush(reset_after: bool = True) -> list[ModelStats]:
+    """Emit measurements to every sink and return those since the last flush.
+
+    Cumulative sinks (see :class:`Sink`) receive running totals instead.
+    """
+    stats = _recorder.snapshot(reset=reset_after)
+    totals = None
+    for sink in _recorder.sinks:
+        if getattr(sink, "cumulative", False):
+            if totals is None:
+                totals = _recorder.totals()
+            sink.emit(totals)
+        else:
+            sink.emit(stats)
+    return stats
+
+
+def validate(data: Union[dict, str, bytes], model: type[BaseModel] = SessionPlan) -> BaseModel:
+    """Validate ``data`` (dict or JSON) as ``model``, recording it when enabled."""
+    is_json = isinstance(data, (str, bytes))
+    if not _recorder.enabled:
+        return model.model_validate_json(data) if is_json else model.model_validate(data)
+    start = time.perf_counter()
+    result = model.model_validate_json(data) if is_json else model.model_validate(data)
+    elapsed = time.perf_counter() - start
+    nbytes = len(data.encode("utf-8") if isinstance(data, str) else data) if is_json else 0
+    _recorder.record(model.__name__, "validate", elapsed, nbytes)
+    return result
+
+
+def dump_json(instance: BaseModel, **kwargs: Any) -> str:
+    """``instance.model_dump_json(**kwargs)``, recording it when enabled."""
+    if not _recorder.enabled:
+        return instance.model_dump_json(**kwargs)
+    start = time.perf_counter()
+    text = instance.model_dump_json(**kwargs)
+    elapsed = time.perf_counter() - start
+    _recorder.record(type(instance).__name__, "serialize", elapsed, len(text.encode("utf-8")))
+    return text
+
+
+def _model_fields(model: type[BaseModel]) -> list[tuple[str, type[BaseModel], bool]]:
+    """Fields of ``model`` holding nested models, as (name, model, is_list)."""
+    found = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        is_list = False
+        while True:
+            origin = get_origin(annotation)
+            if origin in (Union, UnionType):
+                args = [a for a in get_args(annotation) if a is not type(None)]
+                if len(args) != 1:
+                    break
+                annotation = args[0]
+            elif origin is list:
+                annotation = get_args(annotation)[0]
+                is_list = True
+            else:
+                break
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            found.append((name, annotation, is_list))
+    return found
+
+
+def _profile_node(model: type[BaseModel], data: Any) -> float:
+    children = 0.0
+    if isinstance(data, dict):
+        for name, child_model, is_list in _model_fields(model):
+            value = data.get(name)
+            if value is None:
+                continue
+            for item in value if is_list and isinstance(value, list) else [value]:
+                children += _profile_node(child_model, item)
+    start = time.perf_counter()
+    try:
+        model.model_validate(data)
+    except ValueError:
+        pass
+    elapsed = time.perf_counter() - start
+    nbytes = len(json.dumps(data, separators=(",", ":"), default=str))
+    _recorder.record(model.__name__, "profile", elapsed, nbytes, max(elapsed - children, 0.0))
+    return elapsed
+
+
+def profile(data: Union[dict, str, bytes], model: type[BaseModel] = SessionPlan) -> None:
+    """Validate every model-typed subtree of ``data`` separately and record each.
+
+    Subtrees are validated bottom-up and each model's self time is its
+    time minus that of its nested models, so the report points at the
+    models that dominate validation. This does several times the work of a
+    plain validation and is meant for offline profiling. Records even when
+    instrumentation is disabled.
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    _profile_node(model, data)
+
+
+def format_report(stats: list[ModelStats], limit: Optional[int] = None) -> str:
+    """Render measurements as a fixed-width table, hottest first."""
+    lines = [
+        f"{'model':<20} {'operation':<10} {'count':>8} {'self ms':>10} "
+        f"{'total ms':>10} {'mean us':>9} {'max us':>9} {'KiB':>10}"
+    ]
+    for s in stats[:limit]:
+        mean = s.seconds / s.count if s.count else 0.0
+        lines.append(
+            f"{s.model:<20} {s.operation:<10} {s.count:>8} {s.self_seconds * 1e3:>10.2f} "
+            f"{s.seconds * 1e3:>10.2f} {mean * 1e6:>9.1f} {s.max_seconds * 1e6:>9.1f} "
+            f"{s.payload_bytes / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _iter_documents(path: Path) -> Iterator[str]:
+    files = sorted(path.rglob("*.json*")) if path.is_dir() else [path]
+    for file in files:
+        if file.suffix == ".jsonl":
+            with open(file, encoding="utf-8") as fh:
+                yield from (line for line in fh if line.strip())
+        elif file.suffix == ".json":
+            yield file.read_text(encoding="utf-8")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m osti.instrumentation",
+        description="Profile SessionPlan validation over a sample corpus.",
+    )
+    parser.add_argument("path", type=Path, help="JSON/JSONL file or directory of them")
+    parser.add_argument("--limit", type=int, default=None, help="Profile at most N plans")
+    parser.add_argument("--top", type=int, default=None, help="Show only the N hottest rows")
+    parser.add_argument("--prometheus", type=Path, default=None, help="Also write metrics here")
+    args = parser.parse_args(argv)
+
+    reset()
+    plans = 0
+    for text in _iter_documents(args.path):
+        if args.limit is not None and plans >= args.limit:
+            break
+        profile(text)
+        plans += 1
+    stats = snapshot()
+    print(f"Profiled {plans} plan(s) from {args.path}")
+    print(format_report(stats, args.top))
+    if args.prometheus is not None:
+        PrometheusTextSink(args.prometheus).emit(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Lane and third classification of diagram entities.
+
+Derives :class:`LaneName` values (and pitch thirds) from diagram geometry so
+``TacticalContext.lanes`` can be suggested instead of filled in by hand.
+
+Conventions: the team in possession attacks towards the far end of the
+pitch's long axis (``y=100`` for ``vertical`` diagrams, ``x=100`` for
+``horizontal`` ones), and "left" is the attacking team's left. Lane
+boundaries follow the usual five-lane split on a 68 m wide pitch: the wings
+end at the penalty-area edges and the central corridor spans the width of
+the goal area.
+"""
+
+from bisect import bisect_right
+from enum import Enum
+from typing import Iterable, NamedTuple, Optional
+
+from .session_plan import DiagramInfo, PitchView, PitchViewType, SessionPlan
+from .tactical import LaneName, TacticalContext
+
+_LANE_BOUNDS = (20.35, 36.53, 63.47, 79.65)
+"""Lane edges as a percentage of pitch width, measured from the attacking left."""
+
+_LANES = (
+    LaneName.LEFT_WING,
+    LaneName.LEFT_HALF_SPACE,
+    LaneName.CENTRAL_CORRIDOR,
+    LaneName.RIGHT_HALF_SPACE,
+    LaneName.RIGHT_WING,
+)
+
+_THIRD_BOUNDS = (100 / 3, 200 / 3)
+
+# Visible area -> full pitch, as (offset, scale) for (width, length) axes.
+_VIEW_SPAN: dict[PitchViewType, tuple[tuple[float, float], tuple[float, float]]] = {
+    PitchViewType.FULL_PITCH: ((0.0, 1.0), (0.0, 1.0)),
+    PitchViewType.HALF_PITCH: ((0.0, 1.0), (50.0, 0.5)),
+    PitchViewType.THIRD: ((0.0, 1.0), (200 / 3, 1 / 3)),
+    PitchViewType.PENALTY_AREA: ((20.35, 0.593), (84.3, 0.157)),
+}
+
+
+class PitchThird(str, Enum):
+    """Horizontal thirds of the pitch, from the attacking team's perspective."""
+
+    DEFENSIVE = "defensive"
+    MIDDLE = "middle"
+    ATTACKING = "attacking"
+
+
+_THIRDS = (PitchThird.DEFENSIVE, PitchThird.MIDDLE, PitchThird.ATTACKING)
+
+
+class EntityZone(NamedTuple):
+    """Lane and third assigned to one diagram entity (or arrow endpoint)."""
+
+    kind: str
+    index: int
+    label: Optional[str]
+    lane: LaneName
+    third: PitchThird
+
+
+def _frame(pitch_view: Optional[PitchView]) -> tuple[bool, tuple[float, float], tuple[float, float]]:
+    """Return (horizontal, width_span, length_span) for a pitch view."""
+    if pitch_view is None:
+        return False, (0.0, 1.0), (0.0, 1.0)
+    horizontal = pitch_view.orientation.strip().lower() == "horizontal"
+    width, length = _VIEW_SPAN.get(pitch_view.view_type, ((0.0, 1.0), (0.0, 1.0)))
+    return horizontal, width, length
+
+
+def classify_points(
+    xs: list[float], ys: list[float], pitch_view: Optional[PitchView] = None
+) -> tuple[list[LaneName], list[PitchThird]]:
+    """Classify coordinate columns into lanes and thirds in one pass."""
+    horizontal, (w0, ws), (l0, ls) = _frame(pitch_view)
+    if horizontal:
+        # Attacking towards x=100 with y pointing up: the left flank is y=100.
+        widths = [w0 + (100.0 - y) * ws for y in ys]
+        lengths = [l0 + x * ls for x in xs]
+    else:
+        widths = [w0 + x * ws for x in xs]
+        lengths = [l0 + y * ls for y in ys]
+    lanes = [_LANES[bisect_right(_LANE_BOUNDS, w)] for w in widths]
+    thirds = [_THIRDS[bisect_right(_THIRD_BOUNDS, v)] for v in lengths]
+    return lanes, thirds
+
+
+def lane_of(x: float, y: float, pitch_view: Optional[PitchView] = None) -> LaneName:
+    """Lane containing the point ``(x, y)``."""
+    return classify_points([x], [y], pitch_view)[0][0]
+
+
+def third_of(x: float, y: float, pitch_view: Optional[PitchView] = None) -> PitchThird:
+    """Pitch third containing the point ``(x, y)``."""
+    return classify_points([x], [y], pitch_view)[1][0]
+
+
+def _entities(diagram: DiagramInfo) -> tuple[list[tuple[str, int, Optional[str]]], list[float], list[float]]:
+    keys: list[tuple[str, int, Optional[str]]] = []
+    xs: list[float] = []
+    ys: list[float] = []
+    for i, player in enumerate(diagram.player_positions):
+        keys.append(("player", i, player.label))
+        xs.append(player.x)
+        ys.append(player.y)
+    for i, ball in enumerate(diagram.balls):
+        keys.append(("ball", i, ball.label))
+        xs.append(ball.x)
+        ys.append(ball.y)
+    for i, arrow in enumerate(diagram.arrows):
+        keys.append(("arrow_start", i, arrow.from_label))
+        xs.append(arrow.start_x)
+        ys.append(arrow.start_y)
+        keys.append(("arrow_end", i, arrow.to_label))
+        xs.append(arrow.end_x)
+        ys.append(arrow.end_y)
+    return keys, xs, ys
+
+
+def classify_diagram(diagram: DiagramInfo) -> list[EntityZone]:
+    """Assign every player, ball and arrow endpoint of ``diagram`` to a lane and third."""
+    keys, xs, ys = _entities(diagram)
+    lanes, thirds = classify_points(xs, ys, diagram.pitch_view)
+    return [EntityZone(*key, lane, third) for key, lane, third in zip(keys, lanes, thirds)]
+
+
+def classify_corpus(diagrams: Iterable[DiagramInfo]) -> list[list[EntityZone]]:
+    """Classify many diagrams, batching all points that share a pitch frame."""
+    diagrams = list(diagrams)
+    batches: dict[tuple, tuple[Optional[PitchView], list[tuple[int, int]], list[float], list[float]]] = {}
+    per_diagram: list[list[tuple[str, int, Optional[str]]]] = []
+    for d, diagram in enumerate(diagrams):
+        keys, xs, ys = _entities(diagram)
+        per_diagram.append(keys)
+        frame = _frame(diagram.pitch_view)
+        batch = batches.get(frame)
+        if batch is None:
+            batch = batches[frame] = (diagram.pitch_view, [], [], [])
+        batch[1].extend((d, k) for k in range(len(keys)))
+        batch[2].extend(xs)
+        batch[3].extend(ys)
+
+    results: list[list] = [[None] * len(keys) for keys in per_diagram]
+    for pitch_view, slots, xs, ys in batches.values():
+        lanes, thirds = classify_points(xs, ys, pitch_view)
+        for (d, k), lane, third in zip(slots, lanes, thirds):
+            results[d][k] = EntityZone(*per_diagram[d][k], lane, third)
+    return results
+
+
+def suggest_lanes(zones: Iterable[EntityZone], min_count: int = 1) -> list[LaneName]:
+    """Lanes occupied by at least ``min_count`` entities, ordered left to right."""
+    counts = dict.fromkeys(_LANES, 0)
+    for zone in zones:
+        counts[zone.lane] += 1
+    return [lane for lane in _LANES if counts[lane] >= min_count]
+
+
+def suggest_tactical_context(
+    diagram: DiagramInfo,
+    base: Optional[TacticalContext] = None,
+    min_count: int = 1,
+) -> TacticalContext:
+    """Return a :class:`TacticalContext` with ``lanes`` derived from ``diagram``.
+
+    Other fields are copied from ``base`` when given.
+    """
+    lanes = suggest_lanes(classify_diagram(diagram), min_count)
+    if base is None:
+        return TacticalContext(lanes=lanes)
+    return base.model_copy(update={"lanes": lanes})
+
+
+def enrich_plans(
+    plans: Iterable[SessionPlan], overwrite: bool = False, min_count: int = 1
+) -> int:
+    """Fill ``tactical_context.lanes`` of every drill in ``plans`` in place.
+
+    Drills that already list lanes are left alone unless ``overwrite`` is
+    set. Diagrams across all plans are classified as one batch. Returns the
+    number of drills updated.
+    """
+    drills = [
+        drill
+        for plan in plans
+        for drill in plan.drills
+        if overwrite or drill.tactical_context is None or not drill.tactical_context.lanes
+    ]
+    updated = 0
+    for drill, zones in zip(drills, classify_corpus(d.diagram for d in drills)):
+        lanes = suggest_lanes(zones, min_count)
+        if not lanes:
+            continue
+        if drill.tactical_context is None:
+            drill.tactical_context = TacticalContext(lanes=lanes)
+        else:
+            drill.tactical_context.lanes = lanes
+        updated += 1
+    return updated
@@ -0,0 +1,276 @@
+"""Per-drill and per-session training load, rolled up over days, weeks and cycles.
+
+The schema only records ``SessionMetadata.duration_minutes`` for a whole
+session. :func:`drill_load` estimates, for each drill:
+
+- ``minutes``: a default per ``drill_type`` (:data:`DEFAULT_MINUTES`),
+  scaled so the drills fill ``duration_minutes`` when it is set
+- ``players``: from ``DrillSetup.player_count`` (via
+  :func:`osti.parsing.parse_player_count`, coaches excluded), else the
+  diagram's player count
+- ``intensity``: a 1-10 rating per ``drill_type`` (:data:`BASE_INTENSITY`),
+  raised by diagram density (arrows per player) and by tight areas
+  (square meters per player, via :func:`osti.parsing.parse_area`)
+- ``load``: ``minutes * intensity`` (session-RPE style arbitrary units)
+
+:class:`LoadLedger` keeps session loads for many plans and maintains day,
+ISO-week and training-cycle totals incrementally: upserting a plan only
+recomputes that plan (and nothing if its inputs are unchanged) and adjusts
+the buckets it touches.
+"""
+
+from datetime import date, timedelta
+from typing import Hashable, Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .parsing import parse_area, parse_player_count, parse_session_date
+from .session_plan import DrillBlock, SessionPlan
+
+DEFAULT_MINUTES: dict[str, float] = {
+    "warm-up": 10.0,
+    "technical drill": 15.0,
+    "game-related practice": 20.0,
+    "small-sided game": 20.0,
+    "phase of play": 20.0,
+    "cool-down": 10.0,
+}
+"""Assumed drill length by lower-cased ``drill_type``; others use 15 minutes."""
+
+BASE_INTENSITY: dict[str, float] = {
+    "warm-up": 3.0,
+    "technical drill": 4.0,
+    "game-related practice": 6.0,
+    "small-sided game": 8.0,
+    "phase of play": 7.0,
+    "cool-down": 2.0,
+}
+"""Base 1-10 intensity by lower-cased ``drill_type``; others use 5."""
+
+_FALLBACK_MINUTES = 15.0
+_FALLBACK_INTENSITY = 5.0
+_REFERENCE_AREA_PER_PLAYER = 150.0  # square meters; roughly a half-pitch 8v8
+
+
+class DrillLoad(BaseModel):
+    """Estimated load of one drill."""
+
+    drill_id: UUID
+    name: str
+    drill_type: Optional[str] = None
+    minutes: float = Field(..., description="Estimated drill duration")
+    players: Optional[int] = Field(None, description="Players involved, when known")
+    intensity: float = Field(..., description="Estimated intensity (1-10)")
+    load: float = Field(..., description="minutes * intensity")
+    player_minutes: float = Field(0.0, description="minutes * players (0 if unknown)")
+
+
+class SessionLoad(BaseModel):
+    """Estimated load of one session plan."""
+
+    plan_id: UUID
+    day: Optional[date] = Field(None, description="Session day, when known")
+    minutes: float = 0.0
+    load: float = 0.0
+    player_minutes: float = 0.0
+    drills: list[DrillLoad] = Field(default_factory=list)
+
+
+class LoadTotals(NamedTuple):
+    """Summed load of a rollup bucket."""
+
+    sessions: int = 0
+    minutes: float = 0.0
+    load: float = 0.0
+    player_minutes: float = 0.0
+
+    def __add__(self, other: "LoadTotals") -> "LoadTotals":  # type: ignore[override]
+        return LoadTotals(*(a + b for a, b in zip(self, other)))
+
+    def __sub__(self, other: "LoadTotals") -> "LoadTotals":
+        return LoadTotals(*(a - b for a, b in zip(self, other)))
+
+
+def _players(drill: DrillBlock) -> Optional[int]:
+    count = parse_player_count(drill.setup.player_count)
+    if count.maximum:
+        return count.maximum - count.by_role().get("coach", 0) or None
+    return len(drill.diagram.player_positions) or None
+
+
+def _intensity(drill: DrillBlock, players: Optional[int]) -> float:
+    kind = (drill.drill_type or "").strip().lower()
+    intensity = BASE_INTENSITY.get(kind, _FALLBACK_INTENSITY)
+    diagram_players = len(drill.diagram.player_positions)
+    if diagram_players:
+        density = len(drill.diagram.arrows) / diagram_players
+        intensity *= 1.0 + 0.1 * min(density, 3.0)
+    area = parse_area(drill.setup.area_dimensions)
+    if area is not None and players:
+        per_player = area.area_m2 / players
+        if per_player > 0:
+            ratio = (_REFERENCE_AREA_PER_PLAYER / per_player) ** 0.25
+            intensity *= min(max(ratio, 0.8), 1.25)
+    return round(min(intensity, 10.0), 2)
+
+
+def drill_load(drill: DrillBlock, minutes: Optional[float] = None) -> DrillLoad:
+    """Estimate the load of ``drill``; ``minutes`` overrides the type default."""
+    if minutes is None:
+        minutes = DEFAULT_MINUTES.get((drill.drill_type or "").strip().lower(), _FALLBACK_MINUTES)
+    players = _players(drill)
+    intensity = _intensity(drill, players)
+    return DrillLoad(
+        drill_id=drill.id,
+        name=drill.name,
+        drill_type=drill.drill_type,
+        minutes=minutes,
+        players=players,
+        intensity=intensity,
+        load=round(minutes * intensity, 2),
+        player_minutes=minutes * (players or 0),
+    )
+
+
+def session_load(plan: SessionPlan, day: Optional[date] = None) -> SessionLoad:
+    """Estimate per-drill and total load of ``plan``.
+
+    ``day`` defaults to ``SessionMetadata.date`` when that parses to a single
+    day; seasons, months and years are too coarse and leave the session undated.
+    """
+    if day is None:
+        parsed = parse_session_date(plan.metadata.date)
+        day = parsed.start if parsed is not None and parsed.start == parsed.end else None
+    defaults = [
+        DEFAULT_MINUTES.get((d.drill_type or "").strip().lower(), _FALLBACK_MINUTES)
+        for d in plan.drills
+    ]
+    total = plan.metadata.duration_minutes
+    if total and sum(defaults):
+        scale = total / sum(defaults)
+        defaults = [m * scale for m in defaults]
+    drills = [drill_load(d, round(m, 2)) for d, m in zip(plan.drills, defaults)]
+    return SessionLoad(
+        plan_id=plan.id,
+        day=day,
+        minutes=sum(d.minutes for d in drills),
+        load=round(sum(d.load for d in drills), 2),
+        player_minutes=sum(d.player_minutes for d in drills),
+        drills=drills,
+    )
+
+
+def _fingerprint(plan: SessionPlan, day: Optional[date]) -> Hashable:
+    """Everything :func:`session_load` reads, as a hashable value."""
+    return (
+        day,
+        plan.metadata.date,
+        plan.metadata.duration_minutes,
+        tuple(
+            (
+                d.id,
+                d.name,
+                d.drill_type,
+                d.setup.player_count,
+                d.setup.area_dimensions,
+                len(d.diagram.player_positions),
+                len(d.diagram.arrows),
+            )
+            for d in plan.drills
+        ),
+    )
+
+
+class LoadLedger:
+    """Session loads for many plans with incrementally maintained rollups.
+
+    Cycles are ``cycle_days`` long and counted from ``cycle_start``; a cycle
+    is keyed by its first day. Sessions without a day are kept but appear in
+    no rollup.
+    """
+
+    def __init__(self, cycle_days: int = 28, cycle_start: date = date(2000, 1, 3)) -> None:
+        if cycle_days < 1:
+            raise ValueError("cycle_days must be at least 1")
+        self.cycle_days = cycle_days
+        self.cycle_start = cycle_start
+        self.recomputed = 0
+        self._sessions: dict[UUID, SessionLoad] = {}
+        self._fingerprints: dict[UUID, Hashable] = {}
+        self._days: dict[date, LoadTotals] = {}
+        self._weeks: dict[tuple[int, int], LoadTotals] = {}
+        self._cycles: dict[date, LoadTotals] = {}
+
+    def _cycle(self, day: date) -> date:
+        offset = (day - self.cycle_start).days // self.cycle_days
+        return self.cycle_start + timedelta(days=offset * self.cycle_days)
+
+    def _apply(self, session: SessionLoad, sign: int) -> None:
+        if session.day is None:
+            return
+        totals = LoadTotals(1, session.minutes, session.load, session.player_minutes)
+        iso = session.day.isocalendar()
+        for buckets, key in (
+            (self._days, session.day),
+            (self._weeks, (iso[0], iso[1])),
+            (self._cycles, self._cycle(session.day)),
+        ):
+            current = buckets.get(key, LoadTotals())
+            updated = current + totals if sign > 0 else current - totals
+            if updated.sessions:
+                buckets[key] = updated
+            else:
+                buckets.pop(key, None)
+
+    def upsert(self, plan: SessionPlan, day: Optional[date] = None) -> SessionLoad:
+        """Add or update ``plan``; unchanged plans are not recomputed."""
+        fingerprint = _fingerprint(plan, day)
+        if self._fingerprints.get(plan.id) == fingerprint:
+            return self._sessions[plan.id]
+        self.remove(plan.id)
+        session = session_load(plan, day)
+        self.recomputed += 1
+        self._sessions[plan.id] = session
+        self._fingerprints[plan.id] = fingerprint
+        self._apply(session, +1)
+        return session
+
+    def upsert_many(self, plans: Iterable[SessionPlan]) -> None:
+        """Upsert each plan, dated from its metadata."""
+        for plan in plans:
+            self.upsert(plan)
+
+    def remove(self, plan_id: UUID) -> bool:
+        """Remove a plan; returns whether it was present."""
+        session = self._sessions.pop(plan_id, None)
+        if session is None:
+            return False
+        del self._fingerprints[plan_id]
+        self._apply(session, -1)
+        return True
+
+    def session(self, plan_id: UUID) -> Optional[SessionLoad]:
+        return self._sessions.get(plan_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, plan_id: object) -> bool:
+        return plan_id in self._sessions
+
+    def daily(self, start: Optional[date] = None, end: Optional[date] = None) -> dict[date, LoadTotals]:
+        """Totals per day, optionally limited to ``start``..``end`` inclusive."""
+        return {
+            day: totals
+            for day, totals in sorted(self._days.items())
+            if (start is None or day >= start) and (end is None or day <= end)
+        }
+
+    def weekly(self) -> dict[tuple[int, int], LoadTotals]:
+        """Totals per ISO ``(year, week)``."""
+        return dict(sorted(self._weeks.items()))
+
+    def cycles(self) -> dict[date, LoadTotals]:
+        """Totals per training cycle, keyed by the cycle's first day."""
+        return dict(sorted(self._cycles.items()))
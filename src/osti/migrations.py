@@ -0,0 +1,242 @@
+"""Schema version migrations for stored OSTI session plans.
+
+Migrations are registered per version step and operate on raw JSON data
+(``dict`` objects as produced by ``json.loads``), so archived plans can be
+upgraded without first validating them against an older model. Steps are
+chained automatically from the detected version to the target version; each
+chain is composed once and cached, so bulk upgrades pay only for the
+transforms themselves.
+
+Example::
+
+    from osti.migrations import migration
+
+    @migration("0.1.2", "0.2.0")
+    def _rename_area(data: dict) -> dict:
+        for drill in data.get("drills", []):
+            setup = drill.get("setup") or {}
+            if "area" in setup:
+                setup["area_dimensions"] = setup.pop("area")
+        return data
+"""
+
+import json
+import multiprocessing
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from .session_plan import SCHEMA_VERSION
+
+VERSION_KEY = "schema_version"
+"""Optional top-level key recording the schema version of a stored plan."""
+
+MigrationFunc = Callable[[dict], dict]
+
+_MIGRATIONS: dict[str, tuple[str, MigrationFunc]] = {}
+
+
+class MigrationError(ValueError):
+    """Raised when no migration path exists between two schema versions."""
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        raise MigrationError(f"Invalid schema version: {version!r}") from None
+
+
+def register_migration(from_version: str, to_version: str, func: MigrationFunc) -> None:
+    """Register ``func`` as the transform from ``from_version`` to ``to_version``.
+
+    Each version has at most one outgoing step; registering a second step for
+    the same ``from_version`` replaces the first.
+    """
+    if _version_key(to_version) <= _version_key(from_version):
+        raise MigrationError(
+            f"Migration must move forward: {from_version} -> {to_version}"
+        )
+    _MIGRATIONS[from_version] = (to_version, func)
+    _compose.cache_clear()
+
+
+def migration(from_version: str, to_version: str) -> Callable[[MigrationFunc], MigrationFunc]:
+    """Decorator form of :func:`register_migration`."""
+
+    def decorator(func: MigrationFunc) -> MigrationFunc:
+        register_migration(from_version, to_version, func)
+        return func
+
+    return decorator
+
+
+def registered_migrations() -> dict[str, str]:
+    """Return the registered steps as a ``{from_version: to_version}`` mapping."""
+    return {src: dst for src, (dst, _) in _MIGRATIONS.items()}
+
+
+def migration_path(from_version: str, to_version: str = SCHEMA_VERSION) -> list[str]:
+    """Return the versions visited when upgrading, including both endpoints."""
+    path = [from_version]
+    current = from_version
+    target = _version_key(to_version)
+    while current != to_version:
+        step = _MIGRATIONS.get(current)
+        if step is None or _version_key(step[0]) > target:
+            raise MigrationError(
+                f"No migration path from {from_version} to {to_version} "
+                f"(stuck at {current})"
+            )
+        current = step[0]
+        path.append(current)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _compose(from_version: str, to_version: str) -> Callable[[dict], dict]:
+    path = migration_path(from_version, to_version)
+    steps = tuple(_MIGRATIONS[v][1] for v in path[:-1])
+
+    def run(data: dict) -> dict:
+        for step in steps:
+            data = step(data)
+        return data
+
+    return run
+
+
+def detect_version(data: dict, default: str = SCHEMA_VERSION) -> str:
+    """Return the schema version recorded in ``data``, or ``default``.
+
+    OSTI documents carry no mandatory version marker, so archives written
+    before stamping was introduced should pass the version they were
+    produced with as ``default``.
+    """
+    version = data.get(VERSION_KEY)
+    return version if isinstance(version, str) else default
+
+
+def migrate(
+    data: Union[dict, str, bytes],
+    to_version: str = SCHEMA_VERSION,
+    *,
+    from_version: Optional[str] = None,
+    default: str = SCHEMA_VERSION,
+) -> dict:
+    """Upgrade a raw plan to ``to_version`` and return it as a ``dict``.
+
+    ``data`` may be a ``dict`` (modified in place by the registered
+    transforms) or a JSON string/bytes. The source version is ``from_version``
+    when given, otherwise it is detected with :func:`detect_version`. If the
+    input carried a ``schema_version`` key it is updated to ``to_version``.
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    source = from_version or detect_version(data, default)
+    if source == to_version:
+        return data
+    stamped = VERSION_KEY in data
+    data = _compose(source, to_version)(data)
+    if stamped:
+        data[VERSION_KEY] = to_version
+    return data
+
+
+def migrate_json(
+    text: Union[str, bytes],
+    to_version: str = SCHEMA_VERSION,
+    *,
+    from_version: Optional[str] = None,
+    default: str = SCHEMA_VERSION,
+) -> str:
+    """Like :func:`migrate` but returns compact JSON text."""
+    data = migrate(text, to_version, from_version=from_version, default=default)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _upgrade_line(args: tuple[str, str, Optional[str], str]) -> str:
+    line, to_version, from_version, default = args
+    if not line.strip():
+        return ""
+    return migrate_json(line, to_version, from_version=from_version, default=default)
+
+
+def iter_upgraded(
+    lines: Iterable[str],
+    to_version: str = SCHEMA_VERSION,
+    *,
+    from_version: Optional[str] = None,
+    default: str = SCHEMA_VERSION,
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+) -> Iterator[str]:
+    """Upgrade JSONL lines, yielding compact JSON in input order.
+
+    Blank lines are dropped. With ``workers`` of 0 or 1 everything runs in
+    the calling process; otherwise a process pool of ``workers`` (default:
+    CPU count) streams the input in chunks of ``chunksize`` lines. Worker
+    processes must see the same registered migrations, so register them at
+    import time of a module the workers also import.
+    """
+    jobs = ((line, to_version, from_version, default) for line in lines)
+    if workers is not None and workers <= 1:
+        for out in map(_upgrade_line, jobs):
+            if out:
+                yield out
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for out in pool.imap(_upgrade_line, jobs, chunksize=chunksize):
+            if out:
+                yield out
+
+
+def upgrade_jsonl(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    to_version: str = SCHEMA_VERSION,
+    *,
+    from_version: Optional[str] = None,
+    default: str = SCHEMA_VERSION,
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+) -> int:
+    """Stream-upgrade a JSONL archive from ``src`` into ``dst``.
+
+    Both files are processed line by line in a single pass, so memory use is
+    bounded by the pool's in-flight chunks. Returns the number of plans
+    written.
+    """
+    count = 0
+    with open(src, encoding="utf-8") as fin, open(dst, "w", encoding="utf-8") as fout:
+        for out in iter_upgraded(
+            fin,
+            to_version,
+            from_version=from_version,
+            default=default,
+            workers=workers,
+            chunksize=chunksize,
+        ):
+            fout.write(out)
+            fout.write("\n")
+            count += 1
+    return count
+
+
+# --- Built-in migrations ---
+#
+# 0.1.x releases only added optional fields (see CHANGELOG), so these steps
+# are identity transforms. They exist so that chains from older archives
+# resolve to the current version.
+
+
+@migration("0.1.0", "0.1.1")
+def _migrate_0_1_0(data: dict) -> dict:
+    return data
+
+
+@migration("0.1.1", "0.1.2")
+def _migrate_0_1_1(data: dict) -> dict:
+    return data
+
+
@@ -0,0 +1,312 @@
+"""Parsers for the free-text fields most often used as filters.
+
+``DrillSetup.player_count``, ``DrillSetup.area_dimensions`` and
+``SessionMetadata.date`` are free text in the schema. The parsers here turn
+them into normalized values: player counts by role, areas in meters, and
+date ranges. Patterns are compiled once at import, results are immutable
+tuples memoized in an LRU cache (corpora repeat the same strings heavily),
+and :func:`parse_batch` parses each distinct value of a column only once.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Iterable, NamedTuple, Optional, TypeVar
+
+_CACHE_SIZE = 8192
+
+T = TypeVar("T")
+
+
+# --- Player counts ---
+
+
+class PlayerCount(NamedTuple):
+    """Normalized player count; ``roles`` is a tuple of ``(role, count)`` pairs.
+
+    ``minimum`` and ``maximum`` differ only for ranges such as "12-16 players".
+    Both are ``None`` when no number could be found.
+    """
+
+    minimum: Optional[int]
+    maximum: Optional[int]
+    roles: tuple[tuple[str, int], ...]
+
+    def by_role(self) -> dict[str, int]:
+        """Counts keyed by normalized role."""
+        counts: dict[str, int] = {}
+        for role, n in self.roles:
+            counts[role] = counts.get(role, 0) + n
+        return counts
+
+
+_ROLE_ALIASES = {
+    "gk": "goalkeeper",
+    "gks": "goalkeeper",
+    "goalkeeper": "goalkeeper",
+    "goalkeepers": "goalkeeper",
+    "keeper": "goalkeeper",
+    "keepers": "goalkeeper",
+    "goalie": "goalkeeper",
+    "goalies": "goalkeeper",
+    "field": "field",
+    "outfield": "field",
+    "player": "field",
+    "players": "field",
+    "attacker": "attacker",
+    "attackers": "attacker",
+    "defender": "defender",
+    "defenders": "defender",
+    "midfielder": "midfielder",
+    "midfielders": "midfielder",
+    "neutral": "neutral",
+    "neutrals": "neutral",
+    "joker": "neutral",
+    "jokers": "neutral",
+    "floater": "neutral",
+    "floaters": "neutral",
+    "server": "server",
+    "servers": "server",
+    "coach": "coach",
+    "coaches": "coach",
+}
+
+_PARENS = re.compile(r"\([^)]*\)")
+_VERSUS = re.compile(r"(\d+)\s*(?:v|vs\.?|versus|against)\s*(\d+)", re.IGNORECASE)
+_RANGE = re.compile(r"(\d+)\s*(?:-|–|to)\s*(\d+)")
+_TEAMS = re.compile(r"(\d+)\s*(?:teams?|groups?|sides?)\s*of\s*(\d+)", re.IGNORECASE)
+_TERM = re.compile(r"(\d+)\s*([A-Za-z][A-Za-z ]*)?")
+_SPLIT = re.compile(r"\s*(?:\+|,|&|\band\b|\bplus\b)\s*", re.IGNORECASE)
+
+
+def _role(words: Optional[str]) -> Optional[str]:
+    """Role named by ``words``; ``None`` when no known role word appears."""
+    if not words or not words.strip():
+        return "field"
+    tokens = words.lower().split()
+    for token in tokens:
+        if token in _ROLE_ALIASES and _ROLE_ALIASES[token] != "field":
+            return _ROLE_ALIASES[token]
+    for token in tokens:
+        if token in _ROLE_ALIASES:
+            return _ROLE_ALIASES[token]
+    return None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_player_count(text: Optional[str]) -> PlayerCount:
+    """Parse text such as "1 GK + 6 field players", "4v4+3" or "12-16 players".
+
+    Sides of an "NvM" contest are reported as ``team_a`` / ``team_b``; bare
+    numbers added to a contest ("4v4+3") are ``neutral`` players. A known
+    role without a number ("3v2 + GK") counts as one. A term that is neither
+    a plain number nor a known role ("5 x 5", "session 3", "+ players")
+    leaves the whole count unparsed rather than guessing.
+    """
+    if not text:
+        return PlayerCount(None, None, ())
+    clean = _PARENS.sub(" ", text)
+    roles: list[tuple[str, int]] = []
+    spread = 0
+    for part in _SPLIT.split(clean):
+        if not part.strip():
+            continue
+        versus = _VERSUS.search(part)
+        if versus:
+            roles.append(("team_a", int(versus.group(1))))
+            roles.append(("team_b", int(versus.group(2))))
+            continue
+        teams = _TEAMS.search(part)
+        if teams:
+            roles.append(("field", int(teams.group(1)) * int(teams.group(2))))
+            continue
+        span = _RANGE.search(part)
+        if span:
+            low, high = sorted((int(span.group(1)), int(span.group(2))))
+            role = _role(part[span.end():])
+            if role is None:
+                return PlayerCount(None, None, ())
+            roles.append((role, low))
+            spread += high - low
+            continue
+        term = _TERM.search(part)
+        if term:
+            words = term.group(2)
+            contest = any(r in ("team_a", "team_b") for r, _ in roles)
+            role = "neutral" if contest and not words else _role(words)
+            if role is None:
+                return PlayerCount(None, None, ())
+            roles.append((role, int(term.group(1))))
+            continue
+        role = _role(part)
+        if role is None or role == "field":
+            return PlayerCount(None, None, ())
+        roles.append((role, 1))
+    if not roles:
+        return PlayerCount(None, None, ())
+    total = sum(n for _, n in roles)
+    return PlayerCount(total, total + spread, tuple(roles))
+
+
+# --- Area dimensions ---
+
+
+class AreaDimensions(NamedTuple):
+    """Playing area in meters; ``length_m`` is the longer side.
+
+    ``unit`` is the unit found in the text (``"m"``, ``"yd"``, ``"ft"``),
+    or ``None`` when the text gave none and meters were assumed.
+    """
+
+    length_m: float
+    width_m: float
+    unit: Optional[str]
+
+    @property
+    def area_m2(self) -> float:
+        return self.length_m * self.width_m
+
+
+_TO_METERS = {"m": 1.0, "yd": 0.9144, "ft": 0.3048}
+_UNITS = (
+    ("yd", re.compile(r"\b(?:yards?|yds?)\b|\d\s*yds?\b", re.IGNORECASE)),
+    ("ft", re.compile(r"\b(?:feet|foot|ft)\b|\d\s*ft\b", re.IGNORECASE)),
+    ("m", re.compile(r"\b(?:meters?|metres?|m)\b|\d\s*m\b", re.IGNORECASE)),
+)
+_DIMENSIONS = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*[a-z']*\s*(?:x|×|\*|by)\s*(\d+(?:[.,]\d+)?)", re.IGNORECASE
+)
+_NAMED_AREAS = (
+    (re.compile(r"\bfull[- ]?(?:size )?pitch\b", re.IGNORECASE), (105.0, 68.0)),
+    (re.compile(r"\bhalf[- ]?(?:a )?pitch\b", re.IGNORECASE), (68.0, 52.5)),
+    (re.compile(r"\bpenalty (?:area|box)\b|\bpk area\b", re.IGNORECASE), (40.3, 16.5)),
+)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_area(text: Optional[str]) -> Optional[AreaDimensions]:
+    """Parse text such as "20x15 yards", "30 m by 20 m" or "half pitch"."""
+    if not text:
+        return None
+    match = _DIMENSIONS.search(text)
+    if match is None:
+        for pattern, (length, width) in _NAMED_AREAS:
+            if pattern.search(text):
+                return AreaDimensions(length, width, "m")
+        return None
+    unit = next((name for name, pattern in _UNITS if pattern.search(text)), None)
+    scale = _TO_METERS[unit or "m"]
+    a, b = (float(g.replace(",", ".")) * scale for g in match.groups())
+    return AreaDimensions(round(max(a, b), 2), round(min(a, b), 2), unit)
+
+
+# --- Session dates ---
+
+
+class DateRange(NamedTuple):
+    """Inclusive date range covered by a session date, year or season."""
+
+    start: date
+    end: date
+
+    def __contains__(self, day: object) -> bool:
+        return isinstance(day, date) and self.start <= day <= self.end
+
+
+_SEASONS = {
+    "spring": (3, 5),
+    "summer": (6, 8),
+    "autumn": (9, 11),
+    "fall": (9, 11),
+    "winter": (12, 2),
+}
+_MONTHS = {
+    name: i
+    for i, names in enumerate(
+        (
+            ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+            ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+            ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+            ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_DMY_DATE = re.compile(r"\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b")
+_SEASON_SPAN = re.compile(r"\b(\d{4})\s*[/-]\s*(\d{2}|\d{4})\b")
+_NAMED_PERIOD = re.compile(r"\b([a-z]+)\.?\s+(\d{4})\b", re.IGNORECASE)
+_YEAR = re.compile(r"\b(\d{4})\b")
+
+
+def _month_end(year: int, month: int) -> date:
+    if month == 12:
+        return date(year, 12, 31)
+    return date.fromordinal(date(year, month + 1, 1).toordinal() - 1)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_session_date(text: Optional[str]) -> Optional[DateRange]:
+    """Parse text such as "2024-03-15", "March 2024", "Spring 2024", "2023/24" or "2023".
+
+    Day-first dates ("15.03.2024") are supported; split seasons ("2023/24")
+    run from 1 July to 30 June.
+    """
+    if not text:
+        return None
+    try:
+        match = _ISO_DATE.search(text)
+        if match:
+            day = date(*map(int, match.groups()))
+            return DateRange(day, day)
+        match = _DMY_DATE.search(text)
+        if match:
+            d, m, y = map(int, match.groups())
+            day = date(y, m, d)
+            return DateRange(day, day)
+    except ValueError:
+        return None
+    match = _SEASON_SPAN.search(text)
+    if match:
+        first = int(match.group(1))
+        second = match.group(2)
+        consecutive = (
+            int(second) == first + 1 if len(second) == 4 else int(second) == (first + 1) % 100
+        )
+        if consecutive:
+            return DateRange(date(first, 7, 1), date(first + 1, 6, 30))
+    match = _NAMED_PERIOD.search(text)
+    if match:
+        name, year = match.group(1).lower(), int(match.group(2))
+        if name in _SEASONS:
+            start, end = _SEASONS[name]
+            end_year = year + 1 if end < start else year
+            return DateRange(date(year, start, 1), _month_end(end_year, end))
+        if name in _MONTHS:
+            month = _MONTHS[name]
+            return DateRange(date(year, month, 1), _month_end(year, month))
+    match = _YEAR.search(text)
+    if match:
+        year = int(match.group(1))
+        return DateRange(date(year, 1, 1), date(year, 12, 31))
+    return None
+
+
+def parse_batch(parser: Callable[[Optional[str]], T], values: Iterable[Optional[str]]) -> list[T]:
+    """Apply ``parser`` to a column of values, parsing each distinct value once."""
+    seen: dict[Optional[str], T] = {}
+    out: list[T] = []
+    for value in values:
+        if value in seen:
+            out.append(seen[value])
+        else:
+            out.append(seen.setdefault(value, parser(value)))
+    return out
+
+
+def clear_caches() -> None:
+    """Reset the memo caches of all parsers."""
+    parse_player_count.cache_clear()
+    parse_area.cache_clear()
+    parse_session_date.cache_clear()
@@ -0,0 +1,119 @@
+"""Projection-based partial loading of session plans.
+
+Many jobs read a handful of fields from each plan. :func:`load_projection`
+takes field paths (same syntax as :mod:`osti.query`) and validates the JSON
+against a generated partial model that declares only those fields, so the
+rest of the document (diagrams, free-text lists) is never turned into
+Python objects. Partial models are generated once per distinct set of paths
+and cached.
+
+Example::
+
+    from osti.projection import load_projection
+
+    partial = load_projection(text, ["metadata.title", "drills[*].tactical_context"])
+    partial.metadata.title
+    [d.tactical_context for d in partial.drills]
+"""
+
+from functools import lru_cache
+from types import UnionType
+from typing import Any, Iterable, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, Field, create_model
+
+from .query import parse_path, resolve_path
+from .session_plan import SessionPlan
+
+_Tree = dict[str, Optional["_Tree"]]
+
+
+def _tree(paths: Iterable[tuple[str, ...]]) -> _Tree:
+    """Merge paths into a nested dict; ``None`` marks a whole subtree."""
+    root: _Tree = {}
+    stripped = {tuple(s for s in segments if s != "*") for segments in paths}
+    for segments in sorted(stripped, key=len):
+        node = root
+        for depth, segment in enumerate(segments):
+            if segment in node and node[segment] is None:
+                break
+            if depth == len(segments) - 1:
+                node[segment] = None
+            else:
+                node = node.setdefault(segment, {})
+    return root
+
+
+def _replace_model(annotation: Any, old: type[BaseModel], new: type[BaseModel]) -> Any:
+    """Rebuild ``annotation`` (``X``, ``Optional[X]``, ``list[X]``) with ``new`` in place of ``old``."""
+    if annotation is old:
+        return new
+    origin = get_origin(annotation)
+    if origin is list:
+        return list[_replace_model(get_args(annotation)[0], old, new)]
+    if origin in (Union, UnionType):
+        inner = next(a for a in get_args(annotation) if a is not type(None))
+        return Optional[_replace_model(inner, old, new)]
+    return annotation
+
+
+def _inner_model(annotation: Any) -> type[BaseModel]:
+    while get_origin(annotation) in (list, Union, UnionType):
+        annotation = next(a for a in get_args(annotation) if a is not type(None))
+    return annotation
+
+
+def _build(model: type[BaseModel], tree: _Tree) -> type[BaseModel]:
+    fields: dict[str, Any] = {}
+    for name, subtree in tree.items():
+        info = model.model_fields[name]
+        if subtree is None:
+            fields[name] = (info.annotation, info)
+            continue
+        nested = _inner_model(info.annotation)
+        projected = _build(nested, subtree)
+        annotation = _replace_model(info.annotation, nested, projected)
+        if info.is_required():
+            default = Field(..., description=info.description)
+        elif info.default_factory is nested:
+            default = Field(default_factory=projected, description=info.description)
+        elif info.default_factory is not None:
+            default = Field(default_factory=info.default_factory, description=info.description)
+        else:
+            default = Field(info.default, description=info.description)
+        fields[name] = (annotation, default)
+    return create_model(
+        f"{model.__name__}Projection",
+        __doc__=f"Partial {model.__name__} holding only projected fields.",
+        **fields,
+    )
+
+
+@lru_cache(maxsize=128)
+def _cached_model(root: type[BaseModel], paths: frozenset[tuple[str, ...]]) -> type[BaseModel]:
+    return _build(root, _tree(paths))
+
+
+def projection_model(paths: Iterable[str], root: type[BaseModel] = SessionPlan) -> type[BaseModel]:
+    """Return the (cached) partial model for ``paths`` within ``root``.
+
+    Raises ``ValueError`` for paths that do not exist in ``root``.
+    """
+    parsed = set()
+    for path in paths:
+        segments = parse_path(path)
+        resolve_path(root, segments)
+        parsed.add(segments)
+    if not parsed:
+        raise ValueError("A projection needs at least one path")
+    return _cached_model(root, frozenset(parsed))
+
+
+def load_projection(
+    data: Union[str, bytes, dict], paths: Iterable[str], root: type[BaseModel] = SessionPlan
+) -> BaseModel:
+    """Validate only the projected ``paths`` of a plan (JSON text or dict)."""
+    model = projection_model(paths, root)
+    if isinstance(data, (str, bytes)):
+        return model.model_validate_json(data)
+    return model.model_validate(data)
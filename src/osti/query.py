@@ -0,0 +1,512 @@
+"""Declarative queries over plan corpora with predicate pushdown.
+
+Predicates are built from :func:`field` references and evaluated directly
+on raw JSON data. Only the values a predicate touches are validated (with
+the field's own type, via a cached ``TypeAdapter``), and full models are
+materialized only for matches. For JSON text, literal equality operands are
+first looked for in the raw text, so documents that cannot match are
+skipped without being parsed. The prefilter only uses literals made of
+letters, digits, spaces and punctuation that common JSON encoders never
+escape (no quotes, backslashes, ``/``, ``<>&``, or non-ASCII); other
+literals are checked after parsing only. Hand-written escapes of such plain
+characters (``"\\u0041"`` for ``"A"``) are not supported by the prefilter.
+
+Paths use dotted field names with ``[*]`` for every element of a list::
+
+    from osti.query import Query, field
+    from osti.tactical import GameElement
+
+    q = Query(
+        (field("tactical_context.game_element") == GameElement.PRESSING)
+        & (field("diagram.player_positions").length() > 6)
+        & (field("diagram.zones[*].zone_type") == "channel"),
+        scope="drills",
+    )
+    for match in q.run_files(paths, workers=8):
+        print(match.source, match.value.name)
+
+With ``scope="drills"`` each drill is a candidate and paths are relative to
+:class:`DrillBlock`; without a scope, whole plans are matched. A path with
+``[*]`` matches when any element satisfies the comparison. Fields omitted
+from the JSON take their model defaults, so a query gives the same result
+as validating and then filtering.
+"""
+
+import operator
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from types import UnionType
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+from .session_plan import SessionPlan
+
+# Characters no common JSON encoder escapes, so the raw text spells them verbatim.
+_UNESCAPED = re.compile(r"[A-Za-z0-9 _.,:;()\[\]{}!?#%*+=@|~^$-]*")
+_SEGMENT = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(\[\*\])?$")
+_MISSING = object()
+
+
+def parse_path(path: str) -> tuple[str, ...]:
+    """Split ``"drills[*].diagram.arrows"`` into ``("drills", "*", "diagram", "arrows")``."""
+    segments: list[str] = []
+    for part in path.split("."):
+        match = _SEGMENT.match(part)
+        if match is None:
+            raise ValueError(f"Invalid path segment {part!r} in {path!r}")
+        segments.append(match.group(1))
+        if match.group(2):
+            segments.append("*")
+    return tuple(segments)
+
+
+def _unwrap(annotation: Any) -> tuple[Any, bool]:
+    """Strip ``Optional`` and report whether the remaining type is a list."""
+    while get_origin(annotation) in (Union, UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) != 1:
+            break
+        annotation = args[0]
+    if get_origin(annotation) is list:
+        return get_args(annotation)[0], True
+    return annotation, False
+
+
+@lru_cache(maxsize=None)
+def resolve_path(model: type[BaseModel], segments: tuple[str, ...]) -> Any:
+    """Return the annotation a path points to within ``model``.
+
+    Raises ``ValueError`` for unknown fields or for ``[*]`` on a non-list.
+    """
+    current: Any = model
+    leaf: Any = model
+    pending_list = False
+    for segment in segments:
+        if segment == "*":
+            if not pending_list:
+                raise ValueError(f"'[*]' applied to a non-list in {'.'.join(segments)!r}")
+            pending_list = False
+            leaf = current
+            continue
+        if pending_list:
+            raise ValueError(f"List field needs '[*]' before {segment!r}")
+        if not (isinstance(current, type) and issubclass(current, BaseModel)):
+            raise ValueError(f"Cannot select {segment!r} from {current!r}")
+        info = current.model_fields.get(segment)
+        if info is None:
+            raise ValueError(f"{current.__name__} has no field {segment!r}")
+        current, pending_list = _unwrap(info.annotation)
+        leaf = info.annotation
+    return leaf
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+@lru_cache(maxsize=None)
+def _owners(model: type[BaseModel], segments: tuple[str, ...]) -> tuple[Optional[type[BaseModel]], ...]:
+    """The model class each segment of a path selects a field from (``None`` for ``[*]``)."""
+    owners: list[Optional[type[BaseModel]]] = []
+    current: Any = model
+    for segment in segments:
+        if segment == "*":
+            owners.append(None)
+            continue
+        if not (isinstance(current, type) and issubclass(current, BaseModel)):
+            owners.append(None)
+            current = None
+            continue
+        owners.append(current)
+        info = current.model_fields.get(segment)
+        current = _unwrap(info.annotation)[0] if info is not None else None
+    return tuple(owners)
+
+
+@lru_cache(maxsize=None)
+def _default(model: type[BaseModel], name: str) -> Any:
+    """Raw (dumped) default of ``model.name``, or ``_MISSING`` for required fields."""
+    info = model.model_fields.get(name)
+    if info is None or info.is_required():
+        return _MISSING
+    default = info.get_default(call_default_factory=True, validated_data={})
+    return _adapter(info.annotation).dump_python(default)
+
+
+def extract(
+    data: Any, segments: tuple[str, ...], model: Optional[type[BaseModel]] = None
+) -> list[Any]:
+    """Raw values at ``segments`` within ``data``; ``[*]`` fans out over lists.
+
+    With ``model`` (the type of ``data``), omitted fields take their defaults.
+    """
+    owners = _owners(model, segments) if model is not None else (None,) * len(segments)
+    values = [data]
+    for segment, owner in zip(segments, owners):
+        if segment == "*":
+            values = [item for v in values if isinstance(v, list) for item in v]
+        else:
+            fallback = _default(owner, segment) if owner is not None else _MISSING
+            values = [
+                v.get(segment, fallback) for v in values if isinstance(v, dict)
+            ]
+            values = [v for v in values if v is not _MISSING]
+    return values
+
+
+def _defaults(model: type[BaseModel], segments: tuple[str, ...]) -> list[Any]:
+    """Values a path can take from defaults alone, when some field on it is omitted."""
+    values = []
+    for i, (segment, owner) in enumerate(zip(segments, _owners(model, segments))):
+        if owner is None:
+            continue
+        default = _default(owner, segment)
+        if default is _MISSING:
+            continue
+        nested = _unwrap(owner.model_fields[segment].annotation)[0]
+        if not (isinstance(nested, type) and issubclass(nested, BaseModel)):
+            nested = None
+        values.extend(extract(default, segments[i + 1 :], nested))
+    return values
+
+
+class Predicate(ABC):
+    """Base class of composable predicates over raw JSON data."""
+
+    @abstractmethod
+    def evaluate(self, data: Any) -> bool:
+        """Whether the raw ``data`` satisfies the predicate."""
+
+    def bind(self, model: type[BaseModel]) -> "Predicate":
+        """Resolve paths against ``model``; raises ``ValueError`` for bad paths."""
+        return self
+
+    def needles(self) -> set[str]:
+        """JSON fragments that must occur in a document's text for it to match."""
+        return set()
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+
+class And(Predicate):
+    """True when every part is true."""
+
+    def __init__(self, *parts: Predicate):
+        self.parts = parts
+
+    def evaluate(self, data: Any) -> bool:
+        return all(p.evaluate(data) for p in self.parts)
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        return And(*(p.bind(model) for p in self.parts))
+
+    def needles(self) -> set[str]:
+        return set().union(*(p.needles() for p in self.parts))
+
+
+class Or(Predicate):
+    """True when any part is true."""
+
+    def __init__(self, *parts: Predicate):
+        self.parts = parts
+
+    def evaluate(self, data: Any) -> bool:
+        return any(p.evaluate(data) for p in self.parts)
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        return Or(*(p.bind(model) for p in self.parts))
+
+
+class Not(Predicate):
+    """Negates a predicate."""
+
+    def __init__(self, part: Predicate):
+        self.part = part
+
+    def evaluate(self, data: Any) -> bool:
+        return not self.part.evaluate(data)
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        return Not(self.part.bind(model))
+
+
+class Compare(Predicate):
+    """Compares the validated value(s) at a path with an operand."""
+
+    def __init__(
+        self,
+        path: str,
+        op: Callable[[Any, Any], bool],
+        operand: Any,
+        adapter: Optional[TypeAdapter] = None,
+        model: Optional[type[BaseModel]] = None,
+    ):
+        self.path = path
+        self.segments = parse_path(path)
+        self.op = op
+        self.operand = operand
+        self.adapter = adapter
+        self.model = model
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        adapter = _adapter(resolve_path(model, self.segments))
+        operand = self.operand
+        if self.op is _is_in:
+            operand = frozenset(adapter.validate_python(o) for o in operand)
+        elif self.op is not _contains and operand is not None:
+            operand = adapter.validate_python(operand)
+        return Compare(self.path, self.op, operand, adapter, model)
+
+    def evaluate(self, data: Any) -> bool:
+        return self._test(extract(data, self.segments, self.model))
+
+    def _test(self, values: list[Any]) -> bool:
+        for raw in values:
+            try:
+                value = self.adapter.validate_python(raw) if self.adapter else raw
+            except ValidationError:
+                continue
+            try:
+                if self.op(value, self.operand):
+                    return True
+            except TypeError:
+                continue
+        return False
+
+    def needles(self) -> set[str]:
+        if self.op is not operator.eq or isinstance(self.operand, (bool, type(None))):
+            return set()
+        # A document omitting the field can match through its default.
+        if self.model is not None and self._test(_defaults(self.model, self.segments)):
+            return set()
+        raw = self.operand.value if isinstance(self.operand, Enum) else self.operand
+        if isinstance(raw, str) and _UNESCAPED.fullmatch(raw):
+            return {f'"{raw}"'}
+        return set()
+
+
+class Length(Predicate):
+    """Compares the number of elements of the list(s) at a path."""
+
+    def __init__(
+        self,
+        path: str,
+        op: Callable[[Any, Any], bool],
+        operand: int,
+        model: Optional[type[BaseModel]] = None,
+    ):
+        self.path = path
+        self.segments = parse_path(path)
+        self.op = op
+        self.operand = operand
+        self.model = model
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        if get_origin(resolve_path(model, self.segments)) is not list:
+            raise ValueError(f"length() needs a list field, got {self.path!r}")
+        return Length(self.path, self.op, self.operand, model)
+
+    def evaluate(self, data: Any) -> bool:
+        return any(
+            isinstance(v, list) and self.op(len(v), self.operand)
+            for v in extract(data, self.segments, self.model)
+        )
+
+
+class Exists(Predicate):
+    """True when the path holds at least one non-null value."""
+
+    def __init__(self, path: str, model: Optional[type[BaseModel]] = None):
+        self.path = path
+        self.segments = parse_path(path)
+        self.model = model
+
+    def bind(self, model: type[BaseModel]) -> Predicate:
+        resolve_path(model, self.segments)
+        return Exists(self.path, model)
+
+    def evaluate(self, data: Any) -> bool:
+        return any(v is not None for v in extract(data, self.segments, self.model))
+
+
+class _LengthRef:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __eq__(self, n: int) -> Predicate:  # type: ignore[override]
+        return Length(self.path, operator.eq, n)
+
+    def __ne__(self, n: int) -> Predicate:  # type: ignore[override]
+        return Length(self.path, operator.ne, n)
+
+    def __gt__(self, n: int) -> Predicate:
+        return Length(self.path, operator.gt, n)
+
+    def __ge__(self, n: int) -> Predicate:
+        return Length(self.path, operator.ge, n)
+
+    def __lt__(self, n: int) -> Predicate:
+        return Length(self.path, operator.lt, n)
+
+    def __le__(self, n: int) -> Predicate:
+        return Length(self.path, operator.le, n)
+
+
+def _contains(value: Any, needle: Any) -> bool:
+    return value is not None and needle in value
+
+
+def _is_in(value: Any, options: Any) -> bool:
+    return value in options
+
+
+class FieldRef:
+    """Reference to a path; comparison operators build predicates."""
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, path: str):
+        parse_path(path)
+        self.path = path
+
+    def __eq__(self, other: Any) -> Predicate:  # type: ignore[override]
+        return Compare(self.path, operator.eq, other)
+
+    def __ne__(self, other: Any) -> Predicate:  # type: ignore[override]
+        return Compare(self.path, operator.ne, other)
+
+    def __gt__(self, other: Any) -> Predicate:
+        return Compare(self.path, operator.gt, other)
+
+    def __ge__(self, other: Any) -> Predicate:
+        return Compare(self.path, operator.ge, other)
+
+    def __lt__(self, other: Any) -> Predicate:
+        return Compare(self.path, operator.lt, other)
+
+    def __le__(self, other: Any) -> Predicate:
+        return Compare(self.path, operator.le, other)
+
+    def isin(self, options: Iterable[Any]) -> Predicate:
+        """Value is one of ``options`` (compared after validation)."""
+        return Compare(self.path, _is_in, frozenset(options))
+
+    def contains(self, needle: Any) -> Predicate:
+        """Substring (for strings) or membership (for lists) test."""
+        return Compare(self.path, _contains, needle)
+
+    def exists(self) -> Predicate:
+        return Exists(self.path)
+
+    def length(self) -> _LengthRef:
+        """Compare the number of list elements, e.g. ``field(p).length() > 6``."""
+        return _LengthRef(self.path)
+
+
+def field(path: str) -> FieldRef:
+    """Start a predicate on ``path`` (e.g. ``"metadata.category"``)."""
+    return FieldRef(path)
+
+
+class Match(NamedTuple):
+    """One query result: where it came from and the validated model."""
+
+    source: str
+    index: int
+    value: BaseModel
+
+
+class Query:
+    """A predicate bound to a scope of a plan, ready to run over raw documents."""
+
+    def __init__(
+        self,
+        where: Predicate,
+        scope: Optional[str] = None,
+        root: type[BaseModel] = SessionPlan,
+    ):
+        self._args = (where, scope, root)
+        self.root = root
+        self.scope = parse_path(scope) if scope else ()
+        annotation = resolve_path(root, self.scope) if self.scope else root
+        if get_origin(annotation) is list:
+            self.scope = (*self.scope, "*")
+            annotation = get_args(annotation)[0]
+        if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            raise ValueError(f"Scope {scope!r} does not point to a model")
+        self.model: type[BaseModel] = annotation
+        self.where = where.bind(annotation)
+        self._needles = tuple(self.where.needles())
+
+    def __reduce__(self) -> tuple:
+        # Bound predicates hold TypeAdapters, which do not pickle; rebind in workers.
+        return (Query, self._args)
+
+    def might_match(self, text: Union[str, bytes]) -> bool:
+        """Cheap raw-text prefilter: False means the document cannot match."""
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", errors="replace")
+        return all(needle in text for needle in self._needles)
+
+    def match_raw(self, document: Any) -> list[tuple[int, Any]]:
+        """``(index, raw unit)`` pairs within a parsed document that satisfy the predicate."""
+        units = extract(document, self.scope, self.root) if self.scope else [document]
+        return [(i, unit) for i, unit in enumerate(units) if self.where.evaluate(unit)]
+
+    def run(
+        self, documents: Iterable[Union[dict, str, bytes]], source: str = "<memory>"
+    ) -> Iterator[Match]:
+        """Yield validated matches from dicts or JSON texts.
+
+        Malformed JSON texts and matching units that fail full validation are
+        skipped.
+        """
+        for doc_index, document in enumerate(documents):
+            if isinstance(document, (str, bytes)):
+                if not self.might_match(document):
+                    continue
+                try:
+                    document = from_json(document)
+                except ValueError:
+                    continue
+            for index, unit in self.match_raw(document):
+                try:
+                    value = self.model.model_validate(unit)
+                except ValidationError:
+                    continue
+                yield Match(f"{source}#{doc_index}", index, value)
+
+    def run_file(self, path: Union[str, Path]) -> list[Match]:
+        """Run over one ``.json`` (one plan) or ``.jsonl`` (one plan per line) file."""
+        path = Path(path)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".jsonl":
+            documents: Iterable[str] = (line for line in text.splitlines() if line.strip())
+        else:
+            documents = [text]
+        return list(self.run(documents, source=str(path)))
+
+    def run_files(
+        self, paths: Iterable[Union[str, Path]], workers: Optional[int] = None
+    ) -> list[Match]:
+        """Run over many files in a process pool (``workers`` of 0 or 1: in-process)."""
+        paths = [str(p) for p in paths]
+        if workers is not None and workers <= 1:
+            results = map(self.run_file, paths)
+            return [m for batch in results for m in batch]
+        with ProcessPoolExecutor(workers) as pool:
+            return [m for batch in pool.map(self.run_file, paths) for m in batch]
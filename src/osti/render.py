@@ -0,0 +1,365 @@
+"""Pure-Python SVG rendering of drill diagrams, with content-addressed caching.
+
+:func:`render_svg` draws a :class:`DiagramInfo` onto a pitch built from its
+:class:`PitchView`. Pitch backgrounds and glyph definitions (arrow heads,
+equipment symbols) are shared templates built once per size and view, so a
+render only formats the entities themselves. :class:`RenderCache` keys
+renders on a hash of the diagram's drawable content, so an unchanged diagram
+is never drawn twice; :func:`render_many` renders only the misses, across a
+process pool.
+
+PNG output (:func:`render_png`) needs the optional ``cairosvg`` package.
+"""
+
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Iterable, Optional, Union
+
+from .session_plan import ArrowType, DiagramInfo, EquipmentType, PitchView, PitchViewType
+
+RENDER_VERSION = 2
+"""Renderer/style version hashed into :func:`diagram_key`; bump it when drawing changes."""
+
+_PITCH_GREEN = "#3a7d44"
+_LINE = "#ffffff"
+
+# (stroke color, dash pattern, stroke width)
+_ARROW_STYLES: dict[ArrowType, tuple[str, str, float]] = {
+    ArrowType.PASS: ("#ffffff", "", 1.6),
+    ArrowType.RUN: ("#ffe14d", "6 4", 1.6),
+    ArrowType.SHOT: ("#ff4d4d", "", 2.6),
+    ArrowType.DRIBBLE: ("#ffffff", "2 3", 1.6),
+    ArrowType.CROSS: ("#7fd4ff", "", 1.6),
+    ArrowType.THROUGH_BALL: ("#ffffff", "10 3 2 3", 1.8),
+    ArrowType.MOVEMENT: ("#d9d9d9", "4 4", 1.2),
+}
+
+_EQUIPMENT_SYMBOLS: dict[EquipmentType, str] = {
+    EquipmentType.CONE: '<path d="M0,-5 L4,4 L-4,4 Z" fill="#ff8c1a"/>',
+    EquipmentType.MANNEQUIN: '<rect x="-2.5" y="-6" width="5" height="12" rx="2" fill="#333"/>',
+    EquipmentType.POLE: '<rect x="-1" y="-7" width="2" height="14" fill="#ffd11a"/>',
+    EquipmentType.GATE: '<rect x="-1" y="-5" width="2" height="10" fill="#ffd11a"/>',
+    EquipmentType.HURDLE: '<rect x="-5" y="-1.5" width="10" height="3" fill="#e6e6e6"/>',
+    EquipmentType.MINI_GOAL: '<rect x="-5" y="-2" width="10" height="4" fill="none" stroke="#fff"/>',
+    EquipmentType.FULL_GOAL: '<rect x="-8" y="-2" width="16" height="4" fill="none" stroke="#fff" stroke-width="1.5"/>',
+    EquipmentType.AIR_BODY: '<ellipse rx="3" ry="6" fill="#6b6bff"/>',
+    EquipmentType.FLAG: '<path d="M0,6 L0,-6 L5,-3 L0,0" fill="#ff3333" stroke="#ccc"/>',
+}
+
+# Default length/width aspect of the visible area when the view gives no meters.
+_VIEW_ASPECT: dict[PitchViewType, float] = {
+    PitchViewType.FULL_PITCH: 105 / 68,
+    PitchViewType.HALF_PITCH: 52.5 / 68,
+    PitchViewType.PENALTY_AREA: 16.5 / 40.3,
+    PitchViewType.THIRD: 35 / 68,
+    PitchViewType.BETWEEN_HALF_AND_FULL: 75 / 68,
+    PitchViewType.CUSTOM: 1.0,
+}
+
+_SAFE_COLOR = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789#")
+
+
+def _color(value: Optional[str], fallback: str) -> str:
+    """Use ``value`` as an SVG color only if it is a plain name or hex code."""
+    if value and len(value) <= 32 and set(value) <= _SAFE_COLOR:
+        return value
+    return fallback
+
+
+def _canvas(pitch_view: Optional[PitchView], size: int) -> tuple[int, int, bool]:
+    """Return (width, height, horizontal) in pixels; ``size`` is the longer side."""
+    view = pitch_view or PitchView()
+    horizontal = view.orientation.strip().lower() == "horizontal"
+    if view.length_meters and view.width_meters:
+        aspect = view.length_meters / view.width_meters
+    else:
+        aspect = _VIEW_ASPECT.get(view.view_type, 1.0)
+    if aspect >= 1:
+        length, across = size, max(1, round(size / aspect))
+    else:
+        length, across = max(1, round(size * aspect)), size
+    # Vertical diagrams run their length along the y axis.
+    return (length, across, True) if horizontal else (across, length, False)
+
+
+@lru_cache(maxsize=None)
+def _defs() -> str:
+    """Shared glyph definitions: one arrow head per arrow type, one symbol per equipment type."""
+    markers = "".join(
+        f'<marker id="ah-{t.value}" viewBox="0 0 10 10" refX="9" refY="5" '
+        f'markerWidth="6" markerHeight="6" orient="auto-start-reverse">'
+        f'<path d="M0,0 L10,5 L0,10 Z" fill="{stroke}"/></marker>'
+        for t, (stroke, _, _) in _ARROW_STYLES.items()
+    )
+    symbols = "".join(
+        f'<symbol id="eq-{t.value}" overflow="visible">{body}</symbol>'
+        for t, body in _EQUIPMENT_SYMBOLS.items()
+    )
+    return f"<defs>{markers}{symbols}</defs>"
+
+
+@lru_cache(maxsize=64)
+def _pitch(view_type: PitchViewType, width: int, height: int, horizontal: bool) -> str:
+    """Pitch background and markings for a view, shared by every diagram that uses it."""
+    parts = [
+        f'<rect width="{width}" height="{height}" fill="{_PITCH_GREEN}"/>',
+        f'<g fill="none" stroke="{_LINE}" stroke-width="1.2" opacity="0.8">',
+        f'<rect x="2" y="2" width="{width - 4}" height="{height - 4}"/>',
+    ]
+    length, across = (width, height) if horizontal else (height, width)
+
+    def box(depth: float, span: float, at_far_end: bool = True) -> str:
+        d, s = depth * length, span * across
+        offset = (across - s) / 2
+        if horizontal:
+            x = width - 2 - d if at_far_end else 2
+            return f'<rect x="{x:.1f}" y="{offset:.1f}" width="{d:.1f}" height="{s:.1f}"/>'
+        y = 2 if at_far_end else height - 2 - d
+        return f'<rect x="{offset:.1f}" y="{y:.1f}" width="{s:.1f}" height="{d:.1f}"/>'
+
+    if view_type is PitchViewType.FULL_PITCH:
+        if horizontal:
+            parts.append(f'<line x1="{width / 2}" y1="2" x2="{width / 2}" y2="{height - 2}"/>')
+        else:
+            parts.append(f'<line x1="2" y1="{height / 2}" x2="{width - 2}" y2="{height / 2}"/>')
+        parts.append(f'<circle cx="{width / 2}" cy="{height / 2}" r="{0.087 * across:.1f}"/>')
+        parts.append(box(16.5 / 105, 40.3 / 68))
+        parts.append(box(16.5 / 105, 40.3 / 68, at_far_end=False))
+    elif view_type in (PitchViewType.HALF_PITCH, PitchViewType.BETWEEN_HALF_AND_FULL):
+        parts.append(box(16.5 / 52.5, 40.3 / 68))
+        parts.append(box(5.5 / 52.5, 18.3 / 68))
+    elif view_type is PitchViewType.THIRD:
+        parts.append(box(16.5 / 35, 40.3 / 68))
+    elif view_type is PitchViewType.PENALTY_AREA:
+        parts.append(box(5.5 / 16.5, 18.3 / 40.3))
+    parts.append("</g>")
+    return "".join(parts)
+
+
+def render_svg(diagram: DiagramInfo, size: int = 400) -> str:
+    """Render ``diagram`` as a standalone SVG document.
+
+    ``size`` is the length in pixels of the canvas' long side. Coordinates
+    are the usual 0-100 system with ``y`` pointing up.
+    """
+    view = diagram.pitch_view or PitchView()
+    width, height, horizontal = _canvas(view, size)
+    sx, sy = width / 100.0, height / 100.0
+
+    def pt(x: float, y: float) -> tuple[str, str]:
+        return f"{x * sx:.1f}", f"{(100 - y) * sy:.1f}"
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        _defs(),
+        _pitch(view.view_type, width, height, horizontal),
+    ]
+    for zone in diagram.zones:
+        x1, x2 = sorted((zone.x1, zone.x2))
+        y1, y2 = sorted((zone.y1, zone.y2))
+        fill = _color(zone.color, "#ffffff")
+        out.append(
+            f'<rect x="{x1 * sx:.1f}" y="{(100 - y2) * sy:.1f}" width="{(x2 - x1) * sx:.1f}" '
+            f'height="{(y2 - y1) * sy:.1f}" fill="{fill}" fill-opacity="0.18" '
+            f'stroke="{fill}" stroke-dasharray="3 3"/>'
+        )
+    for goal in diagram.goals:
+        gw = 8 if goal.goal_type == "full_goal" else 5
+        gx, gy = pt(goal.x, goal.y)
+        # Goals sit on the end lines: across the canvas when vertical, upright when horizontal.
+        w, h = (4, 2 * gw) if horizontal else (2 * gw, 4)
+        out.append(
+            f'<rect x="{float(gx) - w / 2:.1f}" y="{float(gy) - h / 2:.1f}" width="{w}" '
+            f'height="{h}" fill="none" stroke="#ffffff" stroke-width="1.5"/>'
+        )
+    for item in diagram.equipment:
+        ex, ey = pt(item.x, item.y)
+        if item.x2 is not None and item.y2 is not None:
+            ex2, ey2 = pt(item.x2, item.y2)
+            out.append(
+                f'<line x1="{ex}" y1="{ey}" x2="{ex2}" y2="{ey2}" stroke="#ffd11a" '
+                f'stroke-dasharray="2 2"/><use xlink:href="#eq-{item.equipment_type.value}" '
+                f'x="{ex2}" y="{ey2}"/>'
+            )
+        out.append(f'<use xlink:href="#eq-{item.equipment_type.value}" x="{ex}" y="{ey}"/>')
+    for arrow in diagram.arrows:
+        stroke, dash, stroke_width = _ARROW_STYLES[arrow.arrow_type]
+        x1, y1 = pt(arrow.start_x, arrow.start_y)
+        x2, y2 = pt(arrow.end_x, arrow.end_y)
+        dash_attr = f' stroke-dasharray="{dash}"' if dash else ""
+        out.append(
+            f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="{stroke}" '
+            f'stroke-width="{stroke_width}"{dash_attr} marker-end="url(#ah-{arrow.arrow_type.value})"/>'
+        )
+        if arrow.sequence_number is not None:
+            mx = (float(x1) + float(x2)) / 2
+            my = (float(y1) + float(y2)) / 2
+            out.append(
+                f'<text x="{mx:.1f}" y="{my - 3:.1f}" font-size="9" fill="{stroke}" '
+                f'text-anchor="middle">{arrow.sequence_number}</text>'
+            )
+    for ball in diagram.balls:
+        bx, by = pt(ball.x, ball.y)
+        out.append(f'<circle cx="{bx}" cy="{by}" r="2.5" fill="#ffffff" stroke="#000"/>')
+    for player in diagram.player_positions:
+        fill = _color(player.color, "#1f4fd1")
+        cx, cy = pt(player.x, player.y)
+        out.append(
+            f'<circle cx="{cx}" cy="{cy}" r="6" fill="{fill}" stroke="#000" stroke-width="0.8"/>'
+            f'<text x="{cx}" y="{float(cy) + 3:.1f}" font-size="7" font-family="sans-serif" '
+            f'text-anchor="middle" fill="#000">{escape(player.label)}</text>'
+        )
+    out.append("</svg>")
+    return "".join(out)
+
+
+def diagram_key(diagram: DiagramInfo, size: int = 400) -> str:
+    """Hash of what :func:`render_svg` draws, plus ``size`` and :data:`RENDER_VERSION`."""
+    payload = diagram.model_dump_json(exclude={"image_ref", "description", "extensions"})
+    return hashlib.sha256(f"{RENDER_VERSION}:{size}:{payload}".encode()).hexdigest()
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered SVGs, optionally backed by a directory.
+
+    The in-memory tier holds up to ``maxsize`` renders. With ``directory``
+    set, renders are also written to ``<directory>/<key>.svg`` and read back
+    on a memory miss, so caches survive restarts and can be shared by
+    processes on one host.
+    """
+
+    def __init__(self, maxsize: int = 1024, directory: Optional[Union[str, Path]] = None):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, str] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached SVG for ``key``, or ``None``."""
+        with self._lock:
+            svg = self._items.get(key)
+            if svg is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return svg
+        if self.directory is not None:
+            path = self.directory / f"{key}.svg"
+            if path.exists():
+                svg = path.read_text(encoding="utf-8")
+                self._remember(key, svg)
+                with self._lock:
+                    self.hits += 1
+                return svg
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, svg: str) -> None:
+        """Store ``svg`` under ``key`` in memory (and on disk, if configured)."""
+        self._remember(key, svg)
+        if self.directory is not None:
+            path = self.directory / f"{key}.svg"
+            # A unique temp name per writer, so concurrent puts never share one.
+            with NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.directory, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp.write(svg)
+            Path(tmp.name).replace(path)
+
+    def _remember(self, key: str, svg: str) -> None:
+        with self._lock:
+            self._items[key] = svg
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (files on disk are kept)."""
+        with self._lock:
+            self._items.clear()
+
+
+_default_cache = RenderCache()
+
+
+def render_cached(
+    diagram: DiagramInfo, size: int = 400, cache: Optional[RenderCache] = None
+) -> str:
+    """Render ``diagram``, reusing a cached SVG if its content is unchanged."""
+    if cache is None:
+        cache = _default_cache
+    key = diagram_key(diagram, size)
+    svg = cache.get(key)
+    if svg is None:
+        svg = render_svg(diagram, size)
+        cache.put(key, svg)
+    return svg
+
+
+def _render_job(args: tuple[DiagramInfo, int]) -> str:
+    diagram, size = args
+    return render_svg(diagram, size)
+
+
+def render_many(
+    diagrams: Iterable[DiagramInfo],
+    size: int = 400,
+    cache: Optional[RenderCache] = None,
+    workers: Optional[int] = None,
+) -> list[str]:
+    """Render many diagrams, in order, drawing only cache misses.
+
+    Misses are rendered in a process pool of ``workers`` processes (default:
+    CPU count); ``workers`` of 0 or 1 renders in the calling process.
+    Identical diagrams within the batch are rendered once.
+    """
+    if cache is None:
+        cache = _default_cache
+    diagrams = list(diagrams)
+    keys = [diagram_key(d, size) for d in diagrams]
+    results: dict[str, str] = {}
+    todo: dict[str, DiagramInfo] = {}
+    for key, diagram in zip(keys, diagrams):
+        if key in results or key in todo:
+            continue
+        svg = cache.get(key)
+        if svg is None:
+            todo[key] = diagram
+        else:
+            results[key] = svg
+    if todo:
+        jobs = [(d, size) for d in todo.values()]
+        if workers is not None and workers <= 1:
+            rendered = list(map(_render_job, jobs))
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                rendered = list(pool.map(_render_job, jobs, chunksize=16))
+        for key, svg in zip(todo, rendered):
+            cache.put(key, svg)
+            results[key] = svg
+    return [results[key] for key in keys]
+
+
+def render_png(diagram: DiagramInfo, size: int = 400, cache: Optional[RenderCache] = None) -> bytes:
+    """Render ``diagram`` to PNG bytes via ``cairosvg`` (``pip install cairosvg``)."""
+    try:
+        import cairosvg
+    except ImportError as exc:
+        raise ImportError("PNG rendering requires cairosvg: pip install cairosvg") from exc
+    svg = render_cached(diagram, size, cache)
+    return cairosvg.svg2png(bytestring=svg.encode("utf-8"))
+
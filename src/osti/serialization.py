@@ -0,0 +1,229 @@
+"""Named serialization profiles for session plans.
+
+A :class:`Profile` describes one response shape: which field paths to keep
+or drop (same syntax as :mod:`osti.query`), and whether to compact the
+output by omitting ``None`` values and empty lists, dropping values equal
+to their field defaults, or rounding coordinates. Each profile is compiled once into a :class:`Serializer` that
+holds the ``include`` / ``exclude`` arguments Pydantic expects, so callers
+no longer rebuild those dicts per request.
+
+Built-in profiles:
+
+- ``full``: the complete plan
+- ``summary``: plan id, metadata, source, and each drill's id, name, type
+  and tactical context
+- ``no_diagrams``: everything except drill diagrams
+- ``no_text``: everything except the free-text drill lists and descriptions
+- ``geometry_only``: plan id plus each drill's id and diagram geometry
+- ``compact``: the complete plan without ``None`` values or empty lists,
+  coordinates rounded to 2 decimals
+
+Example::
+
+    from osti.serialization import dump_json
+
+    body = dump_json(plan, "summary")
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .query import parse_path, resolve_path
+from .session_plan import SessionPlan
+
+COORDINATE_KEYS = frozenset(
+    {"x", "y", "x1", "y1", "x2", "y2", "start_x", "start_y", "end_x", "end_y"}
+)
+"""Field names rounded by profiles with ``round_coordinates`` set."""
+
+_Spec = Union[bool, dict[Any, "_Spec"]]
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A named response shape.
+
+    ``include`` and ``exclude`` are field paths such as
+    ``"drills[*].diagram"``. ``compact`` drops ``None`` values and empty
+    lists. ``exclude_defaults`` also drops values equal to their field
+    default (``arrow_type="movement"``, ``page_count=0``, ...), which only
+    clients that fill defaults back in can read. ``round_coordinates``
+    rounds the fields in :data:`COORDINATE_KEYS` to that many decimals.
+
+    ``None`` values and defaults are dropped inside pydantic-core; empty
+    lists and rounding need a Python pass over the dumped dict, which makes
+    such profiles several times slower than a plain dump.
+    """
+
+    name: str
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    compact: bool = False
+    exclude_defaults: bool = False
+    round_coordinates: Optional[int] = None
+
+
+_DIAGRAM_GEOMETRY = ("pitch_view", "player_positions", "arrows", "equipment", "goals", "balls", "zones")
+_DRILL_TEXT = (
+    "sequence",
+    "rules",
+    "scoring",
+    "coaching_points",
+    "progressions",
+    "regressions",
+    "additional_sections",
+    "setup.description",
+    "diagram.description",
+)
+
+_PROFILES: dict[str, Profile] = {}
+
+
+def register_profile(profile: Profile, *, replace: bool = False) -> Profile:
+    """Register ``profile`` under its name; its paths are checked immediately.
+
+    Raises ``ValueError`` for unknown paths or a duplicate name (unless
+    ``replace``).
+    """
+    if profile.name in _PROFILES and not replace:
+        raise ValueError(f"Profile {profile.name!r} is already registered")
+    for path in profile.include + profile.exclude:
+        resolve_path(SessionPlan, parse_path(path))
+    _PROFILES[profile.name] = profile
+    serializer.cache_clear()
+    return profile
+
+
+def get_profile(name: str) -> Profile:
+    """Return the registered profile called ``name``."""
+    try:
+        return _PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown serialization profile {name!r}; known: {', '.join(sorted(_PROFILES))}"
+        ) from None
+
+
+def profiles() -> list[str]:
+    """Names of all registered profiles."""
+    return sorted(_PROFILES)
+
+
+def compile_paths(paths: tuple[str, ...]) -> Optional[dict[Any, _Spec]]:
+    """Turn field paths into a nested Pydantic ``include``/``exclude`` dict."""
+    if not paths:
+        return None
+    spec: dict[Any, _Spec] = {}
+    for path in paths:
+        node = spec
+        segments = ["__all__" if s == "*" else s for s in parse_path(path)]
+        for depth, segment in enumerate(segments):
+            if node.get(segment) is True:
+                break
+            if depth == len(segments) - 1:
+                node[segment] = True
+            else:
+                node = node.setdefault(segment, {})
+    return spec
+
+
+def _compact(value: Any, digits: Optional[int], drop_empty: bool) -> Any:
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if type(item) is list:
+                if drop_empty and not item:
+                    continue
+                item = [_compact(v, digits, drop_empty) for v in item]
+            elif type(item) is dict:
+                item = _compact(item, digits, drop_empty)
+            elif digits is not None and type(item) is float and key in COORDINATE_KEYS:
+                item = round(item, digits)
+            out[key] = item
+        return out
+    if isinstance(value, list):
+        return [_compact(item, digits, drop_empty) for item in value]
+    return value
+
+
+class Serializer:
+    """A compiled :class:`Profile`; obtain one with :func:`serializer`."""
+
+    def __init__(self, profile: Profile) -> None:
+        self.profile = profile
+        self.include = compile_paths(profile.include)
+        self.exclude = compile_paths(profile.exclude)
+        self._post = profile.compact or profile.round_coordinates is not None
+
+    def dump(self, instance: BaseModel) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        data = instance.model_dump(
+            mode="json",
+            include=self.include,
+            exclude=self.exclude,
+            exclude_none=self.profile.compact,
+            exclude_defaults=self.profile.exclude_defaults,
+        )
+        if self._post:
+            data = _compact(data, self.profile.round_coordinates, self.profile.compact)
+        return data
+
+    def dump_json(self, instance: BaseModel, *, indent: Optional[int] = None) -> bytes:
+        """Serialize to JSON bytes."""
+        if self._post:
+            return to_json(self.dump(instance), indent=indent)
+        return instance.model_dump_json(
+            include=self.include,
+            exclude=self.exclude,
+            exclude_defaults=self.profile.exclude_defaults,
+            indent=indent,
+        ).encode()
+
+    def __repr__(self) -> str:
+        return f"Serializer({self.profile.name!r})"
+
+
+@lru_cache(maxsize=None)
+def serializer(name: str) -> Serializer:
+    """Return the cached compiled serializer for profile ``name``."""
+    return Serializer(get_profile(name))
+
+
+def dump(instance: BaseModel, profile: str = "full") -> dict[str, Any]:
+    """Serialize ``instance`` with the named profile to a dict."""
+    return serializer(profile).dump(instance)
+
+
+def dump_json(instance: BaseModel, profile: str = "full", *, indent: Optional[int] = None) -> bytes:
+    """Serialize ``instance`` with the named profile to JSON bytes."""
+    return serializer(profile).dump_json(instance, indent=indent)
+
+
+register_profile(Profile("full"))
+register_profile(
+    Profile(
+        "summary",
+        include=(
+            "id",
+            "metadata",
+            "source",
+            "drills[*].id",
+            "drills[*].name",
+            "drills[*].drill_type",
+            "drills[*].tactical_context",
+        ),
+    )
+)
+register_profile(Profile("no_diagrams", exclude=("drills[*].diagram",)))
+register_profile(Profile("no_text", exclude=tuple(f"drills[*].{p}" for p in _DRILL_TEXT)))
+register_profile(
+    Profile(
+        "geometry_only",
+        include=("id", "drills[*].id", *(f"drills[*].diagram.{p}" for p in _DIAGRAM_GEOMETRY)),
+    )
+)
+register_profile(Profile("compact", compact=True, round_coordinates=2))
@@ -0,0 +1,204 @@
+"""Content-addressed drill storage with plan references.
+
+A drill reused across many plans is normally embedded, and stored, once per
+plan. :func:`normalize` instead writes each drill (and, optionally, each
+diagram) to a :class:`BlobStore` under the SHA-256 of its canonical JSON,
+and returns the plan with drills replaced by references::
+
+    {"$ref": "<sha256>", "id": "<drill id>"}
+
+The drill ``id`` stays in the plan and is left out of the hash, so the same
+drill content used in 40 plans is one blob. Blobs that already exist are not
+rewritten. :class:`PlanResolver` reassembles full :class:`SessionPlan`
+objects through a shared LRU of validated drills and diagrams.
+
+Example::
+
+    from osti.storage import DirectoryBlobStore, PlanResolver, normalize
+
+    store = DirectoryBlobStore("library/blobs")
+    ref_plan = normalize(plan, store, diagrams=True)
+    plan = PlanResolver(store).resolve(ref_plan)
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from .session_plan import DiagramInfo, DrillBlock, SessionPlan
+
+REF_KEY = "$ref"
+"""Key marking a reference to a stored blob."""
+
+
+def canonical_json(data: Any) -> bytes:
+    """Serialize ``data`` deterministically (sorted keys, no whitespace)."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def is_ref(value: Any) -> bool:
+    """Whether ``value`` is a ``{"$ref": ...}`` reference."""
+    return isinstance(value, dict) and REF_KEY in value
+
+
+class BlobStore:
+    """In-memory content-addressed blob store; also the interface for others."""
+
+    def __init__(self) -> None:
+        self._blobs: dict[str, bytes] = {}
+        self.writes = 0
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._blobs
+
+    def get(self, digest: str) -> bytes:
+        """Return the blob for ``digest``; raises ``KeyError`` if absent."""
+        return self._blobs[digest]
+
+    def _write(self, digest: str, blob: bytes) -> None:
+        self._blobs[digest] = blob
+
+    def put(self, blob: bytes) -> str:
+        """Store ``blob`` (unless already present) and return its digest."""
+        digest = hashlib.sha256(blob).hexdigest()
+        if digest not in self:
+            self._write(digest, blob)
+            self.writes += 1
+        return digest
+
+
+class DirectoryBlobStore(BlobStore):
+    """Blob store on disk, one file per blob at ``<root>/<ab>/<digest>.json``."""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        super().__init__()
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def __contains__(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def get(self, digest: str) -> bytes:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def _write(self, digest: str, blob: bytes) -> None:
+        path = self._path(digest)
+        path.parent.mkdir(exist_ok=True)
+        # A unique temp name per writer, so concurrent puts never share one.
+        with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(blob)
+        Path(tmp.name).replace(path)
+
+
+def store_diagram(diagram: DiagramInfo, store: BlobStore) -> str:
+    """Store ``diagram`` and return its digest."""
+    return store.put(canonical_json(diagram.model_dump(mode="json")))
+
+
+def store_drill(drill: DrillBlock, store: BlobStore, *, diagrams: bool = False) -> str:
+    """Store ``drill`` without its ``id`` and return its digest.
+
+    With ``diagrams``, the diagram is stored as its own blob and referenced.
+    """
+    data = drill.model_dump(mode="json", exclude={"id"})
+    if diagrams:
+        data["diagram"] = {REF_KEY: store_diagram(drill.diagram, store)}
+    return store.put(canonical_json(data))
+
+
+def normalize(plan: SessionPlan, store: BlobStore, *, diagrams: bool = False) -> dict[str, Any]:
+    """Store the drills of ``plan`` and return the plan dict with references."""
+    data = plan.model_dump(mode="json", exclude={"drills"})
+    data["drills"] = [
+        {REF_KEY: store_drill(drill, store, diagrams=diagrams), "id": str(drill.id)}
+        for drill in plan.drills
+    ]
+    return data
+
+
+class PlanResolver:
+    """Rebuilds full plans from reference plans, sharing hot drills.
+
+    Validated drills and diagrams are kept in a thread-safe LRU of up to
+    ``maxsize`` entries shared by every plan the resolver loads. Resolved
+    plans share nested drill objects with the cache (and with each other);
+    pass ``copy=True`` to :meth:`resolve` before mutating them.
+    """
+
+    def __init__(self, store: BlobStore, maxsize: int = 4096) -> None:
+        self.store = store
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, BaseModel] = OrderedDict()
+        self._lock = Lock()
+
+    def _cached(self, digest: str) -> Optional[BaseModel]:
+        with self._lock:
+            item = self._items.get(digest)
+            if item is not None:
+                self._items.move_to_end(digest)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return item
+
+    def _remember(self, digest: str, item: BaseModel) -> None:
+        with self._lock:
+            self._items[digest] = item
+            self._items.move_to_end(digest)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def diagram(self, digest: str) -> DiagramInfo:
+        """Return the stored diagram ``digest``."""
+        item = self._cached(digest)
+        if item is None:
+            item = DiagramInfo.model_validate_json(self.store.get(digest))
+            self._remember(digest, item)
+        return item
+
+    def drill(self, digest: str) -> DrillBlock:
+        """Return the stored drill ``digest`` (with a placeholder ``id``)."""
+        item = self._cached(digest)
+        if item is None:
+            data = json.loads(self.store.get(digest))
+            if is_ref(data.get("diagram")):
+                data["diagram"] = self.diagram(data["diagram"][REF_KEY])
+            item = DrillBlock.model_validate(data)
+            self._remember(digest, item)
+        return item
+
+    def resolve(self, data: Union[str, bytes, dict[str, Any]], *, copy: bool = False) -> SessionPlan:
+        """Rebuild a :class:`SessionPlan` from a reference plan (dict or JSON)."""
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        drills = []
+        for entry in data.get("drills", []):
+            if not is_ref(entry):
+                drills.append(entry)
+                continue
+            drill = self.drill(entry[REF_KEY])
+            drills.append(drill.model_copy(update={"id": UUID(entry["id"])}, deep=copy))
+        return SessionPlan.model_validate({**data, "drills": drills})
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        """Drop all cached drills and diagrams."""
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,187 @@
+"""Validation policies and batch error aggregation for bulk ingest.
+
+Pydantic reports every error it finds as a full dict (message, input, URL,
+context). For rejected records in a bulk load that detail is mostly
+redundant: the same few problems repeat across thousands of records. A
+:class:`ValidationPolicy` controls how much of each error is materialized,
+and :class:`ErrorAggregator` folds errors from a whole batch into one row
+per location path and error type.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .session_plan import SessionPlan
+
+
+@dataclass(frozen=True)
+class ValidationPolicy:
+    """How much error detail to keep when a record fails validation.
+
+    ``max_errors`` caps how many errors are kept in the report
+    (``max_errors=1`` keeps only the first); ``None`` keeps every error.
+    Validation itself always runs over the whole document, so a cap makes
+    reports smaller, not rejection faster. ``include_input`` copies the
+    offending input value into each error, which is the most expensive part
+    of error reporting for large payloads.
+    """
+
+    max_errors: Optional[int] = None
+    include_input: bool = False
+
+    def __post_init__(self) -> None:
+        if self.max_errors is not None and self.max_errors < 1:
+            raise ValueError("max_errors must be None or a positive integer")
+
+
+FAIL_FAST = ValidationPolicy(max_errors=1)
+"""Report only the first error of each rejected record."""
+
+COLLECT_ALL = ValidationPolicy()
+"""Keep every error of each rejected record."""
+
+
+class PlanValidationError(ValueError):
+    """A record failed validation; carries the errors kept by the policy."""
+
+    def __init__(self, errors: list[dict[str, Any]], total: int, title: str = "SessionPlan"):
+        self.errors = errors
+        self.total = total
+        shown = "; ".join(f"{_loc_path(e['loc'])}: {e['msg']}" for e in errors)
+        more = f" (+{total - len(errors)} more)" if total > len(errors) else ""
+        super().__init__(f"{total} validation error(s) for {title}: {shown}{more}")
+
+
+def _loc_path(loc: tuple) -> str:
+    """Render a Pydantic ``loc`` tuple, replacing list indices with ``*``."""
+    return ".".join("*" if isinstance(part, int) else str(part) for part in loc) or "<root>"
+
+
+def policy_errors(exc: ValidationError, policy: ValidationPolicy = COLLECT_ALL) -> list[dict[str, Any]]:
+    """Materialize the errors of ``exc`` allowed by ``policy``."""
+    errors = exc.errors(
+        include_url=False,
+        include_context=False,
+        include_input=policy.include_input,
+    )
+    if policy.max_errors is not None:
+        del errors[policy.max_errors:]
+    return errors
+
+
+def validate_plan(
+    data: Union[dict, str, bytes],
+    policy: ValidationPolicy = COLLECT_ALL,
+    model: type[BaseModel] = SessionPlan,
+) -> BaseModel:
+    """Validate a plan (dict or JSON) under ``policy``.
+
+    Raises :class:`PlanValidationError` with at most ``policy.max_errors``
+    errors (and the full error count) instead of Pydantic's
+    ``ValidationError``.
+    """
+    try:
+        if isinstance(data, (str, bytes)):
+            return model.model_validate_json(data)
+        return model.model_validate(data)
+    except ValidationError as exc:
+        raise PlanValidationError(
+            policy_errors(exc, policy), exc.error_count(), exc.title
+        ) from None
+
+
+class ErrorGroup(BaseModel):
+    """Errors sharing one location path and error type across a batch."""
+
+    loc: str = Field(..., description="Location path with list indices as '*'")
+    type: str = Field(..., description="Pydantic error type (e.g., 'enum', 'missing')")
+    count: int = Field(0, description="Number of occurrences in the batch")
+    message: str = Field("", description="Message of the first occurrence")
+    examples: list[str] = Field(
+        default_factory=list, description="Identifiers of the first affected records"
+    )
+
+
+class ErrorAggregator:
+    """Groups validation errors from many records by location path and type.
+
+    Example::
+
+        agg = ErrorAggregator()
+        for key, line in records:
+            try:
+                validate_plan(line, FAIL_FAST)
+            except PlanValidationError as exc:
+                agg.add(exc.errors, record=key)
+        print(agg.summary())
+    """
+
+    def __init__(self, max_examples: int = 3):
+        self.max_examples = max_examples
+        self.records = 0
+        self._groups: dict[tuple[str, str], ErrorGroup] = {}
+
+    def add(self, errors: list[dict[str, Any]], record: Optional[str] = None) -> None:
+        """Add the errors of one rejected record."""
+        self.records += 1
+        for error in errors:
+            key = (_loc_path(error["loc"]), error["type"])
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = ErrorGroup(
+                    loc=key[0], type=key[1], message=error["msg"]
+                )
+            group.count += 1
+            if record is not None and len(group.examples) < self.max_examples:
+                group.examples.append(record)
+
+    def add_exception(
+        self,
+        exc: Union[ValidationError, PlanValidationError],
+        record: Optional[str] = None,
+        policy: ValidationPolicy = COLLECT_ALL,
+    ) -> None:
+        """Add the errors carried by a Pydantic or policy validation error."""
+        if isinstance(exc, ValidationError):
+            self.add(policy_errors(exc, policy), record)
+        else:
+            self.add(exc.errors, record)
+
+    def merge(self, other: "ErrorAggregator") -> None:
+        """Fold the groups of another aggregator (e.g., from a worker) into this one."""
+        self.records += other.records
+        for key, theirs in other._groups.items():
+            group = self._groups.get(key)
+            if group is None:
+                group = theirs.model_copy(deep=True)
+                del group.examples[self.max_examples:]
+                self._groups[key] = group
+                continue
+            group.count += theirs.count
+            room = self.max_examples - len(group.examples)
+            group.examples.extend(theirs.examples[:max(room, 0)])
+
+    def groups(self) -> list[ErrorGroup]:
+        """Return the groups, most frequent first."""
+        return sorted(self._groups.values(), key=lambda g: (-g.count, g.loc, g.type))
+
+    def summary(self, limit: Optional[int] = None) -> str:
+        """Render a compact one-line-per-group text report."""
+        groups = self.groups()
+        lines = [f"{self.records} rejected record(s), {len(groups)} distinct error(s)"]
+        for group in groups[:limit]:
+            lines.append(f"{group.count:>8}  {group.loc}  [{group.type}]  {group.message}")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """Serialize the aggregated groups as compact JSON."""
+        return json.dumps(
+            {
+                "records": self.records,
+                "groups": [g.model_dump() for g in self.groups()],
+            },
+            separators=(",", ":"),
+        )
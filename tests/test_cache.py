@@ -0,0 +1,179 @@
+"""Tests for the shared plan cache."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from osti import cache as cache_module
+from osti.cache import PlanCache, content_version
+from osti.session_plan import SessionPlan
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+RAW = (EXAMPLES_DIR / "nielsen.json").read_bytes()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_or_load_validates_once():
+    cache = PlanCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return RAW
+
+    version = content_version(RAW)
+    first = cache.get_or_load("p1", version, loader)
+    second = cache.get_or_load("p1", version, loader)
+    assert isinstance(first, SessionPlan)
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.loads, stats.entries) == (1, 1, 1, 1)
+    assert stats.bytes == len(RAW)
+
+    cache.get_or_load("p1", "other-version", loader)
+    assert len(calls) == 2 and len(cache) == 2
+
+
+def test_single_flight():
+    cache = PlanCache()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return RAW
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("p", "v", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_loader_errors_propagate_and_are_not_cached():
+    cache = PlanCache()
+
+    def broken():
+        raise OSError("storage down")
+
+    with pytest.raises(OSError):
+        cache.get_or_load("p", "v", broken)
+    assert cache.get_or_load("p", "v", lambda: RAW).metadata is not None
+    with pytest.raises(ValueError):
+        cache.get_or_load("q", "v", lambda: b"{}")
+    assert ("q", "v") not in cache
+
+
+def test_lru_by_count_and_bytes():
+    plan = SessionPlan.model_validate_json(RAW)
+    cache = PlanCache(maxsize=2)
+    for i in range(3):
+        cache.put(f"p{i}", "v", plan, size=10)
+    assert ("p0", "v") not in cache and len(cache) == 2
+    assert cache.stats().evictions == 1
+
+    cache = PlanCache(max_bytes=25)
+    cache.put("a", "v", plan, size=10)
+    cache.put("b", "v", plan, size=10)
+    assert cache.get("a", "v") is plan  # a becomes most recent
+    cache.put("c", "v", plan, size=10)
+    assert ("b", "v") not in cache and ("a", "v") in cache
+    assert cache.stats().bytes == 20
+
+
+def test_ttl():
+    clock = FakeClock()
+    cache = PlanCache(ttl=60, clock=clock)
+    cache.get_or_load("p", "v", lambda: RAW)
+    clock.now = 59
+    assert cache.get("p", "v") is not None
+    clock.now = 61
+    assert cache.get("p", "v") is None
+    assert cache.stats().expirations == 1 and len(cache) == 0
+
+
+def test_invalidate():
+    plan = SessionPlan.model_validate_json(RAW)
+    cache = PlanCache()
+    cache.put("p", "v1", plan)
+    cache.put("p", "v2", plan)
+    cache.put("q", "v1", plan)
+    assert cache.invalidate("p", "v1") == 1
+    assert cache.invalidate("p") == 1
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.stats().bytes == 0
+
+
+def test_disk_tier_shared_between_caches(tmp_path):
+    first = PlanCache(directory=tmp_path)
+    plan = first.get_or_load("p", "v", lambda: RAW)
+
+    second = PlanCache(directory=tmp_path)
+
+    def loader():
+        raise AssertionError("should be served from disk")
+
+    restored = second.get_or_load("p", "v", loader)
+    assert restored.model_dump() == plan.model_dump()
+    assert second.stats().disk_hits == 1 and second.stats().loads == 0
+
+    second.invalidate("p", "v")
+    third = PlanCache(directory=tmp_path)
+    assert third.get_or_load("p", "v", lambda: RAW).metadata == plan.metadata
+    assert third.stats().loads == 1
+
+
+def test_copy_on_get():
+    cache = PlanCache()
+    shared = cache.get_or_load("p", "v", lambda: RAW)
+    private = cache.get_or_load("p", "v", lambda: RAW, copy=True)
+    assert private is not shared and private.model_dump() == shared.model_dump()
+    private.drills.clear()
+    assert cache.get("p", "v").drills and cache.get("p", "v", copy=True) is not shared
+
+
+def test_unreadable_disk_entries_are_misses(tmp_path, monkeypatch):
+    first = PlanCache(directory=tmp_path)
+    first.get_or_load("p", "v", lambda: RAW)
+    (path,) = (p for p in tmp_path.rglob("*") if p.is_file())
+    assert path.suffix == ".json"
+
+    for garbage in (b"\x80\x04not json", b'{"source": {}}'):
+        path.write_bytes(garbage)
+        again = PlanCache(directory=tmp_path)
+        assert again.get_or_load("p", "v", lambda: RAW).metadata is not None
+        assert again.stats().loads == 1 and again.stats().disk_hits == 0
+
+    monkeypatch.setattr(cache_module, "SCHEMA_VERSION", "0.0.0")
+    assert PlanCache(directory=tmp_path)._read_disk(("p", "v")) is None
+
+
+def test_invalidate_all_versions_on_disk(tmp_path):
+    cache = PlanCache(directory=tmp_path)
+    for version in ("v1", "v2"):
+        cache.get_or_load("p", version, lambda: RAW)
+    cache.get_or_load("q", "v1", lambda: RAW)
+    assert cache.invalidate("p") == 2
+
+    other = PlanCache(directory=tmp_path)
+    assert other._read_disk(("p", "v1")) is None and other._read_disk(("p", "v2")) is None
+    assert other._read_disk(("q", "v1")) is not None
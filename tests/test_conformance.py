@@ -0,0 +1,139 @@
+"""Tests for the conformance runner."""
+
+import json
+import shutil
+from pathlib import Path
+from xml.etree import ElementTree
+
+from osti.conformance import (
+    check_document,
+    check_schema_artifact,
+    deep_diff,
+    dropped_fields,
+    main,
+    run,
+    to_junit,
+)
+from osti.migrations import migrate
+from osti.session_plan import SCHEMA_VERSION, SessionPlan
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _tree(tmp_path: Path) -> Path:
+    root = tmp_path / "plans"
+    (root / "nested").mkdir(parents=True)
+    shutil.copy(EXAMPLES_DIR / "nielsen.json", root / "nielsen.json")
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    data["drills"][0]["unknown_field"] = 1
+    (root / "nested" / "extra.json").write_text(json.dumps(data), encoding="utf-8")
+    (root / "nested" / "broken.json").write_text('{"source": {}}', encoding="utf-8")
+    return root
+
+
+def test_deep_diff():
+    assert deep_diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+    assert deep_diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 3}]}) == ["a[1].b: 2 != 3"]
+    assert deep_diff({"a": 1}, {"a": 1, "b": 2}) == ["b: unexpected"]
+    assert deep_diff([1], [1, 2]) == ["<root>: length 1 != 2"]
+    assert deep_diff({"a": {"b": 1}}, {"a": {}}, missing="gone") == ["a.b: gone"]
+
+
+def test_examples_conform():
+    checks = check_document((EXAMPLES_DIR / "nielsen.json").read_bytes())
+    assert [c.name for c in checks] == ["validate", "round_trip"]
+    assert all(c.passed for c in checks), [c.details for c in checks]
+
+
+def test_dropped_input_is_reported():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    data["drills"][0]["unknown_field"] = 1
+    validate, round_trip = check_document(json.dumps(data))
+    assert validate.passed
+    assert not round_trip.passed
+    assert round_trip.details == ["input drills[0].unknown_field: dropped by validation"]
+
+
+def test_normalized_values_are_not_failures():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    data["id"] = "3F2504E0-4F89-11D3-9A0C-0305E82C3301"
+    data["drills"][0]["id"] = "6BA7B810-9DAD-11D1-80B4-00C04FD430C8"
+    data["source"]["extraction_timestamp"] = "2026-02-16T10:00:00+00:00"
+    data["metadata"]["duration_minutes"] = 90.0
+    checks = check_document(json.dumps(data))
+    assert all(c.passed for c in checks), [c.details for c in checks]
+
+
+def test_migrated_plans_conform():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    data["schema_version"] = "0.1.0"
+    migrated = migrate(data)
+    assert migrated["schema_version"] == SCHEMA_VERSION
+    assert all(c.passed for c in check_document(json.dumps(migrated)))
+
+
+def test_dropped_fields():
+    assert dropped_fields({"a": 1, "b": {"c": 2, "d": 3}}, {"a": "1", "b": {"c": 2}}) == ["b.d"]
+    assert dropped_fields({"l": [{"x": 1}, {"y": 2}]}, {"l": [{"x": 1}, {}]}) == ["l[1].y"]
+
+
+def test_run_and_cache(tmp_path):
+    root = _tree(tmp_path)
+    cache = tmp_path / "cache.json"
+    report = run(root, cache_path=cache, workers=1)
+    assert [f.path for f in report.files] == ["nested/broken.json", "nested/extra.json", "nielsen.json"]
+    assert [f.path for f in report.failures()] == ["nested/broken.json", "nested/extra.json"]
+    assert not any(f.cached for f in report.files)
+
+    (root / "nested" / "broken.json").unlink()
+    again = run(root, cache_path=cache, workers=1)
+    assert [f.path for f in again.files] == ["nested/extra.json", "nielsen.json"]
+    assert all(f.cached for f in again.files)
+    assert [f.checks for f in again.files] == [f.checks for f in report.files[1:]]
+
+    (root / "nested" / "extra.json").write_bytes((EXAMPLES_DIR / "nielsen.json").read_bytes())
+    third = run(root, cache_path=cache, workers=1)
+    assert [f.cached for f in third.files] == [False, True]
+    assert third.passed
+
+
+def test_run_in_process_pool(tmp_path):
+    root = _tree(tmp_path)
+    parallel = run(root, workers=2)
+    serial = run(root, workers=1)
+    assert parallel.model_dump() == serial.model_dump()
+
+
+def test_schema_artifact(tmp_path):
+    schema = SessionPlan.model_json_schema()
+    schema["$id"] = "https://example.org/schema.json"
+    schema["title"] = "OSTI SessionPlan"
+    artifact = tmp_path / "osti.schema.json"
+    artifact.write_text(json.dumps(schema), encoding="utf-8")
+    assert check_schema_artifact(artifact).passed
+
+    schema["properties"].pop("drills")
+    artifact.write_text(json.dumps(schema), encoding="utf-8")
+    stale = check_schema_artifact(artifact)
+    assert not stale.passed
+    assert "properties.drills: missing from artifact" in stale.details
+
+
+def test_reports(tmp_path):
+    root = _tree(tmp_path)
+    report = run(root, workers=1)
+    suite = ElementTree.fromstring(to_junit(report))
+    assert suite.get("tests") == "6"
+    assert suite.get("failures") == "3"
+    failed = {(c.get("classname"), c.get("name")) for c in suite if c.find("failure") is not None}
+    assert failed == {
+        ("nested/broken.json", "validate"),
+        ("nested/broken.json", "round_trip"),
+        ("nested/extra.json", "round_trip"),
+    }
+
+    junit, out = tmp_path / "report.xml", tmp_path / "report.json"
+    assert main([str(root), "--workers", "1", "--junit", str(junit), "--json", str(out)]) == 1
+    assert ElementTree.parse(junit).getroot().tag == "testsuite"
+    assert len(json.loads(out.read_text(encoding="utf-8"))["files"]) == 3
+    assert main([str(EXAMPLES_DIR), "--workers", "1"]) == 0
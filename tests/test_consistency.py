@@ -0,0 +1,76 @@
+"""Tests for the bulk geometric consistency checker."""
+
+import json
+from pathlib import Path
+
+from osti import (
+    DiagramInfo,
+    DrillBlock,
+    EquipmentObject,
+    EquipmentType,
+    MovementArrow,
+    PitchZone,
+    PlayerPosition,
+    SessionPlan,
+)
+from osti.consistency import check_diagrams, check_drills, fix_diagram, fix_drill
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _broken():
+    return DiagramInfo(
+        player_positions=[
+            PlayerPosition(label="A1", x=10, y=10),
+            PlayerPosition(label="A2", x=105, y=50),
+        ],
+        arrows=[
+            MovementArrow(start_x=11, start_y=12, end_x=60, end_y=60, from_label="A", to_label="Z"),
+        ],
+        zones=[PitchZone(x1=80, y1=0, x2=20, y2=50)],
+        equipment=[EquipmentObject(equipment_type=EquipmentType.GATE, x=5, y=5, x2=15)],
+    )
+
+
+def test_example_is_consistent():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    report = check_drills(SessionPlan.model_validate(data).drills)
+    assert report.diagrams == 3
+    assert report.issues == []
+
+
+def test_all_issue_codes_found():
+    report = check_diagrams([DiagramInfo(), _broken()], keys=["ok", "bad"])
+    assert report.counts() == {
+        "out_of_range": 1,
+        "dangling_label": 2,
+        "inverted_zone": 1,
+        "partial_gate": 1,
+    }
+    assert report.affected() == {"bad"}
+    paths = {i.path for i in report.issues}
+    assert {"player_positions[1].x", "arrows[0].from_label", "arrows[0].to_label"} <= paths
+    assert report.summary().startswith("2 diagram(s) checked, 1 with issues")
+
+
+def test_fix_diagram_repairs_copy():
+    broken = _broken()
+    fixed = fix_diagram(broken)
+    assert check_diagrams([fixed]).issues == []
+    assert fixed.player_positions[1].x == 100
+    assert (fixed.zones[0].x1, fixed.zones[0].x2) == (20, 80)
+    assert fixed.arrows[0].from_label == "A1"  # snapped: start is next to A1
+    assert fixed.arrows[0].to_label is None  # nothing within snap distance
+    assert fixed.equipment[0].x2 is None
+    assert broken.player_positions[1].x == 105
+
+
+def test_fix_options_are_selective():
+    fixed = fix_diagram(_broken(), clamp=False, snap_labels=False)
+    assert check_diagrams([fixed]).counts() == {"out_of_range": 1, "dangling_label": 2}
+
+
+def test_fix_drill_keys_by_id():
+    drill = DrillBlock(name="D", diagram=_broken())
+    assert check_drills([drill]).affected() == {str(drill.id)}
+    assert check_drills([fix_drill(drill, snap_distance=100)]).issues == []
@@ -0,0 +1,85 @@
+"""Tests for arrow sequence graphs and play-pattern analytics."""
+
+import json
+from pathlib import Path
+
+from osti import ArrowType, DiagramInfo, MovementArrow, PlayerPosition, SessionPlan
+from osti.graph import ArrowGraph, PatternIndex, drill_signature
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _arrow(src, dst, kind, seq=None):
+    return MovementArrow(
+        start_x=0, start_y=0, end_x=1, end_y=1,
+        from_label=src, to_label=dst, arrow_type=kind, sequence_number=seq,
+    )
+
+
+def _third_man_diagram():
+    """A plays B, C runs, B lays off to C, C shoots."""
+    return DiagramInfo(
+        player_positions=[PlayerPosition(label=p, x=50, y=50) for p in "ABC"],
+        arrows=[
+            _arrow("B", "C", ArrowType.PASS, 3),
+            _arrow("A", "B", ArrowType.PASS, 1),
+            _arrow("C", "C", ArrowType.RUN, 2),
+            _arrow("C", None, ArrowType.SHOT, 4),
+        ],
+    )
+
+
+def test_edges_in_sequence_order_and_adjacency():
+    graph = ArrowGraph(_third_man_diagram())
+    assert [e.sequence for e in graph.edges] == [1, 2, 3, 4]
+    assert graph.successors("A") == ["B"]
+    assert graph.predecessors("C") == ["C", "B"]
+    assert graph.involvement() == {"A": 1, "B": 2, "C": 3}
+
+
+def test_pass_chain_and_third_man():
+    graph = ArrowGraph(_third_man_diagram())
+    chains = graph.pass_chains()
+    assert len(chains) == 1
+    assert [e.arrow_type for e in chains[0]] == [ArrowType.PASS, ArrowType.PASS, ArrowType.SHOT]
+    assert graph.third_man() == [("A", "B", "C")]
+
+
+def test_no_third_man_without_run():
+    diagram = _third_man_diagram()
+    diagram.arrows = [a for a in diagram.arrows if a.arrow_type is not ArrowType.RUN]
+    assert ArrowGraph(diagram).third_man() == []
+
+
+def test_signature_patterns_and_shapes():
+    sig = drill_signature(_third_man_diagram())
+    assert sig.patterns == ["pass>pass", "pass>shot", "pass>pass>shot"]
+    assert sig.shapes == ["a>b>c>goal"]
+    assert (sig.third_man, sig.ball_arrows, sig.runs) == (1, 3, 1)
+
+
+def test_one_two_shape():
+    diagram = DiagramInfo(arrows=[_arrow("A", "B", ArrowType.PASS, 1), _arrow("B", "A", ArrowType.PASS, 2)])
+    assert drill_signature(diagram).shapes == ["a>b>a"]
+
+
+def test_pattern_index_add_remove():
+    index = PatternIndex()
+    index.add("d1", drill_signature(_third_man_diagram()))
+    index.add("d2", drill_signature(_third_man_diagram()))
+    assert index.most_common(1)[0][1] == 2
+    assert index.drills_with("pass>shot") == {"d1", "d2"}
+    assert index.third_man_drills == {"d1", "d2"}
+    index.remove("d1")
+    assert index.drills_with("pass>shot") == {"d2"}
+    index.add("d2", drill_signature(DiagramInfo()))
+    assert index.most_common() == []
+    assert len(index) == 1
+
+
+def test_example_drills_build_graphs():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    plan = SessionPlan.model_validate(data)
+    index = PatternIndex()
+    index.update((d.name, drill_signature(d.diagram)) for d in plan.drills)
+    assert len(index) == 3
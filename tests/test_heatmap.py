@@ -0,0 +1,90 @@
+"""Tests for pitch occupancy heatmaps."""
+
+import pytest
+
+from osti import (
+    ArrowType,
+    BallPosition,
+    DiagramInfo,
+    DrillBlock,
+    MovementArrow,
+    PlayerPosition,
+    SessionMetadata,
+    SessionPlan,
+    Source,
+)
+from osti.heatmap import OccupancyGrid, iter_diagrams, merge_occupancy, occupancy
+from osti.tactical import GameElement, TacticalContext
+
+
+def _diagram():
+    return DiagramInfo(
+        player_positions=[
+            PlayerPosition(label="GK", x=50, y=95, role="goalkeeper"),
+            PlayerPosition(label="A1", x=5, y=5, role="attacker"),
+            PlayerPosition(label="A2", x=100, y=100, role="attacker"),
+            PlayerPosition(label="X", x=120, y=50),
+        ],
+        balls=[BallPosition(x=50, y=50)],
+        arrows=[
+            MovementArrow(start_x=5, start_y=5, end_x=50, end_y=95, arrow_type=ArrowType.PASS),
+        ],
+    )
+
+
+def test_grid_binning_and_edges():
+    grid = OccupancyGrid(nx=2, ny=2)
+    grid.add_points([0, 49.9, 50, 100, -1], [0, 0, 50, 100, 0])
+    assert grid.rows() == [[2, 0], [0, 2]]
+    assert grid.dropped == 1
+    assert grid.total == 4
+    assert sum(grid.normalized()) == pytest.approx(1.0)
+
+
+def test_occupancy_grouped_by_role():
+    grids = occupancy([_diagram(), _diagram()], group_by="role", bins=(4, 4))
+    assert grids["goalkeeper"].cell(2, 3) == 2
+    assert grids["attacker"].cell(0, 0) == 2
+    assert grids["attacker"].cell(3, 3) == 2
+    assert grids[None].dropped == 2
+
+
+def test_arrow_layers_grouped_by_type():
+    grids = occupancy([_diagram()], layer="arrow_ends", group_by="arrow_type", bins=(4, 4))
+    assert list(grids) == ["pass"]
+    assert grids["pass"].cell(2, 3) == 1
+
+
+def test_merge_partials_matches_single_pass():
+    whole = occupancy([_diagram()] * 3, layer="balls")
+    parts = merge_occupancy(occupancy([_diagram()], layer="balls"), occupancy([_diagram()] * 2, layer="balls"))
+    assert parts[None].counts == whole[None].counts
+    with pytest.raises(ValueError):
+        OccupancyGrid(nx=2, ny=2).merge(OccupancyGrid(nx=3, ny=2))
+
+
+def test_invalid_layer_rejected():
+    with pytest.raises(ValueError):
+        occupancy([], layer="coaches")
+
+
+def test_group_by_must_fit_layer():
+    with pytest.raises(ValueError, match="cannot be grouped by 'arrow_type'"):
+        occupancy([_diagram()], layer="players", group_by="arrow_type")
+    with pytest.raises(ValueError):
+        occupancy([], layer="balls", group_by="color")
+    assert occupancy([_diagram()], layer="equipment", group_by="equipment_type") is not None
+
+
+def test_iter_diagrams_filters_by_game_element():
+    pressing = DrillBlock(
+        name="P", diagram=_diagram(), tactical_context=TacticalContext(game_element=GameElement.PRESSING)
+    )
+    plan = SessionPlan(
+        metadata=SessionMetadata(category="Defending"),
+        source=Source(filename="a.pdf"),
+        drills=[pressing, DrillBlock(name="Other")],
+    )
+    assert len(list(iter_diagrams([plan], game_element=GameElement.PRESSING))) == 1
+    assert len(list(iter_diagrams([plan], category="Defending"))) == 2
+    assert list(iter_diagrams([plan], category="Attacking")) == []
@@ -0,0 +1,117 @@
+"""Tests for opt-in validation/serialization instrumentation."""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from osti import SessionPlan
+from osti import instrumentation as inst
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.fixture(autouse=True)
+def clean_recorder():
+    inst.disable()
+    inst.reset()
+    yield
+    inst.disable()
+    inst.reset()
+
+
+def _example_text():
+    return (EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8")
+
+
+def test_disabled_records_nothing():
+    plan = inst.validate(_example_text())
+    inst.dump_json(plan)
+    assert isinstance(plan, SessionPlan)
+    assert inst.snapshot() == []
+
+
+def test_enabled_records_counts_and_bytes():
+    text = _example_text()
+    with inst.instrumented():
+        plan = inst.validate(text)
+        inst.validate(json.loads(text))
+        out = inst.dump_json(plan)
+        stats = {(s.model, s.operation): s for s in inst.snapshot()}
+    validate = stats[("SessionPlan", "validate")]
+    assert validate.count == 2
+    assert validate.payload_bytes == len(text.encode("utf-8"))
+    assert sum(validate.buckets) == 2
+    assert stats[("SessionPlan", "serialize")].payload_bytes == len(out)
+    assert not inst.is_enabled()
+    assert inst.snapshot() == []  # flushed on exit
+
+
+def test_profile_attributes_nested_models():
+    inst.profile(_example_text())
+    stats = {s.model: s for s in inst.snapshot()}
+    assert stats["SessionPlan"].count == 1
+    assert stats["DrillBlock"].count == 3
+    assert stats["DiagramInfo"].count == 3
+    assert stats["PlayerPosition"].count == 22
+    assert stats["SessionPlan"].self_seconds <= stats["SessionPlan"].seconds
+
+
+def test_sinks(tmp_path, caplog):
+    seen = []
+    prom = tmp_path / "osti.prom"
+    with caplog.at_level(logging.INFO, logger="osti.instrumentation"):
+        with inst.instrumented(
+            inst.LoggingSink(),
+            inst.PrometheusTextSink(prom),
+            inst.CallbackSink(lambda name, value, attrs: seen.append((name, attrs["model"]))),
+        ):
+            inst.validate(_example_text())
+    text = prom.read_text(encoding="utf-8")
+    assert 'osti_calls_total{model="SessionPlan",operation="validate"} 1' in text
+    assert 'le="+Inf"} 1' in text
+    assert ("osti.calls", "SessionPlan") in seen
+    assert "validate SessionPlan: count=1" in caplog.text
+
+
+def test_prometheus_counters_are_cumulative(tmp_path):
+    prom = tmp_path / "osti.prom"
+    seen = []
+    inst.enable(inst.PrometheusTextSink(prom), inst.CallbackSink(lambda n, v, a: seen.append((n, v))))
+    inst.validate(_example_text())
+    inst.flush()
+    inst.validate(_example_text())
+    inst.flush()
+    text = prom.read_text(encoding="utf-8")
+    assert 'osti_calls_total{model="SessionPlan",operation="validate"} 2' in text
+    assert 'osti_duration_seconds_count{model="SessionPlan",operation="validate"} 2' in text
+    assert ("osti.calls", 1) in seen and ("osti.calls", 2) not in seen
+    assert [n for n, _ in seen if n.startswith("osti.duration")] == ["osti.duration.total"] * 2
+    assert [p.name for p in tmp_path.iterdir()] == ["osti.prom"]
+
+    inst.flush()  # idle flush keeps the series
+    assert 'osti_calls_total{model="SessionPlan",operation="validate"} 2' in prom.read_text(
+        encoding="utf-8"
+    )
+    inst.reset()
+    inst.flush()
+    assert "osti_calls_total{" not in prom.read_text(encoding="utf-8")
+
+
+def test_prometheus_concurrent_writers(tmp_path):
+    prom = tmp_path / "osti.prom"
+    stats = [inst.ModelStats(model="SessionPlan", operation="validate", count=1)]
+    sinks = [inst.PrometheusTextSink(prom) for _ in range(8)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda sink: sink.emit(stats), sinks * 4))
+    assert [p.name for p in tmp_path.iterdir()] == ["osti.prom"]
+    assert "osti_calls_total" in prom.read_text(encoding="utf-8")
+
+
+def test_cli_report(capsys):
+    assert inst.main([str(EXAMPLES_DIR), "--top", "3"]) == 0
+    out = capsys.readouterr().out
+    assert "Profiled 1 plan(s)" in out
+    assert len(out.strip().splitlines()) == 5
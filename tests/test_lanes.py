@@ -0,0 +1,99 @@
+"""Tests for lane and third classification."""
+
+import json
+from pathlib import Path
+
+from osti import (
+    BallPosition,
+    DiagramInfo,
+    DrillBlock,
+    MovementArrow,
+    PitchView,
+    PitchViewType,
+    PlayerPosition,
+    SessionMetadata,
+    SessionPlan,
+    Source,
+)
+from osti.lanes import (
+    PitchThird,
+    classify_corpus,
+    classify_diagram,
+    enrich_plans,
+    lane_of,
+    suggest_tactical_context,
+    third_of,
+)
+from osti.tactical import GameElement, LaneName, TacticalContext
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+FULL = PitchView(view_type=PitchViewType.FULL_PITCH)
+HORIZONTAL = PitchView(view_type=PitchViewType.FULL_PITCH, orientation="horizontal")
+
+
+def test_vertical_lanes_left_to_right():
+    lanes = [lane_of(x, 50, FULL) for x in (5, 30, 50, 70, 95)]
+    assert lanes == [
+        LaneName.LEFT_WING,
+        LaneName.LEFT_HALF_SPACE,
+        LaneName.CENTRAL_CORRIDOR,
+        LaneName.RIGHT_HALF_SPACE,
+        LaneName.RIGHT_WING,
+    ]
+    assert [third_of(50, y, FULL) for y in (10, 50, 90)] == list(PitchThird)
+
+
+def test_horizontal_orientation_swaps_axes():
+    assert lane_of(50, 95, HORIZONTAL) == LaneName.LEFT_WING
+    assert lane_of(50, 5, HORIZONTAL) == LaneName.RIGHT_WING
+    assert third_of(90, 50, HORIZONTAL) == PitchThird.ATTACKING
+
+
+def test_half_pitch_maps_to_attacking_half():
+    half = PitchView(view_type=PitchViewType.HALF_PITCH)
+    assert third_of(50, 10, half) == PitchThird.MIDDLE
+    assert third_of(50, 80, half) == PitchThird.ATTACKING
+
+
+def test_classify_diagram_covers_all_entities():
+    diagram = DiagramInfo(
+        pitch_view=FULL,
+        player_positions=[PlayerPosition(label="A", x=10, y=10)],
+        balls=[BallPosition(x=50, y=50)],
+        arrows=[MovementArrow(start_x=10, start_y=10, end_x=90, end_y=90, from_label="A")],
+    )
+    zones = classify_diagram(diagram)
+    assert [z.kind for z in zones] == ["player", "ball", "arrow_start", "arrow_end"]
+    assert zones[3].lane == LaneName.RIGHT_WING
+    assert zones[2].label == "A"
+    assert classify_corpus([diagram, diagram]) == [zones, zones]
+
+
+def test_suggest_tactical_context_keeps_base_fields():
+    diagram = DiagramInfo(player_positions=[PlayerPosition(label="A", x=50, y=50)])
+    base = TacticalContext(game_element=GameElement.PRESSING, lanes=[LaneName.LEFT_WING])
+    ctx = suggest_tactical_context(diagram, base)
+    assert ctx.lanes == [LaneName.CENTRAL_CORRIDOR]
+    assert ctx.game_element == GameElement.PRESSING
+    assert base.lanes == [LaneName.LEFT_WING]
+
+
+def test_enrich_plans_fills_empty_lanes_only():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    plan = SessionPlan.model_validate(data)
+    manual = DrillBlock(
+        name="Manual",
+        diagram=DiagramInfo(player_positions=[PlayerPosition(label="A", x=5, y=5)]),
+        tactical_context=TacticalContext(lanes=[LaneName.RIGHT_WING]),
+    )
+    other = SessionPlan(metadata=SessionMetadata(), source=Source(filename="a.pdf"), drills=[manual])
+    hand_labelled = [d.tactical_context.lanes for d in plan.drills[1:]]
+    assert enrich_plans([plan, other]) == 1
+    assert plan.drills[0].tactical_context.lanes
+    assert manual.tactical_context.lanes == [LaneName.RIGHT_WING]
+    # Derived lanes agree with the lanes the example was annotated with.
+    assert enrich_plans([plan], overwrite=True) == 3
+    assert [sorted(d.tactical_context.lanes) for d in plan.drills[1:]] == [
+        sorted(lanes) for lanes in hand_labelled
+    ]
@@ -0,0 +1,105 @@
+"""Tests for training load estimates and rollups."""
+
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from osti.load import LoadLedger, LoadTotals, drill_load, session_load
+from osti.session_plan import SessionPlan
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.fixture(scope="module")
+def plan():
+    text = (EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8")
+    return SessionPlan.model_validate_json(text)
+
+
+def _dated(plan: SessionPlan, day: str) -> SessionPlan:
+    metadata = plan.metadata.model_copy(update={"date": day})
+    return plan.model_copy(update={"id": uuid4(), "metadata": metadata})
+
+
+def test_drill_load(plan):
+    technical, game, phase = (drill_load(d) for d in plan.drills)
+    assert technical.minutes == 15.0 and phase.minutes == 20.0
+    assert technical.players == 2  # the coach is not counted
+    assert phase.players == 13
+    assert technical.intensity < game.intensity < phase.intensity
+    assert phase.load == pytest.approx(phase.minutes * phase.intensity)
+    assert drill_load(plan.drills[0], minutes=30.0).minutes == 30.0
+
+
+def test_session_load_scales_to_duration(plan):
+    load = session_load(plan)
+    assert load.day is None
+    assert load.minutes == 55.0
+    assert len(load.drills) == 3
+
+    metadata = plan.metadata.model_copy(update={"duration_minutes": 110, "date": "2026-03-04"})
+    doubled = session_load(plan.model_copy(update={"metadata": metadata}))
+    assert doubled.day == date(2026, 3, 4)
+    assert doubled.minutes == pytest.approx(110.0)
+    assert doubled.load == pytest.approx(2 * load.load, rel=1e-3)
+
+
+def test_ledger_rollups(plan):
+    ledger = LoadLedger(cycle_days=7, cycle_start=date(2026, 3, 2))
+    monday, wednesday, next_week = (
+        _dated(plan, "2026-03-02"),
+        _dated(plan, "2026-03-04"),
+        _dated(plan, "2026-03-10"),
+    )
+    ledger.upsert_many([monday, wednesday, next_week])
+    single = session_load(monday).load
+
+    assert list(ledger.daily()) == [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 10)]
+    assert ledger.weekly()[(2026, 10)].sessions == 2
+    assert ledger.weekly()[(2026, 10)].load == pytest.approx(2 * single)
+    assert list(ledger.cycles()) == [date(2026, 3, 2), date(2026, 3, 9)]
+    assert list(ledger.daily(start=date(2026, 3, 3), end=date(2026, 3, 9))) == [date(2026, 3, 4)]
+
+
+def test_ledger_is_incremental(plan):
+    ledger = LoadLedger()
+    session = _dated(plan, "2026-03-02")
+    ledger.upsert(session)
+    ledger.upsert(session)
+    assert ledger.recomputed == 1
+
+    moved = session.model_copy(
+        update={"metadata": session.metadata.model_copy(update={"date": "2026-03-20"})}
+    )
+    ledger.upsert(moved)
+    assert ledger.recomputed == 2
+    assert len(ledger) == 1
+    assert list(ledger.daily()) == [date(2026, 3, 20)]
+
+    assert ledger.remove(session.id)
+    assert not ledger.remove(session.id)
+    assert ledger.daily() == {} and ledger.weekly() == {} and ledger.cycles() == {}
+
+
+def test_undated_sessions_stay_out_of_rollups(plan):
+    ledger = LoadLedger()
+    ledger.upsert(plan)
+    assert plan.id in ledger
+    assert ledger.session(plan.id).day is None
+    assert ledger.daily() == {}
+    ledger.upsert(plan, day=date(2026, 1, 1))
+    assert ledger.daily()[date(2026, 1, 1)].sessions == 1
+
+
+@pytest.mark.parametrize("text", ["2023/24", "Spring 2024", "March 2024", "2024"])
+def test_coarse_dates_stay_undated(plan, text):
+    assert session_load(_dated(plan, text)).day is None
+
+
+def test_load_totals():
+    a = LoadTotals(1, 10.0, 50.0, 100.0)
+    assert a + a - a == a
+    with pytest.raises(ValueError):
+        LoadLedger(cycle_days=0)
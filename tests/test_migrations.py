@@ -0,0 +1,77 @@
+"""Tests for schema version migrations."""
+
+import json
+
+import pytest
+
+from osti import SCHEMA_VERSION, SessionPlan
+from osti import migrations
+from osti.migrations import (
+    MigrationError,
+    detect_version,
+    migrate,
+    migrate_json,
+    migration_path,
+    register_migration,
+    upgrade_jsonl,
+)
+
+
+@pytest.fixture
+def registry():
+    """Restore the migration registry after a test registers extra steps."""
+    saved = dict(migrations._MIGRATIONS)
+    yield
+    migrations._MIGRATIONS.clear()
+    migrations._MIGRATIONS.update(saved)
+    migrations._compose.cache_clear()
+
+
+def _raw_plan(**extra):
+    return {"metadata": {"title": "Old"}, "source": {"filename": "a.pdf"}, **extra}
+
+
+def test_builtin_path_reaches_current_version():
+    assert migration_path("0.1.0") == ["0.1.0", "0.1.1", SCHEMA_VERSION]
+
+
+def test_old_plan_migrates_and_validates():
+    data = migrate(_raw_plan(), from_version="0.1.0")
+    plan = SessionPlan.model_validate(data)
+    assert plan.metadata.title == "Old"
+
+
+def test_detect_version_uses_key_then_default():
+    assert detect_version({"schema_version": "0.1.1"}) == "0.1.1"
+    assert detect_version({}, default="0.1.0") == "0.1.0"
+
+
+def test_registered_steps_are_chained(registry):
+    register_migration(SCHEMA_VERSION, "9.0.0", lambda d: {**d, "a": 1})
+    register_migration("9.0.0", "9.1.0", lambda d: {**d, "b": d["a"] + 1})
+    data = migrate(_raw_plan(schema_version="0.1.0"), "9.1.0")
+    assert data["a"] == 1 and data["b"] == 2
+    assert data["schema_version"] == "9.1.0"
+
+
+def test_missing_path_raises():
+    with pytest.raises(MigrationError):
+        migration_path("0.0.1")
+    with pytest.raises(MigrationError):
+        register_migration("0.2.0", "0.1.0", lambda d: d)
+
+
+def test_migrate_json_accepts_text():
+    out = migrate_json(json.dumps(_raw_plan()), from_version="0.1.1")
+    assert json.loads(out)["metadata"]["title"] == "Old"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_upgrade_jsonl(tmp_path, workers):
+    src = tmp_path / "in.jsonl"
+    dst = tmp_path / "out.jsonl"
+    lines = [json.dumps(_raw_plan(schema_version="0.1.0")) for _ in range(5)]
+    src.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    assert upgrade_jsonl(src, dst, workers=workers, chunksize=2) == 5
+    out = [json.loads(line) for line in dst.read_text(encoding="utf-8").splitlines()]
+    assert [d["schema_version"] for d in out] == [SCHEMA_VERSION] * 5
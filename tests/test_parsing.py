@@ -0,0 +1,93 @@
+"""Tests for the free-text field parsers."""
+
+from datetime import date
+
+import pytest
+
+from osti.parsing import (
+    AreaDimensions,
+    DateRange,
+    parse_area,
+    parse_batch,
+    parse_player_count,
+    parse_session_date,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "total", "roles"),
+    [
+        ("1 GK + 6 field players", 7, {"goalkeeper": 1, "field": 6}),
+        ("1 GK + 1 Coach + 1 Server (GK)", 3, {"goalkeeper": 1, "coach": 1, "server": 1}),
+        ("4v4+3", 11, {"team_a": 4, "team_b": 4, "neutral": 3}),
+        ("6 attackers, 4 defenders and 2 GKs", 12, {"attacker": 6, "defender": 4, "goalkeeper": 2}),
+        ("3 teams of 4", 12, {"field": 12}),
+        ("2 groups of 6", 12, {"field": 12}),
+        ("2 sides of 7 + 2 GK", 16, {"field": 14, "goalkeeper": 2}),
+        ("3v2 + GK", 6, {"team_a": 3, "team_b": 2, "goalkeeper": 1}),
+        ("GK + 6 players", 7, {"goalkeeper": 1, "field": 6}),
+    ],
+)
+def test_player_count(text, total, roles):
+    count = parse_player_count(text)
+    assert count.minimum == count.maximum == total
+    assert count.by_role() == roles
+
+
+def test_player_count_range_and_unparseable():
+    count = parse_player_count("12-16 players")
+    assert (count.minimum, count.maximum) == (12, 16)
+    assert parse_player_count("Full squad") == (None, None, ())
+    assert parse_player_count("5 x 5 + 2 GK") == (None, None, ())
+    assert parse_player_count("Spring 2024 session 3") == (None, None, ())
+    assert parse_player_count("players + GK") == (None, None, ())
+    assert parse_player_count(None).roles == ()
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("20x15 yards", AreaDimensions(18.29, 13.72, "yd")),
+        ("15 m by 30 m", AreaDimensions(30.0, 15.0, "m")),
+        ("40x30", AreaDimensions(40.0, 30.0, None)),
+        ("Half pitch", AreaDimensions(68.0, 52.5, "m")),
+        ("somewhere", None),
+    ],
+)
+def test_area(text, expected):
+    assert parse_area(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "start", "end"),
+    [
+        ("2023", date(2023, 1, 1), date(2023, 12, 31)),
+        ("2023/24", date(2023, 7, 1), date(2024, 6, 30)),
+        ("1999/00", date(1999, 7, 1), date(2000, 6, 30)),
+        ("1999/2000", date(1999, 7, 1), date(2000, 6, 30)),
+        ("Spring 2024", date(2024, 3, 1), date(2024, 5, 31)),
+        ("Winter 2023", date(2023, 12, 1), date(2024, 2, 29)),
+        ("Sept. 2023", date(2023, 9, 1), date(2023, 9, 30)),
+        ("2024-03-15", date(2024, 3, 15), date(2024, 3, 15)),
+        ("15.03.2024", date(2024, 3, 15), date(2024, 3, 15)),
+    ],
+)
+def test_session_date(text, start, end):
+    assert parse_session_date(text) == DateRange(start, end)
+
+
+def test_session_date_invalid_and_containment():
+    assert parse_session_date("31.02.2024") is None
+    assert parse_session_date("TBD") is None
+    assert date(2024, 1, 1) in parse_session_date("2023/24")
+
+
+def test_results_are_memoized_and_batched():
+    parse_area.cache_clear()
+    values = ["20x15 yards", "20x15 yards", None, "20x15 yards"]
+    out = parse_batch(parse_area, values)
+    assert out[0] is out[1] is out[3]
+    assert out[2] is None
+    assert parse_area.cache_info().misses == 2
+    parse_area("20x15 yards")
+    assert parse_area.cache_info().hits == 1
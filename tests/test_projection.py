@@ -0,0 +1,56 @@
+"""Tests for projection-based partial loading."""
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from osti import DrillBlock, SessionPlan, TacticalContext
+from osti.projection import load_projection, projection_model
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _example_text():
+    return (EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8")
+
+
+def test_projection_holds_only_requested_fields():
+    partial = load_projection(_example_text(), ["metadata.title", "drills[*].tactical_context"])
+    assert set(type(partial).model_fields) == {"metadata", "drills"}
+    assert set(type(partial.metadata).model_fields) == {"title"}
+    assert set(type(partial.drills[0]).model_fields) == {"tactical_context"}
+    assert partial.metadata.title.startswith("Adv. Nat. GK Diploma")
+    assert isinstance(partial.drills[2].tactical_context, TacticalContext)
+
+
+def test_projection_matches_full_model():
+    text = _example_text()
+    full = SessionPlan.model_validate_json(text)
+    partial = load_projection(json.loads(text), ["drills[*].diagram.arrows", "source"])
+    assert partial.source == full.source
+    for p, f in zip(partial.drills, full.drills):
+        assert p.diagram.arrows == f.diagram.arrows
+
+
+def test_whole_subtree_wins_over_nested_path():
+    model = projection_model(["drills[*].name", "drills"])
+    assert model.model_fields["drills"].annotation == list[DrillBlock]
+
+
+def test_models_are_cached_and_paths_checked():
+    assert projection_model(["metadata.title"]) is projection_model(["metadata.title"])
+    with pytest.raises(ValueError):
+        projection_model(["metadata.nope"])
+    with pytest.raises(ValueError):
+        projection_model([])
+
+
+def test_projected_fields_are_still_validated():
+    data = json.loads(_example_text())
+    data["drills"][0]["tactical_context"]["game_element"] = "Tiki-Taka"
+    data["drills"][1]["diagram"]["arrows"] = "garbage"
+    with pytest.raises(ValidationError):
+        load_projection(data, ["drills[*].tactical_context"])
+    load_projection(data, ["metadata"])  # unprojected garbage is skipped
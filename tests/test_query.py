@@ -0,0 +1,158 @@
+"""Tests for the declarative corpus query engine."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from osti import DrillBlock, SessionPlan
+from osti.query import Predicate, Query, extract, field, parse_path, resolve_path
+from osti.tactical import GameElement, LaneName
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _example():
+    return json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+
+
+def test_parse_and_resolve_paths():
+    assert parse_path("drills[*].diagram.arrows") == ("drills", "*", "diagram", "arrows")
+    segments = parse_path("drills[*].tactical_context.lanes[*]")
+    assert resolve_path(SessionPlan, segments) is LaneName
+    with pytest.raises(ValueError):
+        Query(field("drills.name") == "x")
+    with pytest.raises(ValueError):
+        Query(field("metadata.nope") == "x")
+
+
+def test_extract_fans_out():
+    data = {"a": [{"b": 1}, {"b": 2}, {}]}
+    assert extract(data, parse_path("a[*].b")) == [1, 2]
+
+
+def test_drill_scope_correlates_predicates():
+    q = Query(
+        (field("tactical_context.game_element") == GameElement.ORGANIZED_DEFENSE)
+        & (field("diagram.player_positions").length() > 6),
+        scope="drills",
+    )
+    matches = list(q.run([_example()]))
+    assert [(m.index, m.value.name) for m in matches] == [(2, _example()["drills"][2]["name"])]
+    assert isinstance(matches[0].value, DrillBlock)
+
+
+def test_operands_validated_with_field_type():
+    q = Query(field("tactical_context.game_element").isin(["Organized Defense"]), scope="drills")
+    assert len(list(q.run([_example()]))) == 1
+    q = Query(field("tactical_context.lanes[*]") == "left_half_space", scope="drills")
+    assert [m.index for m in q.run([_example()])] == [1, 2]
+    with pytest.raises(ValueError):
+        Query(field("tactical_context.game_element") == "Tiki-Taka", scope="drills")
+
+
+def test_plan_scope_with_or_and_not():
+    q = Query(
+        (field("metadata.category").contains("Goalkeeping") & ~field("metadata.date").exists())
+        | (field("drills[*].drill_type") == "Rondo")
+    )
+    assert len(list(q.run([_example()]))) == 1
+    assert list(Query(~field("metadata.title").exists()).run([_example()])) == []
+
+
+def _omitted():
+    """The example with defaulted keys left out of the JSON."""
+    data = _example()
+    data["metadata"].pop("category", None)
+    for drill in data["drills"]:
+        drill.pop("directional", None)
+        drill["diagram"].pop("player_positions", None)
+        drill["diagram"].pop("description", None)
+        drill["diagram"]["pitch_view"] = {}
+    del data["drills"][0]["diagram"]
+    return data
+
+
+@pytest.mark.parametrize(
+    "where, expected",
+    [
+        (field("diagram.player_positions").length() < 3, lambda d: len(d.diagram.player_positions) < 3),
+        (field("diagram.player_positions").length() == 0, lambda d: not d.diagram.player_positions),
+        (
+            field("diagram.pitch_view.orientation") == "vertical",
+            lambda d: d.diagram.pitch_view is not None and d.diagram.pitch_view.orientation == "vertical",
+        ),
+        (field("directional") == None, lambda d: d.directional is None),  # noqa: E711
+        (field("diagram.description") == "", lambda d: d.diagram.description == ""),
+        (field("diagram.description") != "x", lambda d: d.diagram.description != "x"),
+        (field("diagram.description").exists(), lambda d: d.diagram.description is not None),
+    ],
+)
+def test_omitted_fields_take_defaults(where, expected):
+    data = _omitted()
+    plan = SessionPlan.model_validate(data)
+    wanted = [i for i, d in enumerate(plan.drills) if expected(d)]
+    assert wanted
+    q = Query(where, scope="drills")
+    assert [m.index for m in q.run([data])] == wanted
+    assert [m.index for m in q.run([json.dumps(data)])] == wanted
+
+
+def test_omitted_plan_fields_take_defaults():
+    data = _omitted()
+    assert len(list(Query(field("metadata.category") != "x").run([data]))) == 1
+    assert len(list(Query(field("metadata.category") == None).run([data]))) == 1  # noqa: E711
+    assert list(Query(field("metadata.category").exists()).run([data])) == []
+
+
+def test_text_prefilter_skips_parsing():
+    q = Query(field("drills[*].drill_type") == "Phase of Play")
+    text = json.dumps(_example())
+    assert q.might_match(text)
+    assert not q.might_match(text.replace("Phase of Play", "Rondo"))
+    assert len(list(q.run([text, "not json at all"]))) == 1
+
+
+def test_text_prefilter_keeps_escaped_documents():
+    data = _example()
+    data["metadata"]["title"] = "A/B"
+    text = json.dumps(data).replace('"A/B"', '"A\\/B"')
+    assert json.loads(text)["metadata"]["title"] == "A/B"
+    q = Query(field("metadata.title") == "A/B")
+    assert q.might_match(text)
+    assert len(list(q.run([text]))) == 1
+
+    data["metadata"]["title"] = "Åbo"
+    q = Query(field("metadata.title") == "Åbo")
+    assert len(list(q.run([json.dumps(data), json.dumps(data, ensure_ascii=False)]))) == 2
+
+
+def test_malformed_documents_are_skipped(tmp_path):
+    q = Query(field("metadata.title").exists())
+    assert list(q.run(["not json"])) == []
+    line = json.dumps(_example())
+    (tmp_path / "plans.jsonl").write_text(f"{line}\n{{broken\n{line}\n", encoding="utf-8")
+    matches = q.run_file(tmp_path / "plans.jsonl")
+    assert [m.source.rsplit("#", 1)[1] for m in matches] == ["0", "2"]
+
+
+def test_predicate_is_abstract():
+    with pytest.raises(TypeError):
+        Predicate()
+
+
+def test_invalid_matches_are_not_materialized():
+    bad = _example()
+    bad["drills"][2]["diagram"]["arrows"].append({"arrow_type": "pass"})
+    q = Query(field("drills[*].drill_type") == "Phase of Play")
+    assert list(q.run([bad])) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_files(tmp_path, workers):
+    line = json.dumps(_example())
+    (tmp_path / "a.jsonl").write_text(f"{line}\n\n{line}\n", encoding="utf-8")
+    (tmp_path / "b.json").write_text(line, encoding="utf-8")
+    q = Query(field("tactical_context.numerical_advantage") == "4v4+3", scope="drills")
+    matches = q.run_files(sorted(tmp_path.iterdir()), workers=workers)
+    assert [Path(m.source).name for m in matches] == ["a.jsonl#0", "a.jsonl#1", "b.json#0"]
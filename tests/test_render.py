@@ -0,0 +1,128 @@
+"""Tests for SVG diagram rendering and the render cache."""
+
+import json
+import re
+import sys
+import xml.dom.minidom
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from osti import (
+    ArrowType,
+    DiagramInfo,
+    EquipmentObject,
+    EquipmentType,
+    GoalInfo,
+    MovementArrow,
+    PitchView,
+    PitchViewType,
+    PlayerPosition,
+    SessionPlan,
+)
+from osti import render
+from osti.render import RenderCache, diagram_key, render_cached, render_many, render_png, render_svg
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _example_diagrams():
+    data = json.loads((EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8"))
+    return [d.diagram for d in SessionPlan.model_validate(data).drills]
+
+
+def test_example_diagrams_render_well_formed_svg():
+    for diagram in _example_diagrams():
+        svg = render_svg(diagram, size=300)
+        doc = xml.dom.minidom.parseString(svg)
+        assert doc.documentElement.tagName == "svg"
+        assert svg.count("<circle") >= len(diagram.player_positions)
+
+
+def test_orientation_and_size():
+    view = PitchView(view_type=PitchViewType.FULL_PITCH, orientation="horizontal")
+    svg = render_svg(DiagramInfo(pitch_view=view), size=210)
+    assert 'width="210" height="136"' in svg
+    svg = render_svg(DiagramInfo(pitch_view=view.model_copy(update={"orientation": "vertical"})), size=210)
+    assert 'width="136" height="210"' in svg
+
+
+def test_goals_follow_orientation():
+    goal = re.compile(r'width="(\d+)" height="(\d+)" fill="none" stroke="#ffffff" stroke-width="1.5"')
+    goals = [GoalInfo(x=50, y=100), GoalInfo(x=50, y=0)]
+    vertical = render_svg(DiagramInfo(pitch_view=PitchView(), goals=goals))
+    assert goal.findall(vertical) == [("16", "4")] * 2
+    view = PitchView(orientation="horizontal")
+    goals = [GoalInfo(x=0, y=50), GoalInfo(x=100, y=50)]
+    horizontal = render_svg(DiagramInfo(pitch_view=view, goals=goals))
+    assert goal.findall(horizontal) == [("4", "16")] * 2
+
+
+def test_styles_and_escaping():
+    diagram = DiagramInfo(
+        player_positions=[PlayerPosition(label="<A&B>", x=10, y=10, color='red" onload="x')],
+        arrows=[MovementArrow(start_x=0, start_y=0, end_x=50, end_y=50, arrow_type=ArrowType.RUN)],
+        equipment=[EquipmentObject(equipment_type=EquipmentType.GATE, x=10, y=10, x2=20, y2=10)],
+    )
+    svg = render_svg(diagram)
+    xml.dom.minidom.parseString(svg)
+    assert "&lt;A&amp;B&gt;" in svg
+    assert "onload" not in svg
+    assert 'marker-end="url(#ah-run)"' in svg
+    assert svg.count('xlink:href="#eq-gate"') == 2
+
+
+def test_key_ignores_non_drawn_fields():
+    a = DiagramInfo(description="one", image_ref="a.png")
+    b = DiagramInfo(description="two")
+    assert diagram_key(a) == diagram_key(b)
+    assert diagram_key(a) != diagram_key(a, size=200)
+
+
+def test_key_includes_render_version(monkeypatch):
+    before = diagram_key(DiagramInfo())
+    monkeypatch.setattr(render, "RENDER_VERSION", render.RENDER_VERSION + 1)
+    assert diagram_key(DiagramInfo()) != before
+
+
+def test_render_cache_memory_and_disk(tmp_path):
+    diagram = _example_diagrams()[0]
+    cache = RenderCache(maxsize=1, directory=tmp_path)
+    first = render_cached(diagram, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert render_cached(diagram, cache=cache) == first
+    assert cache.hits == 1
+    fresh = RenderCache(directory=tmp_path)
+    assert render_cached(diagram, cache=fresh) == first
+    assert (fresh.hits, fresh.misses) == (1, 0)
+
+
+def test_render_cache_concurrent_disk_writes(tmp_path):
+    caches = [RenderCache(directory=tmp_path) for _ in range(8)]
+    svg = render_svg(_example_diagrams()[0])
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda c: c.put("k", svg), caches * 4))
+    assert [p.name for p in tmp_path.iterdir()] == ["k.svg"]
+    assert (tmp_path / "k.svg").read_text(encoding="utf-8") == svg
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_many_renders_misses_once(workers):
+    diagrams = _example_diagrams()
+    cache = RenderCache()
+    out = render_many(diagrams + diagrams, cache=cache, workers=workers)
+    assert out[:3] == out[3:]
+    assert out[0] == render_svg(diagrams[0])
+    assert len(cache) == 3
+
+
+def test_render_png():
+    pytest.importorskip("cairosvg", reason="cairosvg not installed", exc_type=ImportError)
+    assert render_png(DiagramInfo()).startswith(b"\x89PNG")
+
+
+def test_render_png_without_cairosvg(monkeypatch):
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+    with pytest.raises(ImportError, match="pip install cairosvg"):
+        render_png(DiagramInfo())
@@ -0,0 +1,139 @@
+"""Tests for named serialization profiles."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from osti import serialization
+from osti.serialization import (
+    Profile,
+    compile_paths,
+    dump,
+    dump_json,
+    get_profile,
+    profiles,
+    register_profile,
+    serializer,
+)
+from osti.session_plan import SessionPlan
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.fixture
+def registry():
+    """Restore the profile registry after a test registers extra profiles."""
+    saved = dict(serialization._PROFILES)
+    yield
+    serialization._PROFILES.clear()
+    serialization._PROFILES.update(saved)
+    serializer.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def plan():
+    text = (EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8")
+    return SessionPlan.model_validate_json(text)
+
+
+def test_builtin_profiles():
+    assert {"full", "summary", "no_diagrams", "no_text", "geometry_only", "compact"} <= set(profiles())
+    assert serializer("summary") is serializer("summary")
+    with pytest.raises(ValueError, match="Unknown serialization profile"):
+        get_profile("nope")
+
+
+def test_compile_paths():
+    assert compile_paths(()) is None
+    assert compile_paths(("id", "drills[*].diagram.arrows", "drills[*].name")) == {
+        "id": True,
+        "drills": {"__all__": {"diagram": {"arrows": True}, "name": True}},
+    }
+    assert compile_paths(("drills", "drills[*].name")) == {"drills": True}
+
+
+def test_full_matches_model_dump(plan):
+    assert json.loads(dump_json(plan)) == json.loads(plan.model_dump_json())
+
+
+def test_summary(plan):
+    data = dump(plan, "summary")
+    assert set(data) == {"id", "metadata", "source", "drills"}
+    assert set(data["drills"][0]) == {"id", "name", "drill_type", "tactical_context"}
+    assert data["drills"][2]["tactical_context"]["game_element"] == "Organized Defense"
+
+
+def test_exclusions(plan):
+    no_diagrams = dump(plan, "no_diagrams")
+    assert all("diagram" not in d for d in no_diagrams["drills"])
+    no_text = dump(plan, "no_text")
+    drill = no_text["drills"][0]
+    assert "coaching_points" not in drill and "description" not in drill["setup"]
+    assert "description" not in drill["diagram"] and "arrows" in drill["diagram"]
+    SessionPlan.model_validate_json(dump_json(plan, "no_text"))
+
+
+def test_geometry_only(plan):
+    data = dump(plan, "geometry_only")
+    assert set(data) == {"id", "drills"}
+    diagram = data["drills"][1]["diagram"]
+    assert "description" not in diagram and "image_ref" not in diagram
+    assert len(diagram["player_positions"]) == len(plan.drills[1].diagram.player_positions)
+
+
+def test_compact(plan):
+    body = dump_json(plan, "compact")
+    assert len(body) < len(plan.model_dump_json())
+    data = json.loads(body)
+
+    def walk(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                assert item is not None and item != []
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(data)
+    restored = SessionPlan.model_validate(data)
+    assert restored.model_dump() == plan.model_dump()
+
+
+def test_compact_keeps_non_empty_defaults(plan):
+    pitch_view = dump(plan, "compact")["drills"][0]["diagram"]["pitch_view"]
+    assert pitch_view["orientation"] == "vertical"  # the field default
+
+
+def test_rounding(plan, registry):
+    register_profile(Profile("rounded0", round_coordinates=0))
+    player = dump(plan, "rounded0")["drills"][1]["diagram"]["player_positions"][0]
+    source = plan.drills[1].diagram.player_positions[0]
+    assert player["x"] == round(source.x) and player["y"] == round(source.y)
+    assert "role" in player
+
+
+def test_exclude_defaults(plan, registry):
+    register_profile(Profile("sparse", compact=True, exclude_defaults=True))
+    body = dump_json(plan, "sparse")
+    assert len(body) < len(dump_json(plan, "compact"))
+    assert "orientation" not in json.loads(body)["drills"][0]["diagram"]["pitch_view"]
+    assert SessionPlan.model_validate_json(body).model_dump() == plan.model_dump()
+
+
+def test_compact_with_paths(plan, registry):
+    register_profile(Profile("compact_titles", include=("drills[*].name",), compact=True))
+    assert dump_json(plan, "compact_titles") == json.dumps(
+        {"drills": [{"name": d.name} for d in plan.drills]}, separators=(",", ":")
+    ).encode()
+
+
+def test_register_profile_checks_paths(registry):
+    with pytest.raises(ValueError):
+        register_profile(Profile("bad", include=("drills[*].nope",)))
+    with pytest.raises(ValueError, match="already registered"):
+        register_profile(Profile("full"))
+    custom = register_profile(Profile("titles", include=("metadata.title",)), replace=True)
+    assert get_profile("titles") is custom
+    assert "bad" not in profiles()
@@ -0,0 +1,113 @@
+"""Tests for content-addressed drill storage."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from osti.session_plan import SessionPlan
+from osti.storage import (
+    REF_KEY,
+    BlobStore,
+    DirectoryBlobStore,
+    PlanResolver,
+    is_ref,
+    normalize,
+    store_drill,
+)
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.fixture(scope="module")
+def plan():
+    text = (EXAMPLES_DIR / "nielsen.json").read_text(encoding="utf-8")
+    return SessionPlan.model_validate_json(text)
+
+
+def _reuse(plan: SessionPlan) -> SessionPlan:
+    """A second plan embedding the same drills under new ids."""
+    drills = [d.model_copy(update={"id": uuid4()}) for d in plan.drills]
+    return plan.model_copy(update={"id": uuid4(), "drills": drills})
+
+
+def test_normalize_references(plan):
+    store = BlobStore()
+    data = normalize(plan, store)
+    assert all(is_ref(d) for d in data["drills"])
+    assert [d["id"] for d in data["drills"]] == [str(d.id) for d in plan.drills]
+    assert store.writes == 3
+    assert "id" not in json.loads(store.get(data["drills"][0][REF_KEY]))
+
+
+def test_shared_drills_stored_once(plan):
+    store = BlobStore()
+    first = normalize(plan, store)
+    second = normalize(_reuse(plan), store)
+    assert store.writes == 3
+    assert [d[REF_KEY] for d in first["drills"]] == [d[REF_KEY] for d in second["drills"]]
+    assert first["drills"][0]["id"] != second["drills"][0]["id"]
+
+
+def test_changed_drill_gets_new_blob(plan):
+    store = BlobStore()
+    before = store_drill(plan.drills[0], store)
+    renamed = plan.drills[0].model_copy(update={"name": "Renamed"})
+    assert store_drill(renamed, store) != before
+    assert store.writes == 2
+
+
+def test_round_trip(plan):
+    store = BlobStore()
+    resolver = PlanResolver(store)
+    restored = resolver.resolve(json.dumps(normalize(plan, store)))
+    assert restored.model_dump() == plan.model_dump()
+
+
+def test_diagram_blobs(plan, tmp_path):
+    store = DirectoryBlobStore(tmp_path / "blobs")
+    data = normalize(plan, store, diagrams=True)
+    assert store.writes == 6
+    drill = json.loads(store.get(data["drills"][1][REF_KEY]))
+    assert is_ref(drill["diagram"])
+    assert drill["diagram"][REF_KEY] in store
+
+    restored = PlanResolver(DirectoryBlobStore(tmp_path / "blobs")).resolve(data)
+    assert restored.model_dump() == plan.model_dump()
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_resolver_cache(plan):
+    store = BlobStore()
+    refs = [normalize(plan, store), normalize(_reuse(plan), store)]
+    resolver = PlanResolver(store)
+    first, second = (resolver.resolve(r) for r in refs)
+    assert resolver.misses == 3 and resolver.hits == 3
+    assert first.drills[0].setup is second.drills[0].setup
+    assert first.drills[0].id != second.drills[0].id
+
+    copied = resolver.resolve(refs[0], copy=True)
+    assert copied.drills[0].setup is not first.drills[0].setup
+
+    small = PlanResolver(store, maxsize=2)
+    small.resolve(refs[0])
+    assert len(small) == 2
+
+
+def test_inline_drills_pass_through(plan):
+    data = plan.model_dump(mode="json")
+    restored = PlanResolver(BlobStore()).resolve(data)
+    assert restored.model_dump() == plan.model_dump()
+
+
+def test_concurrent_directory_writes(plan, tmp_path):
+    stores = [DirectoryBlobStore(tmp_path) for _ in range(8)]
+    blob = json.dumps(plan.drills[0].model_dump(mode="json")).encode()
+    with ThreadPoolExecutor(8) as pool:
+        digests = set(pool.map(lambda s: s.put(blob), stores * 4))
+    (digest,) = digests
+    assert stores[0].get(digest) == blob
+    assert [p.suffix for p in tmp_path.rglob("*") if p.is_file()] == [".json"]
@@ -0,0 +1,94 @@
+"""Tests for validation policies and batch error aggregation."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from osti import SessionPlan
+from osti.validation import (
+    COLLECT_ALL,
+    FAIL_FAST,
+    ErrorAggregator,
+    PlanValidationError,
+    ValidationPolicy,
+    validate_plan,
+)
+
+
+def _bad_plan():
+    return {
+        "metadata": {},
+        "source": {},
+        "drills": [
+            {"name": "D1", "diagram": {"arrows": [
+                {"start_x": 0, "start_y": 0, "end_x": 1, "end_y": 1, "arrow_type": "kick"},
+            ]}},
+        ],
+    }
+
+
+def test_valid_plan_passes_through():
+    plan = validate_plan({"metadata": {}, "source": {"filename": "a.pdf"}})
+    assert isinstance(plan, SessionPlan)
+
+
+def test_fail_fast_keeps_one_error():
+    with pytest.raises(PlanValidationError) as info:
+        validate_plan(_bad_plan(), FAIL_FAST)
+    assert len(info.value.errors) == 1
+    assert info.value.total == 2
+    assert "+1 more" in str(info.value)
+
+
+def test_collect_all_from_json():
+    with pytest.raises(PlanValidationError) as info:
+        validate_plan(json.dumps(_bad_plan()), COLLECT_ALL)
+    assert len(info.value.errors) == 2
+    assert all("input" not in e and "url" not in e for e in info.value.errors)
+
+
+def test_policy_rejects_non_positive_limit():
+    with pytest.raises(ValueError):
+        ValidationPolicy(max_errors=0)
+
+
+def test_aggregator_groups_by_path_and_type():
+    agg = ErrorAggregator(max_examples=2)
+    for i in range(3):
+        try:
+            validate_plan(_bad_plan())
+        except PlanValidationError as exc:
+            agg.add(exc.errors, record=f"r{i}")
+    groups = agg.groups()
+    assert agg.records == 3
+    assert {(g.loc, g.type) for g in groups} == {
+        ("source.filename", "missing"),
+        ("drills.*.diagram.arrows.*.arrow_type", "enum"),
+    }
+    assert all(g.count == 3 and g.examples == ["r0", "r1"] for g in groups)
+    assert "3 rejected record(s), 2 distinct error(s)" in agg.summary()
+
+
+def test_aggregator_merge_and_pydantic_errors():
+    left, right = ErrorAggregator(), ErrorAggregator()
+    with pytest.raises(ValidationError) as info:
+        SessionPlan.model_validate(_bad_plan())
+    left.add_exception(info.value, record="a")
+    right.add_exception(info.value, record="b", policy=FAIL_FAST)
+    left.merge(right)
+    counts = {g.loc: g.count for g in left.groups()}
+    assert counts == {"drills.*.diagram.arrows.*.arrow_type": 2, "source.filename": 1}
+    assert json.loads(left.to_json())["records"] == 2
+
+
+def test_merge_respects_max_examples():
+    error = {"loc": ("source", "filename"), "type": "missing", "msg": "Field required"}
+    wide, narrow = ErrorAggregator(max_examples=5), ErrorAggregator(max_examples=2)
+    for record in "abcde":
+        wide.add([error], record=record)
+    narrow.merge(wide)
+    (group,) = narrow.groups()
+    assert group.count == 5
+    assert group.examples == ["a", "b"]
+    assert len(wide.groups()[0].examples) == 5